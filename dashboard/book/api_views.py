@@ -1,12 +1,10 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.utils import timezone
-from django.db import transaction
-from .models import Book, PriceHistory
+from django.urls import reverse
+from jobs.queue import enqueue
+from .models import Book
 from .serializers import BookSerializer, BookListSerializer
-import datetime
-import math # 반올림을 위해
 
 class BookViewSet(viewsets.ModelViewSet):
     """
@@ -28,7 +26,8 @@ class BookViewSet(viewsets.ModelViewSet):
 @permission_classes([permissions.AllowAny]) 
 def batch_price_update_api(request):
     """
-    JSON 데이터를 받아 특정 ID의 책 가격을 일괄 변동시킵니다.
+    JSON 데이터를 받아 특정 ID의 책 가격 일괄 변동 작업을 적재합니다.
+    실제 변동은 백그라운드 작업(book.tasks.batch_price_update)이 처리합니다.
     """
     data = request.data
     # 카테고리 대신 book_ids를 받음
@@ -38,6 +37,8 @@ def batch_price_update_api(request):
 
     if not update_type or value is None:
         return Response({'error': 'update_type과 value가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    if update_type not in ('amount', 'percent'):
+        return Response({'error': "update_type은 'amount' 또는 'percent'여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
         value = int(value)
@@ -49,56 +50,18 @@ def batch_price_update_api(request):
     if not book_ids:
         return Response({'error': '유효한 book_ids가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        with transaction.atomic(): # 데이터 일관성을 위해 트랜잭션 사용
-            
-            # 1. 대상 책 필터링 (카테고리 -> ID 리스트)
-            books_to_update = Book.objects.filter(pk__in=book_ids)
-
-            if not books_to_update.exists():
-                return Response({'status': 'success', 'updated_count': 0, 'message': '해당 ID의 책이 없습니다.'}, status=status.HTTP_200_OK)
-
-            # 2. 대상 책들의 현재 최신 가격 목록을 가져옴 (메모리에 로드)
-            latest_prices = list(
-                PriceHistory.objects.filter(book__in=books_to_update, is_latest=True)
-            )
-            latest_price_pks = [p.pk for p in latest_prices]
-
-            # 3. 기존 가격들의 '최신' 플래그를 모두 False로 변경
-            PriceHistory.objects.filter(pk__in=latest_price_pks).update(is_latest=False)
-
-            # 4. 새 가격 이력 생성 준비
-            new_histories = []
-            now = timezone.now()
-
-            for old_price in latest_prices:
-                new_p = 0
-                if update_type == 'amount':
-                    new_p = old_price.price + value
-                elif update_type == 'percent':
-                    # 퍼센트 인상 (소수점 첫째 자리에서 반올림)
-                    new_p = round(old_price.price * (1 + value / 100), 0) 
-                
-                # 가격이 0 미만이 되지 않도록
-                new_p = max(0, new_p) 
-
-                new_histories.append(
-                    PriceHistory(
-                        book=old_price.book, 
-                        price=new_p, 
-                        is_latest=True, 
-                        price_updated_at=now
-                    )
-                )
-
-            # 5. 새 가격 이력을 DB에 일괄 생성
-            if new_histories:
-                PriceHistory.objects.bulk_create(new_histories)
-
-            return Response({
-                'status': 'success', 
-                'updated_count': len(new_histories)
-            }, status=status.HTTP_200_OK)
-
-    except Exception as e:
-        return Response({'error': f'일괄 변동 중 오류 발생: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+    # 대상 책이 많으면 요청 스레드에서 처리할 때 타임아웃/DB 잠금이 발생하므로
+    # 백그라운드 작업으로 적재하고, 화면은 진행률 컴포넌트로 상태를 폴링합니다.
+    job = enqueue('book.batch_price_update', {
+        'book_ids': book_ids,
+        'update_type': update_type,
+        'value': value,
+    }, created_by=request.user)
+
+    return Response({
+        'status': 'queued',
+        'job_id': job.pk,
+        'target_count': len(book_ids),
+        'status_url': reverse('job-api-detail', args=[job.pk]),
+        'progress_url': reverse('job_progress', args=[job.pk]),
+    }, status=status.HTTP_202_ACCEPTED)
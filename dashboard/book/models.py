@@ -8,6 +8,15 @@ import datetime # price_updated_at의 기본값을 위해 import
 # (책 참조는 Book 모델의 M2M 필드로 구현)
 class Author(models.Model):
     name = models.CharField(max_length=100, verbose_name="저자 이름")
+    # [신규] 정산 화면 로그인 계정 (저자 본인의 정산 내역만 조회)
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='author_profile',
+        verbose_name="계정"
+    )
 
     def __str__(self):
         return self.name
@@ -25,6 +34,15 @@ class Composer(models.Model):
     date_of_birth = models.DateField(verbose_name="생년월일", default=datetime.date(1900, 1, 1))
     # [수정] null=True를 제거하는 대신, default=''를 추가합니다.
     contact_number = models.CharField(max_length=20, verbose_name="연락처", default='') 
+    # [신규] 정산 화면 로그인 계정 (작곡가 본인의 저작권료 내역만 조회)
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='composer_profile',
+        verbose_name="계정"
+    )
 
     def __str__(self):
         return self.name
@@ -0,0 +1,82 @@
+"""
+주문 입력용 책 검색 서비스
+
+- 순위: 제목 완전 일치 > 제목 앞부분 일치 > 부분 일치, 같은 순위 안에서는 주문 횟수가 많은 순
+        (보관된 연도의 주문 횟수는 연도별 책 합계 ArchivedBookYearTotal 에서 더합니다)
+- 가격: 최신 가격(is_latest=True) 1건만 Subquery 로 조회
+- 캐시: 정규화된 검색어별로 결과(dict 목록)를 캐시하고, Book/PriceHistory/Author 가 바뀌면
+        'book_search' 버전을 올려 한 번에 무효화합니다. (book/signals.py)
+"""
+import re
+
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from config.versioned_cache import versioned_key
+from order.models import ArchivedBookYearTotal
+from .models import Book, PriceHistory
+
+BOOK_SEARCH_CACHE_NAMESPACE = 'book_search'
+BOOK_SEARCH_LIMIT = 10
+
+# 주문 횟수는 신호로 무효화하지 않으므로(주문마다 캐시가 비워지지 않도록) TIMEOUT 으로 갱신 주기를 제한합니다.
+BOOK_SEARCH_CACHE_TIMEOUT = 600
+
+
+def normalize_query(query):
+    """앞뒤 공백 제거, 연속 공백 1칸으로, 소문자화"""
+    return re.sub(r'\s+', ' ', (query or '').strip()).lower()
+
+
+def _rank_books(query, limit):
+    latest_price_sq = PriceHistory.objects.filter(
+        book=OuterRef('pk'),
+        is_latest=True
+    ).order_by('-price_updated_at').values('price')[:1]
+    archived_order_count_sq = (
+        ArchivedBookYearTotal.objects.filter(book=OuterRef('pk'))
+        .values('book')
+        .annotate(total=Sum('order_count'))
+        .values('total')
+    )
+
+    books = Book.objects.filter(
+        Q(title_korean__icontains=query) |
+        Q(title_original__icontains=query)
+    ).annotate(
+        match_rank=Case(
+            When(Q(title_korean__iexact=query) | Q(title_original__iexact=query), then=Value(0)),
+            When(Q(title_korean__istartswith=query) | Q(title_original__istartswith=query), then=Value(1)),
+            default=Value(2),
+            output_field=IntegerField(),
+        ),
+        order_count=Count('order_items') + Coalesce(Subquery(archived_order_count_sq), Value(0)),
+        latest_price=Subquery(latest_price_sq),
+    ).prefetch_related('authors').order_by('match_rank', '-order_count', 'title_korean')[:limit]
+
+    return [
+        {
+            'id': book.id,
+            'title_korean': book.title_korean,
+            'authors': ', '.join(author.name for author in book.authors.all()),
+            'price': book.latest_price,
+        }
+        for book in books
+    ]
+
+
+def search_books(query, limit=BOOK_SEARCH_LIMIT):
+    """
+    검색어로 책을 찾아 순위대로 최대 limit 개의 dict(id, title_korean, authors, price) 목록을 반환합니다.
+    """
+    normalized = normalize_query(query)
+    if not normalized:
+        return []
+
+    key = versioned_key(BOOK_SEARCH_CACHE_NAMESPACE, normalized, limit)
+    results = cache.get(key)
+    if results is None:
+        results = _rank_books(normalized, limit)
+        cache.set(key, results, BOOK_SEARCH_CACHE_TIMEOUT)
+    return results
@@ -0,0 +1,24 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from config.versioned_cache import bump_version
+from .models import Author, Book, PriceHistory
+from .search import BOOK_SEARCH_CACHE_NAMESPACE
+
+
+# 책 검색 결과에 보이는 정보(제목, 저자, 최신 가격)가 바뀌면 검색 캐시를 무효화합니다.
+# bulk_create / queryset.update() 는 신호가 없으므로 호출하는 쪽에서 bump_version 을 직접 호출합니다. (book/tasks.py)
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=PriceHistory)
+@receiver(post_delete, sender=PriceHistory)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_book_search(sender, **kwargs):
+    bump_version(BOOK_SEARCH_CACHE_NAMESPACE)
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+def invalidate_book_search_on_authors(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_version(BOOK_SEARCH_CACHE_NAMESPACE)
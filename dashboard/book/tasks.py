@@ -0,0 +1,76 @@
+from django.db import transaction
+from django.utils import timezone
+
+from config.versioned_cache import bump_version
+from jobs.queue import register_task
+from .models import PriceHistory
+from .search import BOOK_SEARCH_CACHE_NAMESPACE
+
+# 한 트랜잭션에서 처리할 책 수 (SQLite 쓰기 잠금을 오래 잡지 않도록 나눠서 커밋)
+PRICE_UPDATE_CHUNK_SIZE = 500
+
+
+def calculate_new_price(old_price, update_type, value):
+    """
+    기존 가격에 조정 방식('amount' 또는 'percent')을 적용한 새 가격을 반환합니다.
+    """
+    new_p = old_price
+    if update_type == 'amount':
+        new_p = old_price + value
+    elif update_type == 'percent':
+        # 퍼센트 인상 (소수점 첫째 자리에서 반올림)
+        new_p = int(round(old_price * (1 + value / 100), 0))
+
+    # 가격이 0 미만이 되지 않도록
+    return max(0, new_p)
+
+
+@register_task('book.batch_price_update')
+def batch_price_update(job, book_ids, update_type, value):
+    """
+    [백그라운드 작업] 책 가격 일괄 변동
+    book_ids 를 묶음 단위로 나눠 각 묶음을 하나의 트랜잭션으로 처리합니다.
+    묶음마다 처리한 위치를 같은 트랜잭션에서 job.checkpoint 에 기록하므로,
+    중간 묶음에서 실패해 재시도되면 이미 반영된 묶음은 건너뛰고 이어서 처리합니다. (같은 변동이 두 번 적용되지 않음)
+    """
+    total = len(book_ids)
+    resume_from = job.checkpoint.get('offset', 0)
+    updated_count = job.checkpoint.get('updated_count', 0)
+    job.update_progress(resume_from, total, '가격 변동 중')
+
+    for start in range(resume_from, total, PRICE_UPDATE_CHUNK_SIZE):
+        chunk_ids = book_ids[start:start + PRICE_UPDATE_CHUNK_SIZE]
+
+        with transaction.atomic():
+            # 1. 대상 책들의 현재 최신 가격 목록을 가져옴
+            latest_prices = list(
+                PriceHistory.objects.filter(book_id__in=chunk_ids, is_latest=True)
+            )
+
+            # 2. 기존 가격들의 '최신' 플래그를 모두 False로 변경
+            PriceHistory.objects.filter(pk__in=[p.pk for p in latest_prices]).update(is_latest=False)
+
+            # 3. 새 가격 이력을 일괄 생성
+            now = timezone.now()
+            new_histories = [
+                PriceHistory(
+                    book_id=old_price.book_id,
+                    price=calculate_new_price(old_price.price, update_type, value),
+                    is_latest=True,
+                    price_updated_at=now,
+                )
+                for old_price in latest_prices
+            ]
+            if new_histories:
+                PriceHistory.objects.bulk_create(new_histories)
+
+            # 4. 처리 위치를 묶음과 함께 커밋
+            updated_count += len(new_histories)
+            job.save_checkpoint(offset=start + len(chunk_ids), updated_count=updated_count)
+
+        # bulk_create/update 는 post_save 신호가 없으므로 검색 캐시를 직접 무효화
+        bump_version(BOOK_SEARCH_CACHE_NAMESPACE)
+        job.update_progress(min(start + PRICE_UPDATE_CHUNK_SIZE, total))
+
+    job.update_progress(total, message=f'{updated_count}권 가격 변동 완료')
+    return {'updated_count': updated_count}
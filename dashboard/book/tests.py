@@ -1,3 +1,46 @@
-from django.test import TestCase
+from django.core.cache import caches
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from config.versioned_cache import VERSION_CACHE_ALIAS, _version_key, bump_version, get_version
+from .models import Book
+from .search import BOOK_SEARCH_CACHE_NAMESPACE, search_books
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-default'},
+    VERSION_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-versions'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class VersionedCacheTests(TestCase):
+    """버전 키 기반 캐시 무효화 (config.versioned_cache)"""
+
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+
+    def test_bump_always_changes_version(self):
+        version = get_version(BOOK_SEARCH_CACHE_NAMESPACE)
+        bumped = bump_version(BOOK_SEARCH_CACHE_NAMESPACE)
+
+        self.assertNotEqual(bumped, version)
+        self.assertEqual(get_version(BOOK_SEARCH_CACHE_NAMESPACE), bumped)
+
+    def test_lost_version_key_does_not_restore_old_generation(self):
+        versions = {get_version(BOOK_SEARCH_CACHE_NAMESPACE)}
+        caches[VERSION_CACHE_ALIAS].delete(_version_key(BOOK_SEARCH_CACHE_NAMESPACE))
+        versions.add(get_version(BOOK_SEARCH_CACHE_NAMESPACE))
+        caches[VERSION_CACHE_ALIAS].delete(_version_key(BOOK_SEARCH_CACHE_NAMESPACE))
+        versions.add(bump_version(BOOK_SEARCH_CACHE_NAMESPACE))
+
+        self.assertEqual(len(versions), 3)
+
+    def test_search_is_not_stale_after_version_key_is_culled(self):
+        book = Book.objects.create(title_korean='캐시 테스트')
+        self.assertEqual([row['title_korean'] for row in search_books('캐시')], ['캐시 테스트'])
+
+        # 신호 없이 바뀐 제목 + 버전 키 정리 : 예전 버전의 캐시가 다시 조회되면 안 됩니다.
+        Book.objects.filter(pk=book.pk).update(title_korean='캐시 변경')
+        caches[VERSION_CACHE_ALIAS].delete(_version_key(BOOK_SEARCH_CACHE_NAMESPACE))
+
+        self.assertEqual([row['title_korean'] for row in search_books('캐시')], ['캐시 변경'])
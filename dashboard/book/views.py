@@ -6,6 +6,9 @@ from django.http import JsonResponse
 from django.db.models import Subquery, OuterRef
 from django.utils import timezone # 👈 [신규] 임포트 (batch_price_update_api용)
 from django.db import transaction # 👈 [신규] 임포트 (batch_price_update_api용)
+from sales.book_panel import get_book_sales_panel
+from sales.leaderboard import ALL as ALL_PERIOD
+from sales.models import BookPeriodSales
 
 def book_list_view(request):
     """
@@ -27,6 +30,7 @@ def book_list_view(request):
     search_query = request.GET.get('search_query', '')
     category1 = request.GET.get('category1', '')
     category2 = request.GET.get('category2', '')
+    sort = request.GET.get('sort', '')
 
     # 2. 텍스트 검색 (책 제목 또는 저자명)
     if search_query:
@@ -41,6 +45,16 @@ def book_list_view(request):
     if category2:
         books = books.filter(category2=category2)
 
+    # 4. [신규] 인기순 정렬 (미리 합산된 전체 기간 판매 권수, 판매 기록이 없는 책은 뒤로)
+    if sort == 'popular':
+        total_units_sq = BookPeriodSales.objects.filter(
+            book=OuterRef('pk'),
+            period=ALL_PERIOD,
+        ).values('units')[:1]
+        books = books.annotate(total_units=Subquery(total_units_sq)).order_by(
+            F('total_units').desc(nulls_last=True), '-pk'
+        )
+
     # --- 템플릿에 전달할 Context 데이터 ---
     context = {
         'books': books,
@@ -49,6 +63,7 @@ def book_list_view(request):
         'search_query': search_query,
         'selected_category1': category1,
         'selected_category2': category2,
+        'selected_sort': sort,
     }
 
     # HTMX 요청인 경우, 테이블 본문 부분만 렌더링
@@ -75,7 +90,9 @@ def book_detail_view(request, pk):
     )
     
     context = {
-        'book': book
+        'book': book,
+        # [신규] 판매 현황 패널 (최근 36개월 월별 판매, 누적 판매, 주문처 순위)
+        'sales_panel': get_book_sales_panel(book.pk),
     }
     return render(request, 'book/book_detail.html', context)
 
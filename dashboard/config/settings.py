@@ -51,6 +51,9 @@ INSTALLED_APPS = [
     'order',
     'accounts',
     'reimbursement',
+    'jobs',
+    'inventory',
+    'sales',
     'rest_framework',
     'django_filters',
     'django_htmx',
@@ -94,10 +97,46 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 백그라운드 워커와 웹 요청이 동시에 쓸 때 'database is locked' 대신 잠시 대기
+        'OPTIONS': {
+            'timeout': 20,
+        },
     }
 }
 
 
+# Cache
+# 웹 프로세스와 작업 워커(run_workers)가 같은 캐시/버전 키를 보도록 파일 기반 캐시를 사용합니다.
+# (LocMemCache 는 프로세스마다 따로라 워커에서 무효화해도 웹 쪽 캐시가 남습니다.)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache',
+        'TIMEOUT': 600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    # 캐시 버전 키 전용 (config.versioned_cache). 응답 캐시가 가득 차 정리될 때 버전 키가 함께 지워지지 않도록 따로 두고,
+    # 만료 없이 저장합니다. 키 수는 네임스페이스 수(책/연락처별 포함)만큼이므로 정리 기준을 넉넉하게 둡니다.
+    'versions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache' / 'versions',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000000,
+        },
+    },
+}
+
+
+# 연말 정산 명세서 출력 폴더 (reimbursement.statements, generate_statements 명령)
+# 연도/생성시각 하위 폴더에 수령인별 명세서와 manifest.json 을 씁니다.
+
+STATEMENT_ROOT = BASE_DIR / 'statements'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -11,7 +11,10 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('order/', include('order.urls')),
     path('book/', include('book.urls')),
-    # path('api/', include('reimbursement.urls')),
+    path('jobs/', include('jobs.urls')),
+    path('inventory/', include('inventory.urls')),
+    path('sales/', include('sales.urls')),
+    path('reimbursement/', include('reimbursement.urls')),
     # path('api/', include('book.urls')),
     path('accounts/', include('accounts.urls')), 
     path('', home_view, name='home'),
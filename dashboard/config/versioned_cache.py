@@ -0,0 +1,59 @@
+"""
+버전 키 기반 캐시 무효화
+
+캐시 키에 '네임스페이스 버전'을 붙여 두고, 원본 데이터가 바뀌면 버전만 새 값으로 바꿉니다.
+이전 버전의 키는 더 이상 조회되지 않고 TIMEOUT 이 지나면 자연스럽게 지워지므로,
+어떤 키가 영향을 받는지 일일이 찾아 지울 필요가 없습니다.
+
+버전은 1, 2, 3 처럼 세지 않고 매번 새로 만든 임의 토큰을 씁니다.
+- 버전 키가 지워져도(캐시 정리, 파일 삭제) 새 토큰으로 시작하므로 예전 버전의 캐시가 되살아나지 않습니다.
+- 웹 프로세스와 작업 워커가 동시에 무효화해도, 어느 쪽이 쓰든 이전과 다른 값이 되므로 무효화를 잃지 않습니다.
+  (파일 캐시의 incr 은 원자적이지 않아, 세는 방식이면 동시에 올린 값 하나가 사라질 수 있음)
+버전 키는 'versions' 캐시에 만료 없이 저장합니다. (응답 캐시가 가득 차 정리될 때 함께 지워지지 않도록)
+
+    key = versioned_key('book_search', normalized_query)
+    cache.get(key) / cache.set(key, value)
+    bump_version('book_search')   # Book/PriceHistory 저장 시
+"""
+import hashlib
+import secrets
+
+from django.core.cache import caches
+
+VERSION_CACHE_ALIAS = 'versions'
+VERSION_KEY_PREFIX = 'cache_version'
+
+
+def _version_key(namespace):
+    return f'{VERSION_KEY_PREFIX}:{namespace}'
+
+
+def _new_version():
+    return secrets.token_hex(8)
+
+
+def get_version(namespace):
+    store = caches[VERSION_CACHE_ALIAS]
+    version = store.get(_version_key(namespace))
+    if version is None:
+        # 버전 키가 없으면 새 토큰으로 시작합니다. (다른 프로세스가 먼저 만들었으면 그 값을 씁니다)
+        version = _new_version()
+        if not store.add(_version_key(namespace), version, timeout=None):
+            version = store.get(_version_key(namespace), version)
+    return version
+
+
+def bump_version(namespace):
+    """네임스페이스의 모든 캐시를 무효화합니다. 반환값: 새 버전"""
+    version = _new_version()
+    caches[VERSION_CACHE_ALIAS].set(_version_key(namespace), version, timeout=None)
+    return version
+
+
+def versioned_key(namespace, *parts):
+    """
+    네임스페이스의 현재 버전이 포함된 캐시 키를 만듭니다.
+    parts 는 길이/문자 제한이 없도록 해시하여 붙입니다.
+    """
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'{namespace}:v{get_version(namespace)}:{digest}'
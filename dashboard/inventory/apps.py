@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class InventoryConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'inventory'
+
+    def ready(self):
+        # 발송 처리(orders_updated) 시 예약 재고를 출고로 전환하는 수신자 등록
+        from . import receivers  # noqa: F401
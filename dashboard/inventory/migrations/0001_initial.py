@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('book', '0001_initial'),
+        ('order', '0004_bookpairing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Stock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('on_hand', models.IntegerField(default=0, verbose_name='보유 수량')),
+                ('reserved', models.IntegerField(default=0, verbose_name='예약 수량')),
+                ('low_stock_threshold', models.PositiveIntegerField(default=5, verbose_name='재고 부족 기준')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='변경일')),
+                ('book', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stock', to='book.book', verbose_name='책')),
+            ],
+            options={
+                'verbose_name': '재고',
+                'verbose_name_plural': '재고 목록',
+            },
+        ),
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('movement_type', models.CharField(choices=[('RECEIPT', '입고'), ('RESERVE', '주문 예약'), ('RELEASE', '예약 해제'), ('SHIP', '출고'), ('UNSHIP', '출고 취소'), ('RETURN', '반품'), ('ADJUST', '재고 조정')], max_length=10, verbose_name='구분')),
+                ('quantity', models.IntegerField(verbose_name='수량')),
+                ('note', models.CharField(blank=True, max_length=200, verbose_name='메모')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='일시')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='book.book', verbose_name='책')),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_movements', to='order.order', verbose_name='주문')),
+            ],
+            options={
+                'verbose_name': '재고 변동',
+                'verbose_name_plural': '재고 변동 내역',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['order', 'book'], name='inventory_s_order_i_0bbcba_idx')],
+            },
+        ),
+    ]
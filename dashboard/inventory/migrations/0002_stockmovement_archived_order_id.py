@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockmovement',
+            name='archived_order_id',
+            field=models.BigIntegerField(blank=True, db_index=True, null=True, verbose_name='보관된 주문 id'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import models
+
+
+class Stock(models.Model):
+    """
+    책별 재고 카운터
+    Stock 행이 있는 책만 재고를 관리합니다. (재고 수량이 적은 피스(PCS) 악보 등)
+    - on_hand  : 창고에 있는 수량 (입고/반품 +, 출고 -)
+    - reserved : 주문은 들어왔지만 아직 발송되지 않은 수량
+    - 주문 가능 수량 = on_hand - reserved
+    카운터는 항상 조건부 UPDATE(F 식)로만 변경하고, 변경 내역은 StockMovement 에 남깁니다.
+    """
+    book = models.OneToOneField('book.Book', on_delete=models.CASCADE, related_name='stock', verbose_name='책')
+    on_hand = models.IntegerField(default=0, verbose_name='보유 수량')
+    reserved = models.IntegerField(default=0, verbose_name='예약 수량')
+    low_stock_threshold = models.PositiveIntegerField(default=5, verbose_name='재고 부족 기준')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='변경일')
+
+    @property
+    def available(self):
+        return self.on_hand - self.reserved
+
+    def __str__(self):
+        return f'{self.book.title_korean} (보유 {self.on_hand} / 예약 {self.reserved})'
+
+    class Meta:
+        verbose_name = '재고'
+        verbose_name_plural = '재고 목록'
+
+
+class StockMovement(models.Model):
+    """재고 변동 원장 (카운터를 바꾼 모든 변동을 1행씩 기록)"""
+    RECEIPT = 'RECEIPT'
+    RESERVE = 'RESERVE'
+    RELEASE = 'RELEASE'
+    SHIP = 'SHIP'
+    UNSHIP = 'UNSHIP'
+    RETURN = 'RETURN'
+    ADJUST = 'ADJUST'
+    MOVEMENT_TYPES = [
+        (RECEIPT, '입고'),
+        (RESERVE, '주문 예약'),
+        (RELEASE, '예약 해제'),
+        (SHIP, '출고'),
+        (UNSHIP, '출고 취소'),
+        (RETURN, '반품'),
+        (ADJUST, '재고 조정'),
+    ]
+
+    book = models.ForeignKey('book.Book', on_delete=models.CASCADE, related_name='stock_movements', verbose_name='책')
+    movement_type = models.CharField(max_length=10, choices=MOVEMENT_TYPES, verbose_name='구분')
+    # 조정(ADJUST)만 음수가 될 수 있습니다.
+    quantity = models.IntegerField(verbose_name='수량')
+    order = models.ForeignKey(
+        'order.Order', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='stock_movements', verbose_name='주문'
+    )
+    # 주문이 연도 보관(order.archive)으로 운영 테이블에서 빠져 있는 동안 원래 주문 id 를 보관합니다. (복원 시 order 로 되돌림)
+    archived_order_id = models.BigIntegerField(null=True, blank=True, db_index=True, verbose_name='보관된 주문 id')
+    note = models.CharField(max_length=200, blank=True, verbose_name='메모')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='일시')
+
+    def __str__(self):
+        return f'{self.get_movement_type_display()} {self.book_id} x {self.quantity}'
+
+    class Meta:
+        verbose_name = '재고 변동'
+        verbose_name_plural = '재고 변동 내역'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['order', 'book']),
+        ]
@@ -0,0 +1,30 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from order.models import Order
+from order.signals import orders_updated
+from .services import is_archiving_orders, release_orders, ship_orders, unship_orders
+
+
+@receiver(orders_updated)
+def sync_stock_on_delivery(sender, order_ids, fields, **kwargs):
+    """
+    주문 목록의 일괄 발송 처리/취소(bulk_update_order_status) 시 예약 <-> 출고를 전환합니다.
+    같은 트랜잭션 안에서 호출되므로 재고 변경도 함께 커밋/롤백됩니다.
+    """
+    if 'delivery_date' not in fields:
+        return
+    orders = Order.objects.filter(pk__in=order_ids)
+    if fields['delivery_date'] is None:
+        unship_orders(orders)
+    else:
+        ship_orders(orders)
+
+
+@receiver(pre_delete, sender=Order)
+def release_stock_on_delete(sender, instance, **kwargs):
+    # 원장의 order 는 SET_NULL 이므로, 주문이 지워지기 전에 남은 예약을 해제합니다.
+    # 연도 보관은 주문을 보관 테이블로 옮길 뿐이므로 재고를 바꾸지 않습니다.
+    if is_archiving_orders():
+        return
+    release_orders([instance])
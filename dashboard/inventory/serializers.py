@@ -0,0 +1,57 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from book.models import Book
+from .models import Stock, StockMovement
+from .services import record_movements
+
+
+class StockSerializer(serializers.ModelSerializer):
+    book_title = serializers.ReadOnlyField(source='book.title_korean')
+    book_type = serializers.ReadOnlyField(source='book.book_type')
+    available = serializers.ReadOnlyField()
+
+    class Meta:
+        model = Stock
+        fields = ['book', 'book_title', 'book_type', 'on_hand', 'reserved', 'available', 'low_stock_threshold', 'updated_at']
+
+
+class StockMovementCreateSerializer(serializers.Serializer):
+    """
+    입고/반품/재고 조정 등록 시리얼라이저 (주문 예약/출고는 주문 처리에서 자동 기록)
+    재고를 관리하지 않던 책을 입고하면 그 책의 재고 관리를 시작합니다.
+    """
+    MANUAL_TYPES = [
+        (StockMovement.RECEIPT, '입고'),
+        (StockMovement.RETURN, '반품'),
+        (StockMovement.ADJUST, '재고 조정'),
+    ]
+
+    book = serializers.PrimaryKeyRelatedField(queryset=Book.objects.all())
+    movement_type = serializers.ChoiceField(choices=MANUAL_TYPES)
+    quantity = serializers.IntegerField()
+    note = serializers.CharField(max_length=200, required=False, allow_blank=True, default='')
+    low_stock_threshold = serializers.IntegerField(min_value=0, required=False)
+
+    def validate(self, data):
+        if data['quantity'] == 0:
+            raise serializers.ValidationError("수량은 0일 수 없습니다.")
+        if data['movement_type'] != StockMovement.ADJUST and data['quantity'] < 0:
+            raise serializers.ValidationError("입고/반품 수량은 양수여야 합니다. (차감은 재고 조정으로 입력)")
+        return data
+
+    def create(self, validated_data):
+        book = validated_data['book']
+        with transaction.atomic():
+            defaults = {}
+            if 'low_stock_threshold' in validated_data:
+                defaults['low_stock_threshold'] = validated_data['low_stock_threshold']
+            stock, created = Stock.objects.get_or_create(book=book, defaults=defaults)
+            if not created and defaults:
+                Stock.objects.filter(pk=stock.pk).update(**defaults)
+
+            record_movements(
+                [(book.pk, validated_data['movement_type'], validated_data['quantity'])],
+                note=validated_data['note'],
+            )
+        return Stock.objects.select_related('book').get(pk=stock.pk)
@@ -0,0 +1,208 @@
+"""
+재고 카운터 변경 로직
+
+모든 변경은 Stock 행에 대한 조건부 UPDATE(F 식) 한 번으로 끝나며, 읽고-계산하고-쓰는 과정이 없습니다.
+- 예약은 'on_hand - reserved >= 요청 수량' 조건이 맞을 때만 UPDATE 되므로,
+  동시에 들어온 주문끼리 전역 잠금 없이도 초과 판매되지 않습니다. (UPDATE 된 행 수가 0 이면 재고 부족)
+- 예약 해제는 'reserved >= 해제 수량' 조건이 맞을 때만 UPDATE 되므로 예약 수량이 음수가 되지 않습니다.
+- 같은 트랜잭션에서 StockMovement 원장을 bulk_create 합니다.
+
+호출하는 쪽에서 transaction.atomic() 을 잡아야 하며, InsufficientStock 이 발생하면 그 트랜잭션은 롤백되어야 합니다.
+
+연도 보관/복원(order.archive)은 주문을 테이블 사이에서 옮길 뿐이므로 archiving_orders() 블록 안에서 실행하여
+주문 삭제 수신자가 예약을 해제하지 않게 하고, detach_movements/reattach_movements 로 원장의 주문 연결을 보존합니다.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db.models import F, Q, Sum
+
+from .models import Stock, StockMovement
+
+_state = threading.local()
+
+# 구분별 카운터 변화량 (on_hand, reserved) 부호
+MOVEMENT_EFFECTS = {
+    StockMovement.RECEIPT: (1, 0),
+    StockMovement.RESERVE: (0, 1),
+    StockMovement.RELEASE: (0, -1),
+    StockMovement.SHIP: (-1, -1),
+    StockMovement.UNSHIP: (1, 1),
+    StockMovement.RETURN: (1, 0),
+    StockMovement.ADJUST: (1, 0),
+}
+
+
+class InsufficientStock(Exception):
+    """예약하려는 수량보다 주문 가능 수량이 적을 때 발생합니다. shortages: {book_id: 요청 수량}"""
+    def __init__(self, shortages):
+        self.shortages = shortages
+        super().__init__(f'재고가 부족합니다: {shortages}')
+
+
+def tracked_book_ids(book_ids):
+    """재고를 관리하는(Stock 행이 있는) 책 id 집합"""
+    return set(Stock.objects.filter(book_id__in=book_ids).values_list('book_id', flat=True))
+
+
+def _apply(book_id, movement_type, quantity):
+    on_hand_sign, reserved_sign = MOVEMENT_EFFECTS[movement_type]
+    changes = {}
+    if on_hand_sign:
+        changes['on_hand'] = F('on_hand') + on_hand_sign * quantity
+    if reserved_sign:
+        changes['reserved'] = F('reserved') + reserved_sign * quantity
+
+    queryset = Stock.objects.filter(book_id=book_id)
+    if movement_type == StockMovement.RESERVE:
+        # 주문 가능 수량이 충분할 때만 예약 (조건부 UPDATE)
+        queryset = queryset.filter(on_hand__gte=F('reserved') + quantity)
+    elif movement_type == StockMovement.RELEASE:
+        # 예약된 수량보다 많이 해제하지 않음 (조건부 UPDATE)
+        queryset = queryset.filter(reserved__gte=quantity)
+    return queryset.update(**changes)
+
+
+def record_movements(movements, order=None, note=''):
+    """
+    (book_id, 구분, 수량) 목록을 카운터에 반영하고 원장에 기록합니다.
+    재고를 관리하지 않는 책은 건너뛰며, 예약 실패가 있으면 InsufficientStock 을 발생시킵니다.
+    예약 수량보다 많은 해제는 카운터/원장 모두 반영하지 않습니다. (예약한 적 없는 수량을 해제하지 않도록)
+    반환값: 기록된 StockMovement 목록
+    """
+    movements = [(book_id, movement_type, quantity) for book_id, movement_type, quantity in movements if quantity]
+    tracked = tracked_book_ids({book_id for book_id, _, _ in movements})
+
+    shortages = {}
+    ledger = []
+    for book_id, movement_type, quantity in movements:
+        if book_id not in tracked:
+            continue
+        if not _apply(book_id, movement_type, quantity):
+            if movement_type != StockMovement.RELEASE:
+                shortages[book_id] = quantity
+            continue
+        ledger.append(StockMovement(
+            book_id=book_id, movement_type=movement_type, quantity=quantity, order=order, note=note
+        ))
+
+    if shortages:
+        raise InsufficientStock(shortages)
+    return StockMovement.objects.bulk_create(ledger)
+
+
+def reserve_for_order(order, quantities):
+    """
+    주문 상품 수량 변화({book_id: 변화량})만큼 예약/예약 해제합니다.
+    새 주문이면 전체 수량, 주문 수정이면 (새 수량 - 원장에 남은 예약 수량)을 넘깁니다.
+    """
+    movements = []
+    for book_id, delta in quantities.items():
+        if delta > 0:
+            movements.append((book_id, StockMovement.RESERVE, delta))
+        elif delta < 0:
+            movements.append((book_id, StockMovement.RELEASE, -delta))
+    return record_movements(movements, order=order)
+
+
+def outstanding_reservations(order_ids):
+    """
+    주문별로 아직 남아 있는(발송 전) 예약 수량을 {(order_id, book_id): 수량} 으로 반환합니다.
+    원장 중 해당 주문의 행만 집계합니다. (order, book 색인)
+    """
+    signed = {
+        StockMovement.RESERVE: 1, StockMovement.RELEASE: -1,
+        StockMovement.SHIP: -1, StockMovement.UNSHIP: 1,
+    }
+    rows = (
+        StockMovement.objects.filter(order_id__in=order_ids, movement_type__in=signed)
+        .values('order_id', 'book_id', 'movement_type')
+        .annotate(total=Sum('quantity'))
+    )
+    balance = defaultdict(int)
+    for row in rows:
+        balance[(row['order_id'], row['book_id'])] += signed[row['movement_type']] * row['total']
+    return balance
+
+
+def shipped_quantities(order_ids):
+    """주문별 출고(발송)된 수량 {(order_id, book_id): 수량}"""
+    rows = (
+        StockMovement.objects.filter(order_id__in=order_ids, movement_type__in=[StockMovement.SHIP, StockMovement.UNSHIP])
+        .values('order_id', 'book_id')
+        .annotate(
+            shipped=Sum('quantity', filter=Q(movement_type=StockMovement.SHIP)),
+            unshipped=Sum('quantity', filter=Q(movement_type=StockMovement.UNSHIP)),
+        )
+    )
+    return {(row['order_id'], row['book_id']): (row['shipped'] or 0) - (row['unshipped'] or 0) for row in rows}
+
+
+def _record_per_order(orders, balances, movement_type):
+    by_order = defaultdict(list)
+    for (order_id, book_id), quantity in balances.items():
+        if quantity > 0:
+            by_order[order_id].append((book_id, movement_type, quantity))
+    for order_id, movements in by_order.items():
+        record_movements(movements, order=orders[order_id])
+
+
+def ship_orders(orders):
+    """발송 처리된 주문의 남은 예약을 출고로 전환합니다."""
+    orders = {order.pk: order for order in orders}
+    _record_per_order(orders, outstanding_reservations(list(orders)), StockMovement.SHIP)
+
+
+def unship_orders(orders):
+    """발송 취소된 주문의 출고 수량을 다시 예약으로 되돌립니다."""
+    orders = {order.pk: order for order in orders}
+    _record_per_order(orders, shipped_quantities(list(orders)), StockMovement.UNSHIP)
+
+
+def release_orders(orders):
+    """삭제되는 주문의 남은 예약을 해제합니다."""
+    orders = {order.pk: order for order in orders}
+    _record_per_order(orders, outstanding_reservations(list(orders)), StockMovement.RELEASE)
+
+
+@contextmanager
+def archiving_orders():
+    """블록 안에서는 주문 삭제 시 예약을 해제하지 않습니다. (연도 보관/복원 전용)"""
+    _state.archiving = getattr(_state, 'archiving', 0) + 1
+    try:
+        yield
+    finally:
+        _state.archiving -= 1
+
+
+def is_archiving_orders():
+    return getattr(_state, 'archiving', 0) > 0
+
+
+def detach_movements(order_ids):
+    """
+    보관할 주문들의 원장 행에 주문 id 를 따로 적어 둡니다.
+    (주문이 지워지면 order 는 SET_NULL 로 비워지므로 복원 때 다시 연결할 수 있도록)
+    """
+    return StockMovement.objects.filter(order_id__in=order_ids).update(archived_order_id=F('order_id'))
+
+
+def reattach_movements(order_ids):
+    """복원된 주문들의 원장 행을 다시 주문에 연결합니다."""
+    return StockMovement.objects.filter(archived_order_id__in=order_ids).update(
+        order_id=F('archived_order_id'), archived_order_id=None
+    )
+
+
+def low_stock(queryset=None):
+    """
+    주문 가능 수량이 기준 이하인 재고 (카운터만 조회, 원장 합산 없음)
+    """
+    queryset = queryset if queryset is not None else Stock.objects.all()
+    return (
+        queryset.annotate(available_quantity=F('on_hand') - F('reserved'))
+        .filter(available_quantity__lte=F('low_stock_threshold'))
+        .select_related('book')
+        .order_by('available_quantity', 'book__title_korean')
+    )
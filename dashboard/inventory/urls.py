@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.stock_list, name='stock_list'),
+    path('api/low-stock/', views.LowStockAPIView.as_view(), name='inventory-api-low-stock'),
+    path('api/movements/', views.StockMovementCreateAPIView.as_view(), name='inventory-api-movements'),
+]
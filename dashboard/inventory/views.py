@@ -0,0 +1,51 @@
+from django.shortcuts import render
+from rest_framework import generics, status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Stock
+from .serializers import StockMovementCreateSerializer, StockSerializer
+from .services import low_stock
+
+
+def stock_list(request):
+    """
+    [GET] /inventory/
+    재고 현황 페이지. 재고 부족 목록과 전체 재고를 카운터(Stock)에서 바로 보여줍니다.
+    """
+    context = {
+        'low_stocks': low_stock(),
+        'stocks': Stock.objects.select_related('book').order_by('book__title_korean'),
+    }
+    return render(request, 'inventory/stock_list.html', context)
+
+
+class LowStockAPIView(generics.ListAPIView):
+    """
+    [GET] /inventory/api/low-stock/
+    주문 가능 수량(보유 - 예약)이 기준 이하인 책 목록 (원장 합산 없이 카운터만 조회)
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    serializer_class = StockSerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        return low_stock()
+
+
+class StockMovementCreateAPIView(APIView):
+    """
+    [POST] /inventory/api/movements/
+    입고/반품/재고 조정을 등록하고 변경된 재고를 반환합니다.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = StockMovementCreateSerializer(data=request.data)
+        if serializer.is_valid():
+            stock = serializer.save()
+            return Response(StockSerializer(stock).data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
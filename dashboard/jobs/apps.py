@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+
+    def ready(self):
+        # 각 앱의 tasks.py 를 불러와 @register_task 로 선언된 작업을 등록합니다.
+        autodiscover_modules('tasks')
@@ -0,0 +1,55 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.queue import claim_jobs, execute_job, reclaim_stale_jobs
+
+
+class Command(BaseCommand):
+    help = 'DB 작업 큐(jobs.Job)에 쌓인 백그라운드 작업을 스레드/프로세스 풀로 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='동시에 실행할 작업 수 (기본 2)')
+        parser.add_argument('--mode', choices=['thread', 'process'], default='thread', help='실행 풀 종류 (기본 thread)')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='대기 작업이 없을 때 다시 조회하기까지의 간격(초)')
+        parser.add_argument('--stale-after', type=int, default=600, help='응답이 없는 RUNNING 작업을 재적재하기까지의 시간(초)')
+        parser.add_argument('--once', action='store_true', help='대기 중인 작업을 모두 처리하면 종료')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        poll_interval = options['poll_interval']
+
+        reclaimed = reclaim_stale_jobs(options['stale_after'])
+        if reclaimed:
+            self.stdout.write(f'멈춘 작업 {reclaimed}건을 다시 대기 상태로 돌렸습니다.')
+
+        if options['mode'] == 'process':
+            # fork 전에 부모의 DB 연결을 닫아 자식 프로세스와 공유되지 않도록 합니다.
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job-worker')
+
+        self.stdout.write(f"작업 워커 시작 ({options['mode']} x {workers})")
+        running = set()
+        try:
+            while True:
+                running = {future for future in running if not future.done()}
+
+                job_ids = claim_jobs(workers - len(running))
+                for job_id in job_ids:
+                    self.stdout.write(f'작업 #{job_id} 실행')
+                    running.add(executor.submit(execute_job, job_id))
+
+                if options['once'] and not job_ids and not running:
+                    break
+                if not job_ids:
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            self.stdout.write('종료 요청을 받았습니다. 실행 중인 작업이 끝나길 기다립니다...')
+        finally:
+            executor.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS('작업 워커 종료'))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:23
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_name', models.CharField(db_index=True, max_length=100, verbose_name='작업 이름')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='작업 인자')),
+                ('status', models.CharField(choices=[('PENDING', '대기 중'), ('RUNNING', '실행 중'), ('SUCCEEDED', '완료'), ('FAILED', '실패')], default='PENDING', max_length=10, verbose_name='상태')),
+                ('progress_current', models.PositiveIntegerField(default=0, verbose_name='처리 건수')),
+                ('progress_total', models.PositiveIntegerField(default=0, verbose_name='전체 건수')),
+                ('progress_message', models.CharField(blank=True, max_length=255, verbose_name='진행 메시지')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='결과')),
+                ('error', models.TextField(blank=True, verbose_name='오류 내용')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='시도 횟수')),
+                ('max_attempts', models.PositiveIntegerField(default=3, verbose_name='최대 시도 횟수')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='실행 가능 시각')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작일')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='종료일')),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True, verbose_name='마지막 응답 시각')),
+            ],
+            options={
+                'verbose_name': '백그라운드 작업',
+                'verbose_name_plural': '백그라운드 작업 목록',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx')],
+            },
+        ),
+    ]
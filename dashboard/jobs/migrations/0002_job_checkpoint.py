@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='checkpoint',
+            field=models.JSONField(blank=True, default=dict, verbose_name='재시도 지점'),
+        ),
+    ]
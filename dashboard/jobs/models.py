@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    백그라운드 작업 모델 (DB 기반 작업 큐)
+    요청 스레드에서 처리하기 무거운 작업(가격 일괄 변동, 정산 생성, 가져오기/내보내기)을
+    테이블에 쌓아두고 `manage.py run_workers` 가 꺼내서 실행합니다.
+    """
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    SUCCEEDED = 'SUCCEEDED'
+    FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (PENDING, '대기 중'),
+        (RUNNING, '실행 중'),
+        (SUCCEEDED, '완료'),
+        (FAILED, '실패'),
+    ]
+
+    task_name = models.CharField(max_length=100, db_index=True, verbose_name='작업 이름')
+    payload = models.JSONField(default=dict, blank=True, verbose_name='작업 인자')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name='상태')
+
+    # 진행률 (HTMX 진행 표시줄에서 사용)
+    progress_current = models.PositiveIntegerField(default=0, verbose_name='처리 건수')
+    progress_total = models.PositiveIntegerField(default=0, verbose_name='전체 건수')
+    progress_message = models.CharField(max_length=255, blank=True, verbose_name='진행 메시지')
+
+    result = models.JSONField(null=True, blank=True, verbose_name='결과')
+    # 재시도 시 이어서 처리할 지점 (작업 함수가 save_checkpoint 로 기록)
+    checkpoint = models.JSONField(default=dict, blank=True, verbose_name='재시도 지점')
+    error = models.TextField(blank=True, verbose_name='오류 내용')
+
+    # 재시도
+    attempts = models.PositiveIntegerField(default=0, verbose_name='시도 횟수')
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name='최대 시도 횟수')
+    run_after = models.DateTimeField(default=timezone.now, verbose_name='실행 가능 시각')
+
+    # 작업을 요청한 사용자 (관리 명령/내부 작업이 적재한 경우 비어 있음). 작업 조회 API 는 요청자와 관리자만 볼 수 있습니다.
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+', verbose_name='요청자',
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='시작일')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='종료일')
+    heartbeat_at = models.DateTimeField(null=True, blank=True, verbose_name='마지막 응답 시각')
+
+    class Meta:
+        verbose_name = '백그라운드 작업'
+        verbose_name_plural = '백그라운드 작업 목록'
+        ordering = ['-created_at']
+        indexes = [
+            # 워커가 '실행 가능한 대기 작업'을 찾는 쿼리용
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.task_name} #{self.pk} ({self.get_status_display()})'
+
+    @property
+    def is_finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+    @property
+    def error_summary(self):
+        """화면/API 에 보여줄 오류 요약 (traceback 의 마지막 줄 = 예외 종류와 메시지)"""
+        lines = [line for line in self.error.strip().splitlines() if line.strip()]
+        return lines[-1][:255] if lines else ''
+
+    @property
+    def percent(self):
+        if self.status == self.SUCCEEDED:
+            return 100
+        if not self.progress_total:
+            return 0
+        return min(100, int(self.progress_current * 100 / self.progress_total))
+
+    def update_progress(self, current, total=None, message=None):
+        """
+        작업 함수 안에서 진행률을 기록합니다.
+        인스턴스 전체를 save() 하지 않고 필요한 컬럼만 UPDATE 합니다.
+        """
+        fields = {'progress_current': current, 'heartbeat_at': timezone.now()}
+        if total is not None:
+            fields['progress_total'] = total
+        if message is not None:
+            fields['progress_message'] = message[:255]
+
+        Job.objects.filter(pk=self.pk).update(**fields)
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def save_checkpoint(self, **data):
+        """
+        재시도 시 이어서 처리할 지점을 기록합니다.
+        작업 함수의 트랜잭션 안에서 호출하면 처리 결과와 지점이 함께 커밋되어, 재시도가 같은 묶음을 다시 처리하지 않습니다.
+        """
+        self.checkpoint = {**self.checkpoint, **data}
+        Job.objects.filter(pk=self.pk).update(checkpoint=self.checkpoint)
@@ -0,0 +1,146 @@
+"""
+DB 기반 작업 큐의 등록/적재/실행 로직
+
+- register_task : 작업 함수를 이름으로 등록하는 데코레이터 (각 앱의 tasks.py 에서 사용)
+- enqueue       : 작업을 테이블에 적재 (요청 스레드에서 호출)
+- claim_jobs    : 워커가 실행할 작업을 원자적으로 선점
+- execute_job   : 선점한 작업 1건을 실행하고 성공/재시도/실패를 기록
+"""
+import datetime
+import logging
+import traceback
+
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대기 시간(초). 시도 횟수에 따라 2배씩 늘어납니다. (30s, 60s, 120s ...)
+RETRY_BACKOFF_SECONDS = 30
+
+_registry = {}
+
+
+def register_task(name):
+    """
+    작업 함수 등록 데코레이터.
+    작업 함수는 `func(job, **payload)` 형태로 호출되며, 반환값(JSON 직렬화 가능)은 job.result 에 저장됩니다.
+    """
+    def decorator(func):
+        if name in _registry and _registry[name] is not func:
+            raise ValueError(f"'{name}' 작업이 이미 등록되어 있습니다.")
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    return _registry.get(name)
+
+
+def enqueue(task_name, payload=None, max_attempts=3, created_by=None):
+    """
+    작업을 대기 상태로 적재하고 Job 인스턴스를 반환합니다.
+    created_by 는 작업을 요청한 사용자입니다. (비로그인 요청이면 None)
+    """
+    if task_name not in _registry:
+        raise ValueError(f"등록되지 않은 작업입니다: {task_name}")
+    return Job.objects.create(
+        task_name=task_name,
+        payload=payload or {},
+        max_attempts=max_attempts,
+        created_by=created_by if created_by is not None and created_by.is_authenticated else None,
+    )
+
+
+def claim_jobs(limit):
+    """
+    실행 가능한 대기 작업을 최대 limit 건 선점합니다.
+    상태 조건부 UPDATE(PENDING -> RUNNING)로 선점하므로 워커가 여러 개여도 같은 작업을 두 번 실행하지 않습니다.
+    """
+    if limit <= 0:
+        return []
+
+    now = timezone.now()
+    candidate_ids = list(
+        Job.objects.filter(status=Job.PENDING, run_after__lte=now)
+        .order_by('run_after', 'pk')
+        .values_list('pk', flat=True)[:limit]
+    )
+
+    claimed = []
+    for pk in candidate_ids:
+        updated = Job.objects.filter(pk=pk, status=Job.PENDING).update(
+            status=Job.RUNNING,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if updated:
+            claimed.append(pk)
+    return claimed
+
+
+def reclaim_stale_jobs(stale_after_seconds):
+    """
+    워커가 비정상 종료되어 RUNNING 상태로 멈춘 작업을 다시 대기 상태로 돌립니다.
+    """
+    threshold = timezone.now() - datetime.timedelta(seconds=stale_after_seconds)
+    return Job.objects.filter(status=Job.RUNNING, heartbeat_at__lt=threshold).update(
+        status=Job.PENDING,
+        run_after=timezone.now(),
+    )
+
+
+def execute_job(job_id):
+    """
+    선점된 작업 1건을 실행합니다. (스레드/프로세스 풀 어디서든 호출 가능)
+    """
+    close_old_connections()
+    try:
+        job = Job.objects.get(pk=job_id)
+        func = get_task(job.task_name)
+
+        if func is None:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.FAILED,
+                error=f"등록되지 않은 작업입니다: {job.task_name}",
+                finished_at=timezone.now(),
+            )
+            return Job.FAILED
+
+        try:
+            result = func(job, **job.payload)
+        except Exception:
+            error = traceback.format_exc()
+            logger.exception('작업 실패: %s #%s (시도 %s/%s)', job.task_name, job.pk, job.attempts, job.max_attempts)
+
+            if job.attempts < job.max_attempts:
+                # 재시도: 대기 시간을 늘려가며 다시 대기 상태로
+                delay = RETRY_BACKOFF_SECONDS * (2 ** (job.attempts - 1))
+                Job.objects.filter(pk=job.pk).update(
+                    status=Job.PENDING,
+                    error=error,
+                    run_after=timezone.now() + datetime.timedelta(seconds=delay),
+                )
+                return Job.PENDING
+
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.FAILED,
+                error=error,
+                finished_at=timezone.now(),
+            )
+            return Job.FAILED
+
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.SUCCEEDED,
+            result=result,
+            error='',
+            finished_at=timezone.now(),
+        )
+        return Job.SUCCEEDED
+    finally:
+        close_old_connections()
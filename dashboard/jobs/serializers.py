@@ -0,0 +1,23 @@
+from rest_framework import serializers
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """
+    작업 상태 조회용 시리얼라이저 (진행률 폴링)
+    """
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    percent = serializers.IntegerField(read_only=True)
+    is_finished = serializers.BooleanField(read_only=True)
+    # 내부 경로/코드가 드러나는 traceback 대신 마지막 줄(예외 종류와 메시지)만 반환
+    error = serializers.CharField(source='error_summary', read_only=True)
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'task_name', 'status', 'status_display', 'percent', 'is_finished',
+            'progress_current', 'progress_total', 'progress_message',
+            'result', 'error', 'attempts', 'max_attempts',
+            'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('<int:pk>/progress/', views.job_progress, name='job_progress'),
+    path('api/<int:pk>/', views.JobDetailAPIView.as_view(), name='job-api-detail'),
+]
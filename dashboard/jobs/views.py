@@ -0,0 +1,33 @@
+from django.shortcuts import render, get_object_or_404
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+def job_progress(request, pk):
+    """
+    [GET] /jobs/<pk>/progress/
+    작업 진행률 HTML 조각을 반환합니다.
+    작업이 끝나지 않았으면 조각 자체가 1초마다 자신을 다시 요청(hx-trigger="every 1s")하고,
+    끝나면 폴링 속성이 빠진 최종 상태를 그려서 폴링이 멈춥니다.
+    """
+    job = get_object_or_404(Job, pk=pk)
+    return render(request, 'jobs/partials/job_progress.html', {'job': job})
+
+
+class JobDetailAPIView(generics.RetrieveAPIView):
+    """
+    [GET] /jobs/api/<pk>/
+    작업 상태를 JSON으로 반환합니다. (fetch 기반 화면의 폴링용)
+    - 로그인 필요. 관리자는 모든 작업을, 그 외 사용자는 본인이 요청한 작업만 조회할 수 있습니다. (그 외는 404)
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = JobSerializer
+
+    def get_queryset(self):
+        queryset = Job.objects.all()
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(created_by=self.request.user)
+        return queryset
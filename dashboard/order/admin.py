@@ -1,6 +1,8 @@
 from django.contrib import admin
-from .models import Customer, Order, OrderItem
+from .models import Customer, Order, OrderItem, ArchivedOrder, ArchivedYear
 
 admin.site.register(Customer)
 admin.site.register(Order)
-admin.site.register(OrderItem)
\ No newline at end of file
+admin.site.register(OrderItem)
+admin.site.register(ArchivedOrder)
+admin.site.register(ArchivedYear)
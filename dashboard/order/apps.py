@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class OrderConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'order'
+
+    def ready(self):
+        # 주문 변경 시 캐시 무효화 등 신호 수신자 등록
+        from . import receivers  # noqa: F401
@@ -0,0 +1,167 @@
+"""
+연도별 주문 보관(archive)
+
+결제가 모두 끝나고 정산까지 마친 연도의 주문을 운영 테이블(Order/OrderItem)에서
+보관 테이블(ArchivedOrder/ArchivedOrderItem)로 옮겨 운영 테이블을 작게 유지합니다.
+- 보관 시점에 연도 합계(ArchivedYear)와 책별 합계(ArchivedBookYearTotal)를 계산해 둡니다.
+  (보관 연도 목록 archived_years, 책 검색의 주문 수 순위에서 읽습니다)
+- 주문 목록/내보내기는 include_archived 옵션일 때만 보관 테이블을 함께 조회합니다.
+- 정산/판매 보고서는 보관 테이블도 포함하는 일별 판매 집계를 읽으므로 기본적으로 보관 연도가 합계에 들어가며,
+  include_archived=0 일 때만 보관 연도의 판매를 뺍니다.
+- restore_year 로 언제든 운영 테이블로 되돌릴 수 있습니다.
+- 일별 판매 집계(DailyBookSales)는 보관 테이블도 포함하므로 보관/복원 중에는 다시 계산하지 않습니다.
+- 재고도 바뀌지 않습니다. 주문 삭제 수신자의 예약 해제를 끄고(archiving_orders),
+  재고 원장의 주문 연결은 archived_order_id 에 적어 두었다가 복원 때 되돌립니다.
+"""
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from inventory.services import archiving_orders, detach_movements, reattach_movements
+from reimbursement.cache import invalidate_reimbursement_cache
+from reimbursement.models import Settlement
+from sales.services import suppress_rollup
+from .models import (
+    ArchivedBookYearTotal, ArchivedOrder, ArchivedOrderItem, ArchivedYear, Order, OrderItem,
+)
+
+ARCHIVE_CHUNK_SIZE = 1000
+
+ORDER_FIELDS = [
+    'id', 'customer_id', 'order_date', 'payment_method', 'payment_date', 'delivery_date',
+    'order_source', 'delivery_method', 'requests', 'updated_at',
+]
+ORDER_ITEM_FIELDS = ['id', 'order_id', 'book_id', 'quantity', 'discount_rate', 'additional_quantity', 'total_price']
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def include_archived(params, default=False):
+    """요청 파라미터의 include_archived 스위치 ('1', 'true', 'on'). 값이 없으면 default"""
+    value = params.get('include_archived')
+    if value in (None, ''):
+        return default
+    return str(value).lower() in ('1', 'true', 'on')
+
+
+def archived_years():
+    """보관된 연도 목록 (오래된 순)"""
+    return list(ArchivedYear.objects.order_by('year').values_list('year', flat=True))
+
+
+def year_close_blockers(year):
+    """
+    연도를 보관할 수 없는 이유 목록을 반환합니다. (빈 목록이면 보관 가능)
+    - 미결제 주문이 남아 있으면 안 됩니다.
+    - 그 연도의 정산 기록이 있다면 모두 정산 완료여야 합니다.
+    - 올해(진행 중인 연도)는 보관할 수 없습니다.
+    """
+    blockers = []
+    if year >= timezone.localdate().year:
+        blockers.append(f'{year}년은 아직 끝나지 않은 연도입니다.')
+
+    unpaid = Order.objects.filter(order_date__year=year, payment_date__isnull=True).count()
+    if unpaid:
+        blockers.append(f'미결제 주문이 {unpaid}건 있습니다.')
+
+    unsettled = Settlement.objects.filter(settlement_year=year, is_settled=False).count()
+    if unsettled:
+        blockers.append(f'정산이 끝나지 않은 저자가 {unsettled}명 있습니다.')
+
+    if ArchivedYear.objects.filter(year=year).exists():
+        blockers.append(f'{year}년은 이미 보관되었습니다.')
+    return blockers
+
+
+def _chunks(ids, size):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def archive_year(year, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    연도의 주문을 보관 테이블로 옮기고 합계를 기록합니다. (하나의 트랜잭션)
+    반환값: 생성된 ArchivedYear
+    """
+    blockers = year_close_blockers(year)
+    if blockers:
+        raise ArchiveError(' / '.join(blockers))
+
+    now = timezone.now()
+    with transaction.atomic(), suppress_rollup(), archiving_orders():
+        orders = Order.objects.filter(order_date__year=year)
+        items = OrderItem.objects.filter(order__in=orders)
+
+        # 1. 합계 (운영 테이블에서 한 번만 집계)
+        totals = items.aggregate(
+            item_count=Count('id'), total_quantity=Sum('quantity'), total_amount=Sum('total_price')
+        )
+        archived_year = ArchivedYear.objects.create(
+            year=year,
+            order_count=orders.count(),
+            item_count=totals['item_count'] or 0,
+            total_quantity=totals['total_quantity'] or 0,
+            total_amount=totals['total_amount'] or 0,
+            archived_at=now,
+        )
+        ArchivedBookYearTotal.objects.bulk_create([
+            ArchivedBookYearTotal(year=year, **row)
+            for row in items.values('book_id').annotate(
+                order_count=Count('order_id', distinct=True),
+                total_quantity=Sum('quantity'),
+                total_amount=Sum('total_price'),
+            ).order_by('book_id')
+        ])
+
+        # 2. 묶음 단위로 복사 후 운영 테이블에서 삭제
+        order_ids = list(orders.order_by('id').values_list('id', flat=True))
+        for chunk in _chunks(order_ids, chunk_size):
+            ArchivedOrder.objects.bulk_create([
+                ArchivedOrder(year=year, archived_at=now, **row)
+                for row in Order.objects.filter(id__in=chunk).values(*ORDER_FIELDS)
+            ])
+            ArchivedOrderItem.objects.bulk_create([
+                ArchivedOrderItem(**row)
+                for row in OrderItem.objects.filter(order_id__in=chunk).values(*ORDER_ITEM_FIELDS)
+            ])
+            detach_movements(chunk)
+            Order.objects.filter(id__in=chunk).delete()
+        # 보관 연도 목록이 바뀌므로 include_archived=0 으로 캐시된 보고서를 무효화합니다.
+        invalidate_reimbursement_cache()
+
+    return archived_year
+
+
+def restore_year(year, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    보관된 연도를 운영 테이블로 되돌리고 합계를 지웁니다. (하나의 트랜잭션)
+    반환값: 되돌린 주문 수
+    """
+    if not ArchivedYear.objects.filter(year=year).exists():
+        raise ArchiveError(f'{year}년은 보관되어 있지 않습니다.')
+
+    with transaction.atomic(), suppress_rollup(), archiving_orders():
+        order_ids = list(ArchivedOrder.objects.filter(year=year).order_by('id').values_list('id', flat=True))
+        for chunk in _chunks(order_ids, chunk_size):
+            rows = list(ArchivedOrder.objects.filter(id__in=chunk).values(*ORDER_FIELDS))
+            restored = Order.objects.bulk_create([Order(**row) for row in rows])
+            # auto_now_add/auto_now 가 bulk_create 시 현재 시각으로 덮어쓰므로 원래 값으로 되돌립니다.
+            for order, row in zip(restored, rows):
+                order.order_date = row['order_date']
+                order.updated_at = row['updated_at']
+            Order.objects.bulk_update(restored, ['order_date', 'updated_at'])
+
+            OrderItem.objects.bulk_create([
+                OrderItem(**row)
+                for row in ArchivedOrderItem.objects.filter(order_id__in=chunk).values(*ORDER_ITEM_FIELDS)
+            ])
+            reattach_movements(chunk)
+            ArchivedOrder.objects.filter(id__in=chunk).delete()
+
+        ArchivedBookYearTotal.objects.filter(year=year).delete()
+        ArchivedYear.objects.filter(year=year).delete()
+        invalidate_reimbursement_cache()
+
+    return len(order_ids)
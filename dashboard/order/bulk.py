@@ -0,0 +1,58 @@
+import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Order
+from .signals import orders_updated
+
+# 일괄 상태 변경 동작 -> (변경할 필드, 값을 채울지 여부)
+BULK_STATUS_ACTIONS = {
+    'mark_paid': ('payment_date', True),
+    'mark_unpaid': ('payment_date', False),
+    'mark_shipped': ('delivery_date', True),
+    'mark_unshipped': ('delivery_date', False),
+}
+
+
+def to_aware_datetime(value):
+    """
+    날짜(date)를 현재 시간대 기준 자정의 aware datetime 으로 변환합니다. (None 이면 현재 시각)
+    """
+    if value is None:
+        return timezone.now()
+    return timezone.make_aware(datetime.datetime.combine(value, datetime.time.min))
+
+
+def bulk_set_order_fields(queryset, **fields):
+    """
+    queryset 에 해당하는 주문들의 필드를 단일 UPDATE 로 변경합니다.
+    변경된 주문 id 목록으로 orders_updated 신호를 같은 트랜잭션 안에서 발송하여
+    요약 데이터도 함께 갱신되도록 합니다.
+
+    반환값: 변경된 주문 id 목록
+    """
+    with transaction.atomic():
+        # 조인이 포함된 필터(책 제목 검색 등)도 pk 서브쿼리 하나로 UPDATE 하기 위해 감쌉니다.
+        target = Order.objects.filter(pk__in=queryset.values('pk'))
+        order_ids = list(target.values_list('pk', flat=True))
+        if not order_ids:
+            return []
+
+        # update() 는 auto_now 를 채우지 않으므로 수정일도 함께 갱신 (증분 동기화 API 용)
+        target.update(updated_at=timezone.now(), **fields)
+        orders_updated.send(sender=Order, order_ids=order_ids, fields=fields)
+
+    return order_ids
+
+
+def bulk_update_order_status(queryset, action, date=None):
+    """
+    일괄 상태 변경 동작(mark_paid 등)을 적용합니다.
+    상태가 실제로 바뀌는 주문만 대상으로 합니다. (이미 입력된 결제일/발송일은 덮어쓰지 않고, 비어 있는 값은 다시 지우지 않음)
+    반환값: 변경된 주문 id 목록
+    """
+    field_name, set_value = BULK_STATUS_ACTIONS[action]
+    value = to_aware_datetime(date) if set_value else None
+    queryset = queryset.filter(**{f'{field_name}__isnull': set_value})
+    return bulk_set_order_fields(queryset, **{field_name: value})
@@ -0,0 +1,95 @@
+"""
+'함께 많이 주문된 책' 색인 생성
+
+OrderItem 의 (주문, 책) 쌍을 주문 순서대로 한 번 훑으면서 같은 주문에 담긴 책 쌍의 횟수를 셉니다.
+책 x 책 행렬은 대부분 0 인 희소 행렬이므로 {책: Counter(함께 담긴 책: 횟수)} 형태로만 보관하고,
+책마다 상위 K 권만 BookPairing 테이블에 저장합니다. 조회는 (book, rank) 색인 1회로 끝납니다.
+"""
+import heapq
+from collections import Counter, defaultdict
+from itertools import combinations, groupby
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from book.models import PriceHistory
+from .models import BookPairing, OrderItem
+
+PAIRING_TOP_K = 10
+PAIRING_CHUNK_SIZE = 2000
+
+# 한 주문에 책이 너무 많으면(도매/일괄 주문) 쌍의 수가 제곱으로 늘고 추천 의미도 약하므로 제외합니다.
+MAX_BOOKS_PER_ORDER = 50
+
+
+def count_cooccurrences(order_book_pairs):
+    """
+    (order_id, book_id) 쌍(order_id 순 정렬)에서 책-책 동시 주문 횟수를 셉니다.
+    반환값: {book_id: Counter({paired_book_id: 횟수})}
+    """
+    matrix = defaultdict(Counter)
+    for _, rows in groupby(order_book_pairs, key=lambda row: row[0]):
+        book_ids = sorted({book_id for _, book_id in rows})
+        if len(book_ids) < 2 or len(book_ids) > MAX_BOOKS_PER_ORDER:
+            continue
+        for a, b in combinations(book_ids, 2):
+            matrix[a][b] += 1
+            matrix[b][a] += 1
+    return matrix
+
+
+def build_book_pairings(top_k=PAIRING_TOP_K, job=None):
+    """
+    전체 주문 상품으로 BookPairing 테이블을 다시 만듭니다. (기존 행은 같은 트랜잭션에서 교체)
+    반환값: {'book_count': 색인된 책 수, 'pairing_count': 저장한 행 수}
+    """
+    if job:
+        job.update_progress(0, 2, '주문 상품 집계 중')
+
+    # 1. 주문별 책 목록을 한 번 훑어 희소 행렬 구성 (서버 측 커서로 메모리 일정)
+    pairs = (
+        OrderItem.objects.order_by('order_id')
+        .values_list('order_id', 'book_id')
+        .iterator(chunk_size=PAIRING_CHUNK_SIZE)
+    )
+    matrix = count_cooccurrences(pairs)
+
+    if job:
+        job.update_progress(1, message='색인 저장 중')
+
+    # 2. 책마다 상위 K 권 선택 (횟수 많은 순, 같으면 책 id 순)
+    built_at = timezone.now()
+    rows = []
+    for book_id, counter in matrix.items():
+        top = heapq.nsmallest(top_k, counter.items(), key=lambda item: (-item[1], item[0]))
+        rows.extend(
+            BookPairing(book_id=book_id, paired_book_id=paired_id, together_count=count, rank=rank, built_at=built_at)
+            for rank, (paired_id, count) in enumerate(top, start=1)
+        )
+
+    # 3. 한 트랜잭션에서 교체 (조회 쪽은 항상 이전 또는 새 색인 중 하나를 봅니다)
+    with transaction.atomic():
+        BookPairing.objects.all().delete()
+        BookPairing.objects.bulk_create(rows, batch_size=1000)
+
+    if job:
+        job.update_progress(2, message=f'{len(matrix)}권 색인 완료')
+    return {'book_count': len(matrix), 'pairing_count': len(rows)}
+
+
+def get_book_suggestions(book_id, limit=5):
+    """
+    책과 함께 많이 주문된 책을 순위대로 반환합니다. (책 제목/최신 가격까지 쿼리 1회)
+    """
+    latest_price_sq = PriceHistory.objects.filter(
+        book=OuterRef('paired_book_id'),
+        is_latest=True
+    ).order_by('-price_updated_at').values('price')[:1]
+
+    return list(
+        BookPairing.objects.filter(book_id=book_id, rank__lte=limit)
+        .select_related('paired_book')
+        .annotate(latest_price=Subquery(latest_price_sq))
+        .order_by('rank')
+    )
@@ -0,0 +1,122 @@
+"""
+주문 내보내기 (회계/배송 라벨용 CSV, XLSX)
+
+주문 목록(order_list)과 같은 검색 조건으로 주문을 조회하되,
+- 주문 id 만 .iterator() 로 묶음(chunk) 단위로 읽고
+- 묶음마다 주문자/주문 상품/책을 한 번에 불러와
+- 한 줄씩 바로 써 내려가므로 1년치 주문도 메모리를 일정하게 유지합니다.
+"""
+import csv
+import tempfile
+
+from django.utils import timezone
+
+from .archive import include_archived
+from .filters import filter_orders
+from .models import ArchivedOrder, Order
+
+# 한 번에 불러올 주문 수
+EXPORT_CHUNK_SIZE = 500
+
+EXPORT_HEADER = [
+    '주문 번호', '주문일', '주문자', '연락처', '주소',
+    '주문처', '결제 방법', '결제일', '발송 방법', '발송일',
+    '책 제목', '수량', '제본 수량', '할인율(%)', '금액', '요청 사항',
+]
+
+
+def _format_date(value):
+    return timezone.localtime(value).strftime('%Y-%m-%d') if value else ''
+
+
+def iter_order_rows(params, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    검색 조건(params)에 해당하는 주문을 주문 상품 1건당 1행으로 내보냅니다.
+    헤더 행을 먼저 yield 한 뒤, 주문일 오름차순으로 데이터 행을 yield 합니다.
+    include_archived 이면 보관된(지난 연도) 주문을 먼저 내보냅니다.
+    """
+    yield EXPORT_HEADER
+
+    models = [ArchivedOrder, Order] if include_archived(params) else [Order]
+    for model in models:
+        # 1. 조건에 맞는 주문 id 만 서버 측 커서로 순회 (조인 검색으로 인한 중복은 distinct 로 제거)
+        order_ids = filter_orders(model.objects.all(), params).order_by('order_date', 'pk').values_list('pk', flat=True).distinct()
+
+        chunk = []
+        for order_id in order_ids.iterator(chunk_size=chunk_size):
+            chunk.append(order_id)
+            if len(chunk) >= chunk_size:
+                yield from _chunk_rows(model, chunk)
+                chunk = []
+        if chunk:
+            yield from _chunk_rows(model, chunk)
+
+
+def _chunk_rows(model, order_ids):
+    """
+    주문 id 묶음의 주문자/주문 상품/책을 3개의 쿼리로 불러와 행으로 변환합니다.
+    """
+    orders = (
+        model.objects.filter(pk__in=order_ids)
+        .select_related('customer')
+        .prefetch_related('order_items__book')
+        .order_by('order_date', 'pk')
+    )
+    for order in orders:
+        customer = order.customer
+        common = [
+            order.pk,
+            _format_date(order.order_date),
+            customer.name,
+            customer.contact_number,
+            customer.address,
+            order.order_source,
+            order.get_payment_method_display(),
+            _format_date(order.payment_date),
+            order.delivery_method,
+            _format_date(order.delivery_date),
+        ]
+        for item in order.order_items.all():
+            yield common + [
+                item.book.title_korean,
+                item.quantity,
+                item.additional_quantity,
+                item.discount_rate,
+                item.total_price,
+                order.requests,
+            ]
+
+
+class Echo:
+    """csv.writer 가 쓴 한 줄을 그대로 돌려주는 버퍼 (StreamingHttpResponse 용)"""
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    """
+    행을 CSV 문자열로 하나씩 변환합니다. 엑셀에서 한글이 깨지지 않도록 BOM 을 먼저 보냅니다.
+    """
+    writer = csv.writer(Echo())
+    yield '﻿'
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_xlsx(rows):
+    """
+    openpyxl 의 write_only 모드로 행을 한 줄씩 임시 파일에 기록하고, 처음으로 되감은 파일을 반환합니다.
+    (XLSX 는 zip 형식이라 응답으로 바로 흘려보낼 수 없어, 메모리 대신 임시 파일에 씁니다.)
+    openpyxl 이 설치되어 있지 않으면 ImportError 가 발생합니다.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('주문 목록')
+    for row in rows:
+        sheet.append(row)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
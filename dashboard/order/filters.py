@@ -0,0 +1,116 @@
+import datetime
+import django_filters
+from django.db.models import Q
+
+from .models import Order
+
+
+def filter_orders(queryset, params):
+    """
+    주문 목록(order_list)의 검색/필터 조건을 Order 쿼리셋에 적용합니다.
+    params 는 request.GET 과 같은 dict 형태이며, 목록 화면/일괄 처리/내보내기가 같은 조건을 공유합니다.
+
+    - search_field, search_query : 책제목/주문자/휴대폰/전체 검색
+    - start_date, end_date       : 주문일 범위 (YYYY-MM-DD, 종료일 포함)
+    - order_source               : 주문처 ('all' 이면 무시)
+    - payment_status             : 'paid' / 'unpaid' / 'all'
+    """
+    search_field = params.get('search_field', 'all')
+    search_query = params.get('search_query', '')
+    start_date_str = params.get('start_date', '')
+    end_date_str = params.get('end_date', '')
+    order_source = params.get('order_source', 'all')
+    payment_status = params.get('payment_status', 'all')
+
+    # 1. 검색 필터링
+    if search_query:
+        if search_field == 'book_title':
+            queryset = queryset.filter(order_items__book__title_korean__icontains=search_query)
+        elif search_field == 'customer_name':
+            queryset = queryset.filter(customer__name__icontains=search_query)
+        elif search_field == 'phone':
+            queryset = queryset.filter(customer__contact_number__icontains=search_query)
+        elif search_field == 'all':
+            queryset = queryset.filter(
+                Q(order_items__book__title_korean__icontains=search_query) |
+                Q(customer__name__icontains=search_query) |
+                Q(customer__contact_number__icontains=search_query)
+            )
+
+    # 2. 날짜 필터링
+    if start_date_str:
+        start_date = datetime.datetime.strptime(start_date_str, '%Y-%m-%d')
+        queryset = queryset.filter(order_date__gte=start_date)
+
+    if end_date_str:
+        end_date = datetime.datetime.strptime(end_date_str, '%Y-%m-%d') + datetime.timedelta(days=1)
+        queryset = queryset.filter(order_date__lt=end_date)
+
+    # 3. 주문처 필터링
+    if order_source and order_source != 'all':
+        queryset = queryset.filter(order_source__iexact=order_source)
+
+    # 4. 결제 상태 필터링
+    if payment_status == 'paid':
+        queryset = queryset.filter(payment_date__isnull=False) # 결제일이 있는 건
+    elif payment_status == 'unpaid':
+        queryset = queryset.filter(payment_date__isnull=True)  # 결제일이 없는(null) 건
+    # 'all' (default)는 아무것도 하지 않음
+
+    return queryset
+
+
+def needs_distinct(params):
+    """
+    책 제목으로 검색하면 order_items 조인으로 주문이 중복될 수 있으므로 distinct 가 필요한지 반환합니다.
+    """
+    return bool(params.get('search_query')) and params.get('search_field', 'all') in ('book_title', 'all')
+
+
+class OrderFilter(django_filters.FilterSet):
+    """
+    주문 API(OrderViewSet)용 FilterSet
+    order_list 와 같은 파라미터를 받아 filter_orders 로 똑같이 적용하고,
+    증분 동기화를 위한 updated_since(수정일 이후) 필터를 추가로 제공합니다.
+    """
+    SEARCH_FIELD_CHOICES = [
+        ('all', '전체'),
+        ('book_title', '책 제목'),
+        ('customer_name', '주문자'),
+        ('phone', '휴대폰'),
+    ]
+    PAYMENT_STATUS_CHOICES = [
+        ('all', '전체'),
+        ('paid', '결제 완료'),
+        ('unpaid', '미결제'),
+    ]
+
+    search_field = django_filters.ChoiceFilter(choices=SEARCH_FIELD_CHOICES, method='filter_order_list_params')
+    search_query = django_filters.CharFilter(method='filter_order_list_params')
+    start_date = django_filters.DateFilter(method='filter_order_list_params')
+    end_date = django_filters.DateFilter(method='filter_order_list_params')
+    order_source = django_filters.CharFilter(method='filter_order_list_params')
+    payment_status = django_filters.ChoiceFilter(choices=PAYMENT_STATUS_CHOICES, method='filter_order_list_params')
+    updated_since = django_filters.IsoDateTimeFilter(field_name='updated_at', lookup_expr='gte')
+
+    class Meta:
+        model = Order
+        fields = []
+
+    def filter_order_list_params(self, queryset, name, value):
+        # 개별 필터에서는 값 검증만 하고, 조합(검색 필드+검색어 등)은 filter_queryset 에서 한 번에 적용합니다.
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        params = {}
+        for name, value in self.form.cleaned_data.items():
+            if value in (None, '') or name == 'updated_since':
+                continue
+            params[name] = value.isoformat() if isinstance(value, datetime.date) else value
+
+        queryset = filter_orders(queryset, params)
+        if needs_distinct(params):
+            queryset = queryset.distinct()
+        return queryset
@@ -0,0 +1,116 @@
+"""
+재주문용 고객 주문 이력
+
+연락처로 고객의 최근 주문 N건과 자주 산 책 목록을 현재 가격과 함께 조회합니다.
+- 쿼리 수는 주문/상품 수와 관계없이 일정합니다. (최근 주문 + 상품/책 prefetch, 자주 산 책 집계, 현재 가격)
+- 결과는 연락처별로 캐시하고, 그 고객의 주문이 바뀌거나(order/receivers.py)
+  책/가격이 바뀌면(book_search 버전) 무효화됩니다.
+"""
+import re
+
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+
+from book.search import BOOK_SEARCH_CACHE_NAMESPACE
+from config.versioned_cache import bump_version, get_version, versioned_key
+from .models import Order, OrderItem
+from .serializers import get_latest_prices
+
+RECENT_ORDER_LIMIT = 5
+TOP_BOOK_LIMIT = 10
+CUSTOMER_HISTORY_CACHE_TIMEOUT = 600
+
+
+def normalize_contact(contact_number):
+    """'010-1234-5678' / '01012345678' 을 같은 캐시 키로 다루기 위해 숫자만 남깁니다."""
+    return re.sub(r'\D', '', contact_number or '')
+
+
+def _history_namespace(contact_number):
+    return f'customer_history:{normalize_contact(contact_number)}'
+
+
+def invalidate_customer_history(contact_number):
+    bump_version(_history_namespace(contact_number))
+
+
+def _load_history(contact_number, recent_limit, top_limit):
+    # 1. 최근 주문 (주문 상품과 책은 prefetch 로 2개 쿼리)
+    recent_orders = list(
+        Order.objects.filter(customer__contact_number=contact_number)
+        .select_related('customer')
+        .prefetch_related('order_items__book')
+        .order_by('-order_date')[:recent_limit]
+    )
+    if not recent_orders:
+        return None
+
+    # 2. 자주 산 책 (주문 횟수, 누적 수량) 집계
+    top_books = list(
+        OrderItem.objects.filter(order__customer__contact_number=contact_number)
+        .values('book_id', 'book__title_korean')
+        .annotate(
+            times=Count('order_id', distinct=True),
+            total_quantity=Sum('quantity'),
+            last_ordered=Max('order__order_date'),
+        )
+        .order_by('-times', '-last_ordered')[:top_limit]
+    )
+
+    # 3. 화면에 나오는 모든 책의 현재 가격 (1개 쿼리)
+    book_ids = {row['book_id'] for row in top_books}
+    for order in recent_orders:
+        book_ids.update(item.book_id for item in order.order_items.all())
+    prices = get_latest_prices(book_ids)
+
+    return {
+        'customer_name': recent_orders[0].customer.name,
+        'recent_orders': [
+            {
+                'id': order.id,
+                'order_date': order.order_date,
+                'items': [
+                    {
+                        'book': item.book_id,
+                        'title': item.book.title_korean,
+                        'quantity': item.quantity,
+                        'discount_rate': float(item.discount_rate),
+                        'additional_quantity': item.additional_quantity,
+                        'price': prices.get(item.book_id, 0),
+                    }
+                    for item in order.order_items.all()
+                ],
+            }
+            for order in recent_orders
+        ],
+        'top_books': [
+            {
+                'book': row['book_id'],
+                'title': row['book__title_korean'],
+                'times': row['times'],
+                'total_quantity': row['total_quantity'],
+                'price': prices.get(row['book_id'], 0),
+            }
+            for row in top_books
+        ],
+    }
+
+
+def get_customer_history(contact_number, recent_limit=RECENT_ORDER_LIMIT, top_limit=TOP_BOOK_LIMIT):
+    """
+    연락처의 주문 이력(dict)을 반환합니다. 주문이 없으면 None.
+    """
+    if not normalize_contact(contact_number):
+        return None
+
+    key = versioned_key(
+        _history_namespace(contact_number),
+        contact_number, recent_limit, top_limit,
+        get_version(BOOK_SEARCH_CACHE_NAMESPACE),  # 책 제목/가격 변경 시에도 새로 조회
+    )
+    history = cache.get(key)
+    if history is None:
+        history = _load_history(contact_number, recent_limit, top_limit)
+        # 주문이 없는 경우도 캐시하여(빈 dict) 입력 중 반복 조회를 막습니다.
+        cache.set(key, history or {}, CUSTOMER_HISTORY_CACHE_TIMEOUT)
+    return history or None
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from order.archive import ArchiveError, archive_year, restore_year, year_close_blockers
+
+
+class Command(BaseCommand):
+    help = '결제/정산이 끝난 연도의 주문을 보관 테이블로 옮깁니다. (--restore 로 되돌리기)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('year', type=int, help='보관할 연도 (예: 2023)')
+        parser.add_argument('--restore', action='store_true', help='보관된 연도를 운영 테이블로 되돌립니다.')
+        parser.add_argument('--check', action='store_true', help='보관 가능 여부만 확인합니다.')
+
+    def handle(self, *args, **options):
+        year = options['year']
+
+        if options['check']:
+            blockers = year_close_blockers(year)
+            if blockers:
+                raise CommandError('\n'.join(blockers))
+            self.stdout.write(self.style.SUCCESS(f'{year}년은 보관할 수 있습니다.'))
+            return
+
+        try:
+            if options['restore']:
+                count = restore_year(year)
+                self.stdout.write(self.style.SUCCESS(f'{year}년 주문 {count}건을 되돌렸습니다.'))
+            else:
+                archived = archive_year(year)
+                self.stdout.write(self.style.SUCCESS(
+                    f'{year}년 주문 {archived.order_count}건 (상품 {archived.item_count}건) 보관 완료'
+                ))
+        except ArchiveError as e:
+            raise CommandError(str(e))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from jobs.queue import enqueue
+from order.cooccurrence import PAIRING_TOP_K, build_book_pairings
+
+
+class Command(BaseCommand):
+    help = "'함께 많이 주문된 책' 색인(BookPairing)을 다시 만듭니다. 매일 밤 cron 등으로 실행하세요."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=PAIRING_TOP_K, help=f'책마다 저장할 추천 수 (기본 {PAIRING_TOP_K})')
+        parser.add_argument('--enqueue', action='store_true', help='바로 실행하지 않고 작업 큐에 적재 (run_workers 가 실행)')
+
+    def handle(self, *args, **options):
+        if options['enqueue']:
+            job = enqueue('order.build_book_pairings', {'top_k': options['top_k']})
+            self.stdout.write(f'작업 #{job.pk} 적재 완료')
+            return
+
+        result = build_book_pairings(top_k=options['top_k'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['book_count']}권, {result['pairing_count']}건 색인 완료"
+        ))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0001_initial'),
+        ('order', '0003_remove_orderitem_additional_item_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookPairing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('together_count', models.PositiveIntegerField(verbose_name='함께 주문된 횟수')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='순위')),
+                ('built_at', models.DateTimeField(verbose_name='생성 시각')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pairings', to='book.book', verbose_name='책')),
+                ('paired_book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='book.book', verbose_name='함께 주문된 책')),
+            ],
+            options={
+                'verbose_name': '함께 주문된 책',
+                'verbose_name_plural': '함께 주문된 책 목록',
+                'ordering': ['book', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('book', 'rank'), name='unique_book_pairing_rank')],
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0001_initial'),
+        ('order', '0005_order_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedYear',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(unique=True, verbose_name='연도')),
+                ('order_count', models.PositiveIntegerField(verbose_name='주문 수')),
+                ('item_count', models.PositiveIntegerField(verbose_name='주문 상품 수')),
+                ('total_quantity', models.PositiveIntegerField(verbose_name='판매 권수')),
+                ('total_amount', models.BigIntegerField(verbose_name='매출 합계')),
+                ('archived_at', models.DateTimeField(verbose_name='보관일')),
+            ],
+            options={
+                'verbose_name': '보관 연도',
+                'verbose_name_plural': '보관 연도 목록',
+                'ordering': ['-year'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False, verbose_name='주문 번호')),
+                ('year', models.PositiveSmallIntegerField(db_index=True, verbose_name='보관 연도')),
+                ('order_date', models.DateTimeField(verbose_name='order_date')),
+                ('payment_method', models.CharField(choices=[('CARD', '카드'), ('BANK', '계좌 이체'), ('VISIONBOOK', '비전북'), ('ETC', '기타')], default='CARD', max_length=10, verbose_name='결제 방법')),
+                ('payment_date', models.DateTimeField(blank=True, null=True, verbose_name='결제 완료일')),
+                ('delivery_date', models.DateTimeField(blank=True, null=True, verbose_name='delivery_date')),
+                ('order_source', models.CharField(max_length=50, verbose_name='order_source')),
+                ('delivery_method', models.CharField(max_length=50, verbose_name='delivery_method')),
+                ('requests', models.TextField(blank=True, verbose_name='requests')),
+                ('updated_at', models.DateTimeField(verbose_name='수정일')),
+                ('archived_at', models.DateTimeField(verbose_name='보관일')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders', to='order.customer', verbose_name='customer')),
+            ],
+            options={
+                'verbose_name': '보관 주문',
+                'verbose_name_plural': '보관 주문 목록',
+                'ordering': ['-order_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedOrderItem',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('quantity', models.PositiveIntegerField(verbose_name='quantity')),
+                ('discount_rate', models.DecimalField(decimal_places=2, default=0.0, max_digits=5, verbose_name='discount_rate')),
+                ('additional_quantity', models.PositiveIntegerField(default=0, verbose_name='제본 수량')),
+                ('total_price', models.IntegerField(verbose_name='supply_price')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_order_items', to='book.book', verbose_name='book_ID')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_items', to='order.archivedorder', verbose_name='order_ID')),
+            ],
+            options={
+                'verbose_name': '보관 주문 상품',
+                'verbose_name_plural': '보관 주문 상품 목록',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedBookYearTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='연도')),
+                ('order_count', models.PositiveIntegerField(verbose_name='주문 수')),
+                ('total_quantity', models.PositiveIntegerField(verbose_name='판매 권수')),
+                ('total_amount', models.BigIntegerField(verbose_name='매출 합계')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_year_totals', to='book.book', verbose_name='책')),
+            ],
+            options={
+                'verbose_name': '보관 연도 책별 합계',
+                'verbose_name_plural': '보관 연도 책별 합계 목록',
+                'constraints': [models.UniqueConstraint(fields=('year', 'book'), name='unique_archived_book_year')],
+            },
+        ),
+    ]
@@ -38,6 +38,8 @@ class Order(models.Model):
     order_source = models.CharField(max_length=50, verbose_name="order_source")
     delivery_method = models.CharField(max_length=50, verbose_name="delivery_method")
     requests = models.TextField(blank=True, verbose_name="requests")
+    # [신규] 외부 도구의 증분 동기화(?updated_since=)용. queryset.update() 로 바꿀 때는 직접 함께 갱신해야 합니다.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name="수정일")
 
     def __str__(self):
         return f"주문 번호: {self.id} ({self.customer.name})"
@@ -63,4 +65,111 @@ class OrderItem(models.Model):
     class Meta:
         verbose_name = "order_product"
         verbose_name_plural = "order_product_list"
-        
\ No newline at end of file
+        
+
+class BookPairing(models.Model):
+    """
+    [신규] '함께 많이 주문된 책' 색인 (order.cooccurrence.build_book_pairings 가 매일 다시 만듭니다)
+    책마다 같은 주문에 함께 담긴 횟수가 많은 상위 K권만 rank 순으로 저장합니다.
+    """
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='pairings', verbose_name="책")
+    paired_book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='+', verbose_name="함께 주문된 책")
+    together_count = models.PositiveIntegerField(verbose_name="함께 주문된 횟수")
+    rank = models.PositiveSmallIntegerField(verbose_name="순위")
+    built_at = models.DateTimeField(verbose_name="생성 시각")
+
+    def __str__(self):
+        return f"{self.book_id} -> {self.paired_book_id} ({self.together_count})"
+
+    class Meta:
+        verbose_name = "함께 주문된 책"
+        verbose_name_plural = "함께 주문된 책 목록"
+        ordering = ['book', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['book', 'rank'], name='unique_book_pairing_rank'),
+        ]
+
+
+# --- [신규] 연도별 보관(archive) 테이블 ---
+# 결제/정산이 끝난 연도의 주문을 운영 테이블(Order/OrderItem)에서 옮겨 보관합니다. (order.archive)
+# 필드명과 역참조 이름(customer, order_items, book)을 운영 테이블과 같게 두어
+# filter_orders 등 같은 조회 코드를 그대로 쓸 수 있습니다.
+class ArchivedOrder(models.Model):
+    """보관된 주문 (id 는 원래 주문 번호를 그대로 사용)"""
+    id = models.IntegerField(primary_key=True, verbose_name="주문 번호")
+    year = models.PositiveSmallIntegerField(db_index=True, verbose_name="보관 연도")
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='archived_orders', verbose_name="customer")
+    order_date = models.DateTimeField(verbose_name="order_date")
+    payment_method = models.CharField(max_length=10, choices=Order.PAYMENT_CHOICES, default='CARD', verbose_name="결제 방법")
+    payment_date = models.DateTimeField(null=True, blank=True, verbose_name="결제 완료일")
+    delivery_date = models.DateTimeField(null=True, blank=True, verbose_name="delivery_date")
+    order_source = models.CharField(max_length=50, verbose_name="order_source")
+    delivery_method = models.CharField(max_length=50, verbose_name="delivery_method")
+    requests = models.TextField(blank=True, verbose_name="requests")
+    updated_at = models.DateTimeField(verbose_name="수정일")
+    archived_at = models.DateTimeField(verbose_name="보관일")
+
+    is_archived = True
+
+    def __str__(self):
+        return f"[보관] 주문 번호: {self.id} ({self.customer.name})"
+
+    class Meta:
+        verbose_name = "보관 주문"
+        verbose_name_plural = "보관 주문 목록"
+        ordering = ['-order_date']
+
+
+class ArchivedOrderItem(models.Model):
+    """보관된 주문 상품"""
+    id = models.IntegerField(primary_key=True)
+    order = models.ForeignKey(ArchivedOrder, on_delete=models.CASCADE, related_name='order_items', verbose_name="order_ID")
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='archived_order_items', verbose_name="book_ID")
+    quantity = models.PositiveIntegerField(verbose_name="quantity")
+    discount_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0.00, verbose_name="discount_rate")
+    additional_quantity = models.PositiveIntegerField(default=0, verbose_name="제본 수량")
+    total_price = models.IntegerField(verbose_name='supply_price')
+
+    def __str__(self):
+        return f"[보관] {self.book.title_korean} - {self.quantity}개"
+
+    class Meta:
+        verbose_name = "보관 주문 상품"
+        verbose_name_plural = "보관 주문 상품 목록"
+
+
+class ArchivedYear(models.Model):
+    """보관된 연도의 합계 (보고서가 보관 데이터를 다시 훑지 않도록 보관 시점에 계산)"""
+    year = models.PositiveSmallIntegerField(unique=True, verbose_name="연도")
+    order_count = models.PositiveIntegerField(verbose_name="주문 수")
+    item_count = models.PositiveIntegerField(verbose_name="주문 상품 수")
+    total_quantity = models.PositiveIntegerField(verbose_name="판매 권수")
+    total_amount = models.BigIntegerField(verbose_name="매출 합계")
+    archived_at = models.DateTimeField(verbose_name="보관일")
+
+    def __str__(self):
+        return f"{self.year}년 보관 ({self.order_count}건)"
+
+    class Meta:
+        verbose_name = "보관 연도"
+        verbose_name_plural = "보관 연도 목록"
+        ordering = ['-year']
+
+
+class ArchivedBookYearTotal(models.Model):
+    """보관된 연도의 책별 판매 합계"""
+    year = models.PositiveSmallIntegerField(verbose_name="연도")
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='archived_year_totals', verbose_name="책")
+    order_count = models.PositiveIntegerField(verbose_name="주문 수")
+    total_quantity = models.PositiveIntegerField(verbose_name="판매 권수")
+    total_amount = models.BigIntegerField(verbose_name="매출 합계")
+
+    def __str__(self):
+        return f"{self.year}년 {self.book_id}: {self.total_quantity}권"
+
+    class Meta:
+        verbose_name = "보관 연도 책별 합계"
+        verbose_name_plural = "보관 연도 책별 합계 목록"
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'book'], name='unique_archived_book_year'),
+        ]
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .history import invalidate_customer_history
+from .models import Order, OrderItem
+from .signals import order_items_changed
+
+
+def _invalidate_for_orders(order_ids):
+    contacts = Order.objects.filter(pk__in=order_ids).values_list('customer__contact_number', flat=True).distinct()
+    for contact_number in contacts:
+        invalidate_customer_history(contact_number)
+
+
+# --- 재주문 패널(고객 주문 이력) 캐시 무효화 ---
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_history_on_order(sender, instance, **kwargs):
+    invalidate_customer_history(instance.customer.contact_number)
+
+
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def invalidate_history_on_order_item(sender, instance, **kwargs):
+    _invalidate_for_orders([instance.order_id])
+
+
+@receiver(order_items_changed)
+def invalidate_history_on_items_changed(sender, order_id, **kwargs):
+    _invalidate_for_orders([order_id])
@@ -0,0 +1,221 @@
+"""
+계좌 이체 입금 대조 (은행 거래내역 CSV <-> 미결제 주문)
+
+1. parse_bank_statement : 은행 거래내역 CSV 를 입금 목록으로 변환
+2. build_unpaid_index   : 미결제(계좌 이체/비전북) 주문을 '주문 합계 금액' 기준 메모리 색인으로 구성 (쿼리 1회)
+3. match_deposits       : 입금액으로 후보를 찾고, 입금자명/날짜 허용 범위로 점수를 매겨 매칭 제안
+4. confirm_matches      : 관리자가 확인한 매칭의 결제일을 하나의 트랜잭션으로 기록
+"""
+import csv
+import datetime
+import io
+import re
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .bulk import bulk_set_order_fields, to_aware_datetime
+from .models import Order
+
+# 입금 대조 대상 결제 방법 (Order.PAYMENT_CHOICES)
+RECONCILE_PAYMENT_METHODS = ('BANK', 'VISIONBOOK')
+
+# 은행마다 다른 CSV 헤더명을 표준 컬럼으로 매핑
+COLUMN_ALIASES = {
+    'date': ('거래일시', '거래일자', '거래일', '입금일', '일자', 'date'),
+    'name': ('입금자명', '입금자', '보낸분', '적요', '내용', 'name', 'depositor'),
+    'amount': ('입금액', '입금금액', '맡기신금액', '금액', 'amount', 'deposit'),
+}
+DATE_FORMATS = ('%Y-%m-%d', '%Y.%m.%d', '%Y/%m/%d', '%Y%m%d')
+
+StatementLine = namedtuple('StatementLine', ['line_no', 'date', 'name', 'amount'])
+MatchProposal = namedtuple('MatchProposal', ['line', 'order', 'confidence', 'candidates'])
+
+
+class StatementFormatError(ValueError):
+    pass
+
+
+def normalize_name(name):
+    """입금자명 비교용: 공백/괄호 내용 제거, 소문자화"""
+    name = re.sub(r'\(.*?\)', '', name or '')
+    return re.sub(r'\s+', '', name).lower()
+
+
+def _parse_date(value):
+    value = (value or '').strip()
+    # '2025-11-20 14:03:11' 처럼 시간이 붙은 경우 날짜 부분만 사용
+    value = value.split(' ')[0]
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_amount(value):
+    digits = re.sub(r'[^\d-]', '', value or '')
+    try:
+        return int(digits)
+    except ValueError:
+        return 0
+
+
+def _find_column(header, key):
+    normalized = [h.strip().lower() for h in header]
+    for alias in COLUMN_ALIASES[key]:
+        if alias.lower() in normalized:
+            return normalized.index(alias.lower())
+    raise StatementFormatError(f"'{COLUMN_ALIASES[key][0]}' 컬럼을 찾을 수 없습니다. (허용 헤더: {', '.join(COLUMN_ALIASES[key])})")
+
+
+def parse_bank_statement(uploaded_file):
+    """
+    은행 거래내역 CSV 를 읽어 입금(금액 > 0) 목록을 반환합니다.
+    인코딩은 UTF-8(BOM 포함)을 먼저 시도하고, 실패하면 국내 은행 기본값인 CP949 로 읽습니다.
+    """
+    raw = uploaded_file.read()
+    for encoding in ('utf-8-sig', 'cp949'):
+        try:
+            text = raw.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise StatementFormatError('파일 인코딩을 인식할 수 없습니다. (UTF-8 또는 CP949 CSV만 가능)')
+
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+    if not header:
+        raise StatementFormatError('빈 파일입니다.')
+
+    date_idx = _find_column(header, 'date')
+    name_idx = _find_column(header, 'name')
+    amount_idx = _find_column(header, 'amount')
+
+    lines = []
+    for line_no, row in enumerate(reader, start=2):
+        if len(row) <= max(date_idx, name_idx, amount_idx):
+            continue
+        amount = _parse_amount(row[amount_idx])
+        deposit_date = _parse_date(row[date_idx])
+        if amount <= 0 or deposit_date is None:
+            continue # 출금/잔액 행 등은 건너뜀
+        lines.append(StatementLine(line_no, deposit_date, row[name_idx].strip(), amount))
+    return lines
+
+
+def build_unpaid_index(start_date=None):
+    """
+    미결제 계좌 이체/비전북 주문을 {주문 합계 금액: [주문, ...]} 색인으로 만듭니다.
+    각 주문은 id, order_date(현지 날짜), customer_name, grand_total 을 가진 dict 입니다.
+    """
+    queryset = Order.objects.filter(
+        payment_method__in=RECONCILE_PAYMENT_METHODS,
+        payment_date__isnull=True,
+    )
+    if start_date:
+        queryset = queryset.filter(order_date__gte=start_date)
+
+    rows = queryset.annotate(
+        grand_total=Sum('order_items__total_price')
+    ).filter(grand_total__gt=0).values('id', 'order_date', 'customer__name', 'grand_total')
+
+    index = defaultdict(list)
+    for row in rows:
+        index[row['grand_total']].append({
+            'id': row['id'],
+            'order_date': timezone.localdate(row['order_date']),
+            'customer_name': row['customer__name'],
+            'name_key': normalize_name(row['customer__name']),
+            'grand_total': row['grand_total'],
+        })
+    return index
+
+
+def _score(line, order, window_days):
+    """
+    (점수, 날짜 차이) 를 반환합니다. 날짜 허용 범위를 벗어나면 None.
+    - 입금자명 완전 일치 2점, 부분 일치 1점, 불일치 0점
+    """
+    days = (line.date - order['order_date']).days
+    # 주문 전날 입금(선입금)까지는 허용하고, 주문 후에는 window_days 일까지 허용
+    if days < -1 or days > window_days:
+        return None
+
+    name_key = normalize_name(line.name)
+    if name_key and name_key == order['name_key']:
+        name_score = 2
+    elif name_key and order['name_key'] and (name_key in order['name_key'] or order['name_key'] in name_key):
+        name_score = 1
+    else:
+        name_score = 0
+    return name_score, abs(days)
+
+
+def match_deposits(lines, window_days=7):
+    """
+    입금 목록과 미결제 주문을 매칭한 제안 목록을 반환합니다.
+    - 금액이 같은 주문만 후보이며, 한 주문은 한 입금에만 매칭됩니다.
+    - confidence: 'high'(이름 일치), 'medium'(이름 부분 일치), 'low'(이름 불일치지만 후보가 유일), None(매칭 없음)
+    """
+    if not lines:
+        return []
+
+    earliest = min(line.date for line in lines) - datetime.timedelta(days=window_days)
+    index = build_unpaid_index(
+        start_date=timezone.make_aware(datetime.datetime.combine(earliest, datetime.time.min))
+    )
+
+    # 1. 각 입금의 후보와 점수 계산
+    scored = []
+    for line in lines:
+        candidates = []
+        for order in index.get(line.amount, ()):
+            score = _score(line, order, window_days)
+            if score is not None:
+                candidates.append((score, order))
+        # 이름 점수 높은 순, 날짜 차이 적은 순
+        candidates.sort(key=lambda c: (-c[0][0], c[0][1], c[1]['id']))
+        scored.append((line, candidates))
+
+    # 2. 확실한 매칭(이름 점수 높은 입금)부터 주문을 배정하여 중복 배정 방지
+    used_order_ids = set()
+    proposals = {}
+    for line, candidates in sorted(scored, key=lambda s: -(s[1][0][0][0] if s[1] else -1)):
+        available = [c for c in candidates if c[1]['id'] not in used_order_ids]
+        match, confidence = None, None
+        if available:
+            (name_score, _), order = available[0]
+            if name_score == 2:
+                match, confidence = order, 'high'
+            elif name_score == 1:
+                match, confidence = order, 'medium'
+            elif len(available) == 1:
+                match, confidence = order, 'low'
+        if match:
+            used_order_ids.add(match['id'])
+        proposals[line.line_no] = MatchProposal(line, match, confidence, [c[1] for c in available])
+
+    return [proposals[line.line_no] for line in lines]
+
+
+def confirm_matches(pairs):
+    """
+    확인된 (order_id, 입금일) 목록의 결제일을 하나의 트랜잭션으로 기록합니다.
+    이미 결제 처리된 주문은 건너뛰며, 같은 입금일의 주문은 한 번의 UPDATE 로 처리합니다.
+    반환값: 결제 처리된 주문 id 목록
+    """
+    by_date = defaultdict(list)
+    for order_id, deposit_date in pairs:
+        by_date[deposit_date].append(order_id)
+
+    confirmed = []
+    with transaction.atomic():
+        for deposit_date, order_ids in sorted(by_date.items()):
+            queryset = Order.objects.filter(pk__in=order_ids, payment_date__isnull=True)
+            confirmed += bulk_set_order_fields(queryset, payment_date=to_aware_datetime(deposit_date))
+    return confirmed
@@ -1,6 +1,9 @@
 from rest_framework import serializers
-from book.models import Book
+from django.db import transaction
+from book.models import Book, PriceHistory
 from .models import Customer, Order, OrderItem
+from .signals import order_items_changed
+from inventory.services import InsufficientStock, outstanding_reservations, reserve_for_order, ship_orders, unship_orders
 from decimal import Decimal
 import re
 
@@ -76,7 +79,21 @@ class OrderSerializer(serializers.ModelSerializer):
             'order_source', 'delivery_method', 'requests', 'order_items', 
             'customer_info_data'
         ]
-        
+
+    def validate_order_items(self, value):
+        """
+        부분 수정(PATCH)이면 중첩 상품의 필드도 필수 검사를 건너뛰므로,
+        order_items 를 보낸 경우 상품마다 책과 수량이 있는지 직접 확인합니다. (목록 전체를 바꾸는 diff 이므로)
+        """
+        missing = [
+            f"{index + 1}번째 상품: " + ', '.join(field for field in ('book', 'quantity') if field not in item_data) + " 항목이 필요합니다."
+            for index, item_data in enumerate(value)
+            if not all(field in item_data for field in ('book', 'quantity'))
+        ]
+        if missing:
+            raise serializers.ValidationError(missing)
+        return value
+
     def create(self, validated_data):
         """
         Customer 및 Order 객체를 생성하고,
@@ -87,7 +104,24 @@ class OrderSerializer(serializers.ModelSerializer):
         
         customer_serializer = CustomerSerializer(data=customer_data)
         customer_serializer.is_valid(raise_exception=True)
-        
+
+        # [수정] 재고 예약이 실패하면 고객/주문/주문 상품 생성도 모두 취소되도록 하나의 트랜잭션으로 처리
+        with transaction.atomic():
+            order = self._create_order(validated_data, customer_data, order_items_data)
+
+            # 재고 관리 대상 책의 수량 예약 (조건부 UPDATE, 발송일이 이미 있으면 바로 출고)
+            quantities = {}
+            for item_data in order_items_data:
+                book_id = item_data['book'].pk
+                quantities[book_id] = quantities.get(book_id, 0) + item_data['quantity']
+            reserve_stock(order, quantities)
+            if order.delivery_date:
+                ship_orders([order])
+
+        return order
+
+    def _create_order(self, validated_data, customer_data, order_items_data):
+        """고객 갱신/생성, 주문 생성, 주문 상품 가격 계산 및 생성 (기존 create 로직)"""
         contact_number = customer_data.get('contact_number')
         customer, created = Customer.objects.update_or_create(
             contact_number=contact_number,
@@ -118,12 +152,157 @@ class OrderSerializer(serializers.ModelSerializer):
         
         return order
 
+    def update(self, instance, validated_data):
+        """
+        [신규] 주문 수정
+        주문 정보는 그대로 갱신하고, order_items 는 기존 상품과 책(book) 기준으로 비교(diff)하여
+        - 변경된 상품만 현재 가격으로 다시 계산해 bulk_update
+        - 새 상품은 bulk_create, 빠진 상품은 한 번에 delete
+        를 하나의 트랜잭션으로 처리합니다. (상품 수와 관계없이 쿼리 수가 일정)
+        """
+        order_items_data = validated_data.pop('order_items', None)
+        customer_data = validated_data.pop('customer_info_data', None)
+
+        with transaction.atomic():
+            # 1. 주문자 정보 (create 와 동일하게 연락처 기준으로 갱신/생성)
+            if customer_data:
+                customer_serializer = CustomerSerializer(data=customer_data)
+                customer_serializer.is_valid(raise_exception=True)
+                customer, created = Customer.objects.update_or_create(
+                    contact_number=customer_data.get('contact_number'),
+                    defaults=customer_data
+                )
+                validated_data['customer'] = customer
+
+            # 2. 주문 상품 diff 반영 (수정 전 기준 발송 전 주문이면 수량 변화만큼 재고 예약/해제)
+            was_shipped = instance.delivery_date is not None
+            if order_items_data is not None:
+                sync_order_items(instance, order_items_data)
+
+            # 3. 주문 필드 갱신
+            instance = super().update(instance, validated_data)
+
+            # 4. 발송일이 새로 입력/삭제되면 예약 <-> 출고 전환
+            if not was_shipped and instance.delivery_date is not None:
+                ship_orders([instance])
+            elif was_shipped and instance.delivery_date is None:
+                unship_orders([instance])
+
+        return instance
+
+
+def reserve_stock(order, quantities):
+    """
+    재고 예약을 시도하고, 부족하면 어떤 책이 몇 권 부족한지 ValidationError 로 알려줍니다.
+    (트랜잭션 안에서 호출되므로 주문 생성/수정도 함께 취소됩니다.)
+    """
+    try:
+        reserve_for_order(order, quantities)
+    except InsufficientStock as e:
+        titles = dict(Book.objects.filter(pk__in=e.shortages).values_list('pk', 'title_korean'))
+        raise serializers.ValidationError({
+            'order_items': [f"'{titles.get(book_id, book_id)}' 재고가 부족합니다. (요청 {quantity}권)" for book_id, quantity in e.shortages.items()]
+        })
+
+
+def get_latest_prices(book_ids):
+    """
+    여러 책의 최신 가격을 한 번의 쿼리로 조회합니다. ({book_id: price})
+    create() 와 같이 price_updated_at 이 가장 늦은 이력을 최신 가격으로 봅니다.
+    """
+    prices = {}
+    histories = PriceHistory.objects.filter(book_id__in=book_ids).order_by('book_id', '-price_updated_at')
+    for book_id, price in histories.values_list('book_id', 'price'):
+        prices.setdefault(book_id, price)
+    return prices
+
+
+def calculate_item_total(book_price, quantity, discount_rate):
+    """
+    주문 상품 금액 = 수량 * (가격 * (1 - 할인율)) (원 단위 반올림)
+    """
+    discounted_book_price = Decimal(book_price) * (Decimal(1) - (Decimal(discount_rate) / Decimal(100)))
+    return round(discounted_book_price * quantity)
+
+
+def sync_order_items(order, order_items_data):
+    """
+    제출된 주문 상품 목록을 기존 OrderItem 과 책 기준으로 비교하여 반영합니다.
+    수량/할인율/제본 수량이 바뀌지 않은 상품은 기존 금액을 유지합니다.
+    (호출하는 쪽에서 트랜잭션을 잡아야 합니다.)
+    """
+    # 1. 같은 책이 두 번 들어온 경우 거절 (책 기준 diff 이므로)
+    submitted = {}
+    for item_data in order_items_data:
+        book = item_data['book']
+        if book.pk in submitted:
+            raise serializers.ValidationError({
+                'order_items': f"'{book.title_korean}' 상품이 중복되었습니다. 수량을 합쳐서 입력해주세요."
+            })
+        submitted[book.pk] = item_data
+
+    existing = {item.book_id: item for item in order.order_items.all()}
+
+    # 2. 변경/추가/삭제 대상 분류
+    to_update, to_create = [], []
+    for book_id, item_data in submitted.items():
+        quantity = item_data['quantity']
+        discount_rate = item_data.get('discount_rate', Decimal('0.0'))
+        additional_quantity = item_data.get('additional_quantity', 0)
+
+        item = existing.get(book_id)
+        if item is None:
+            to_create.append(OrderItem(
+                order=order, book_id=book_id, quantity=quantity,
+                discount_rate=discount_rate, additional_quantity=additional_quantity,
+            ))
+        elif (item.quantity, item.discount_rate, item.additional_quantity) != (quantity, discount_rate, additional_quantity):
+            item.quantity = quantity
+            item.discount_rate = discount_rate
+            item.additional_quantity = additional_quantity
+            to_update.append(item)
+
+    deleted_book_ids = [book_id for book_id in existing if book_id not in submitted]
+
+    # 3. 변경/추가된 상품만 현재 가격으로 금액 재계산
+    changed = to_update + to_create
+    prices = get_latest_prices([item.book_id for item in changed])
+    for item in changed:
+        if item.book_id not in prices:
+            raise serializers.ValidationError({
+                'book': f"'{submitted[item.book_id]['book'].title_korean}' 상품의 가격 정보가 없습니다. 관리자에게 문의하세요."
+            })
+        item.total_price = calculate_item_total(prices[item.book_id], item.quantity, item.discount_rate)
+
+    # 4. 재고 예약 변화량 (새 수량 - 원장에 남아 있는 이 주문의 예약 수량). 발송된 주문은 재고를 건드리지 않습니다.
+    #    기존 상품 수량이 아니라 원장을 기준으로 하므로, 주문 뒤에 재고 관리를 시작한 책도 예약한 만큼만 해제합니다.
+    if order.delivery_date is None:
+        quantities = {book_id: item_data['quantity'] for book_id, item_data in submitted.items()}
+        for (_, book_id), quantity in outstanding_reservations([order.pk]).items():
+            quantities[book_id] = quantities.get(book_id, 0) - quantity
+        reserve_stock(order, quantities)
+
+    # 5. 일괄 반영
+    if to_update:
+        OrderItem.objects.bulk_update(to_update, ['quantity', 'discount_rate', 'additional_quantity', 'total_price'])
+    if to_create:
+        OrderItem.objects.bulk_create(to_create)
+    if deleted_book_ids:
+        OrderItem.objects.filter(order=order, book_id__in=deleted_book_ids).delete()
+
+    changed_book_ids = [item.book_id for item in changed] + deleted_book_ids
+    if changed_book_ids:
+        order_items_changed.send(sender=Order, order_id=order.pk, book_ids=changed_book_ids)
+
+    return changed_book_ids
+
+
 class TotalPriceSerializer(serializers.ModelSerializer):
     book_title = serializers.CharField(source='book.title_korean')
 
     class Meta:
         model = OrderItem
-        fields = ['book_title', 'quantity']
+        fields = ['book', 'book_title', 'quantity', 'discount_rate', 'additional_quantity', 'total_price']
 
     def get_amount(self, obj):
         # 수량 * (공급가 * (1 - 할인율))
@@ -136,9 +315,13 @@ class OrderListSerializer(serializers.ModelSerializer):
     customer_contact_number = serializers.CharField(source='customer.contact_number')
     order_items = TotalPriceSerializer(many=True, read_only=True)
 
+    customer_address = serializers.CharField(source='customer.address')
+
     class Meta:
         model = Order
-        fields = ['id', 'order_date', 'delivery_date', 'customer_name', 'customer_contact_number', 'order_items']   
+        fields = ['id', 'order_date', 'delivery_date', 'customer_name', 'customer_contact_number', 'order_items',
+                  'customer_address', 'payment_method', 'payment_date', 'order_source', 'delivery_method',
+                  'requests', 'updated_at']
 
 # order/serializers.py (추가)
 
@@ -211,3 +394,40 @@ class BookSearchSerializer(serializers.ModelSerializer):
         return ", ".join([author.name for author in authors_queryset])
     
 
+
+class OrderBulkStatusSerializer(serializers.Serializer):
+    """
+    여러 주문의 결제일/발송일을 한 번에 변경하기 위한 요청 시리얼라이저
+    - order_ids 를 주거나, select_all=True 와 함께 주문 목록의 현재 검색 조건(filters)을 줍니다.
+    - date 를 생략하면 현재 시각으로 처리합니다.
+    """
+    ACTION_CHOICES = [
+        ('mark_paid', '결제 완료 처리'),
+        ('mark_unpaid', '결제 완료 취소'),
+        ('mark_shipped', '발송 완료 처리'),
+        ('mark_unshipped', '발송 완료 취소'),
+    ]
+
+    action = serializers.ChoiceField(choices=ACTION_CHOICES)
+    date = serializers.DateField(required=False, allow_null=True)
+    order_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    select_all = serializers.BooleanField(default=False)
+    filters = serializers.DictField(child=serializers.CharField(allow_blank=True), required=False)
+
+    def validate(self, data):
+        if not data.get('select_all') and not data.get('order_ids'):
+            raise serializers.ValidationError("변경할 주문을 선택하거나, 현재 검색 결과 전체(select_all)를 지정해야 합니다.")
+        return data
+
+
+class BankStatementUploadSerializer(serializers.Serializer):
+    """
+    입금 대조용 은행 거래내역 CSV 업로드 시리얼라이저
+    """
+    statement_file = serializers.FileField()
+    window_days = serializers.IntegerField(min_value=0, max_value=60, default=7)
+
+    def validate_statement_file(self, value):
+        if not value.name.lower().endswith('.csv'):
+            raise serializers.ValidationError("CSV 파일만 업로드할 수 있습니다.")
+        return value
@@ -0,0 +1,14 @@
+from django.dispatch import Signal
+
+# 주문 필드(결제일, 발송일 등)가 모델 save() 없이 일괄 UPDATE 로 변경되었을 때 발송됩니다.
+# (queryset.update() 는 post_save 를 발생시키지 않으므로, 주문 요약을 갱신하는 쪽은 이 신호를 받습니다.)
+# 같은 트랜잭션 안에서 발송되므로, 수신자가 쓰는 내용도 함께 커밋/롤백됩니다.
+#
+# 인자: order_ids (list[int]), fields (dict: 필드명 -> 새 값)
+orders_updated = Signal()
+
+# 주문 수정 시 주문 상품이 bulk_create/bulk_update/일괄 delete 로 변경되었을 때 발송됩니다.
+# (bulk 연산은 post_save 를 발생시키지 않으므로, 판매 요약 등을 갱신하는 쪽은 이 신호를 받습니다.)
+#
+# 인자: order_id (int), book_ids (list[int]: 추가/변경/삭제된 상품의 책 id)
+order_items_changed = Signal()
@@ -0,0 +1,12 @@
+from jobs.queue import register_task
+from .cooccurrence import build_book_pairings
+
+
+@register_task('order.build_book_pairings')
+def build_book_pairings_task(job, top_k=None):
+    """
+    [백그라운드 작업] '함께 많이 주문된 책' 색인 재생성 (매일 밤 build_book_pairings 명령으로 적재)
+    """
+    if top_k:
+        return build_book_pairings(top_k=top_k, job=job)
+    return build_book_pairings(job=job)
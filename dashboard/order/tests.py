@@ -1,3 +1,106 @@
+import datetime
+
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from book.models import Book, PriceHistory
+from inventory.models import Stock, StockMovement
+from .bulk import bulk_update_order_status, to_aware_datetime
+from .models import Customer, Order, OrderItem
+from .serializers import OrderSerializer
+
+
+class OrderStockReservationTests(TestCase):
+    """주문 생성/수정 시 재고 예약 카운터"""
+
+    def setUp(self):
+        self.book = Book.objects.create(title_korean='테스트 책')
+        PriceHistory.objects.create(book=self.book, price=10000)
+
+    def create_order(self, quantity):
+        serializer = OrderSerializer(data={
+            'customer_info_data': {'name': '홍길동', 'address': '서울', 'contact_number': '010-1234-5678'},
+            'order_source': '네이버',
+            'delivery_method': '택배',
+            'payment_method': 'CARD',
+            'order_items': [{'book': self.book.pk, 'quantity': quantity}],
+        })
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def patch_quantity(self, order, quantity):
+        serializer = OrderSerializer(order, data={'order_items': [{'book': self.book.pk, 'quantity': quantity}]}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_edit_changes_reservation_by_difference(self):
+        Stock.objects.create(book=self.book, on_hand=10)
+        order = self.create_order(4)
+        self.patch_quantity(order, 1)
+
+        self.assertEqual(Stock.objects.get(book=self.book).reserved, 1)
+
+    def test_edit_after_stock_tracking_started_does_not_release_unreserved(self):
+        # 재고 관리 전에 들어온 주문은 예약이 없으므로, 수량을 줄여도 해제할 것이 없습니다.
+        order = self.create_order(4)
+        Stock.objects.create(book=self.book, on_hand=10)
+        self.patch_quantity(order, 1)
+
+        stock = Stock.objects.get(book=self.book)
+        self.assertEqual(stock.reserved, 1)
+        self.assertFalse(StockMovement.objects.filter(order=order, movement_type=StockMovement.RELEASE).exists())
+
+    def test_release_never_makes_reserved_negative(self):
+        Stock.objects.create(book=self.book, on_hand=10)
+        order = self.create_order(2)
+        Stock.objects.filter(book=self.book).update(reserved=0)
+        self.patch_quantity(order, 0)
+
+        self.assertEqual(Stock.objects.get(book=self.book).reserved, 0)
+
+
+class OrderBulkStatusTests(TestCase):
+    """주문 목록 일괄 결제/발송 처리"""
+
+    def setUp(self):
+        book = Book.objects.create(title_korean='테스트 책')
+        customer = Customer.objects.create(name='홍길동', address='서울', contact_number='010-1234-5678')
+        self.orders = [Order.objects.create(customer=customer, order_source='네이버', delivery_method='택배') for _ in range(3)]
+        for order in self.orders:
+            OrderItem.objects.create(order=order, book=book, quantity=1, total_price=10000)
+        self.paid_at = to_aware_datetime(datetime.date(2025, 3, 5))
+        Order.objects.filter(pk=self.orders[0].pk).update(payment_date=self.paid_at)
+
+    def post(self, data):
+        return self.client.post(reverse('order-api-bulk-status'), data, content_type='application/json')
+
+    def test_repeated_mark_paid_keeps_existing_payment_date(self):
+        order_ids = bulk_update_order_status(Order.objects.filter(pk=self.orders[0].pk), 'mark_paid', datetime.date(2025, 4, 9))
+
+        self.assertEqual(order_ids, [])
+        self.assertEqual(Order.objects.get(pk=self.orders[0].pk).payment_date, self.paid_at)
+
+    def test_select_all_only_changes_unset_orders(self):
+        response = self.post({'action': 'mark_paid', 'date': '2025-04-09', 'select_all': True, 'filters': {}})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.json()['order_ids']), [self.orders[1].pk, self.orders[2].pk])
+        self.assertEqual(Order.objects.get(pk=self.orders[0].pk).payment_date, self.paid_at)
+        self.assertEqual(
+            timezone.localdate(Order.objects.get(pk=self.orders[1].pk).payment_date), datetime.date(2025, 4, 9)
+        )
+
+    def test_select_all_skips_empty_orders(self):
+        customer = self.orders[0].customer
+        empty = Order.objects.create(customer=customer, order_source='네이버', delivery_method='택배')
+        response = self.post({'action': 'mark_shipped', 'select_all': True, 'filters': {}})
+
+        self.assertNotIn(empty.pk, response.json()['order_ids'])
+        self.assertEqual(response.json()['updated_count'], 3)
+
+    def test_mark_unpaid_returns_only_cleared_orders(self):
+        response = self.post({'action': 'mark_unpaid', 'order_ids': [order.pk for order in self.orders]})
 
-# Create your tests here.
+        self.assertEqual(response.json()['order_ids'], [self.orders[0].pk])
+        self.assertIsNone(Order.objects.get(pk=self.orders[0].pk).payment_date)
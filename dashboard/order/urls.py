@@ -1,5 +1,9 @@
 from . import views
 from django.urls import path
+from rest_framework.routers import SimpleRouter
+
+router = SimpleRouter()
+router.register('api/orders', views.OrderViewSet, basename='order-api')
 
 urlpatterns = [
 
@@ -12,6 +16,12 @@ urlpatterns = [
     path('<int:pk>/', views.order_detail, name='order_detail'),
     path('<int:pk>/edit/', views.order_edit, name='order_edit'),
     path('api/<int:pk>/', views.OrderUpdateAPIView.as_view(), name='order-api-detail'),
+    path('api/bulk-status/', views.OrderBulkStatusAPIView.as_view(), name='order-api-bulk-status'),
+    path('export/', views.order_export, name='order_export'),
+
+    # 입금 대조 (은행 거래내역 CSV)
+    path('reconciliation/', views.reconciliation_view, name='order_reconciliation'),
+    path('reconciliation/confirm/', views.reconciliation_confirm, name='order_reconciliation_confirm'),
 
     # 2. 고객 주소 조회 API (POST)
     path('api/lookup-address/', views.AddressLookupAPIView.as_view(), name='ajax_lookup_address'),
@@ -23,7 +33,10 @@ urlpatterns = [
     path('api/additional-item-price/', views.AdditionalItemPriceAPIView.as_view(), name='api_order_additional_item_price'),
 
     path('htmx-lookup-address/', views.htmx_lookup_address_modal, name='htmx_lookup_address_modal'),
+    path('htmx-customer-history/', views.htmx_customer_history, name='htmx_customer_history'),
+    path('htmx-book-suggestions/<int:book_id>/', views.htmx_book_suggestions, name='htmx_book_suggestions'),
     path('api/book-search/', views.htmx_book_search, name='api_order_book_search'),
 
 ]
 
+urlpatterns += router.urls
@@ -1,9 +1,13 @@
 from django.shortcuts import render, get_object_or_404
-from .models import Order, OrderItem
-from django.db.models import Q
+from django.http import StreamingHttpResponse, FileResponse, HttpResponse
+from django.views.decorators.http import require_POST
+from .models import Order, OrderItem, ArchivedOrder
 import datetime
 from django.db import models
-from rest_framework import status, generics
+from rest_framework import status, generics, viewsets
+from rest_framework.pagination import CursorPagination
+from django.db.models import Prefetch
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.db.models import Sum, Count
@@ -11,11 +15,21 @@ from rest_framework.filters import SearchFilter
 from .serializers import (
     OrderSerializer, 
     AddressLookupSerializer,
-    BookSearchSerializer
+    BookSearchSerializer,
+    OrderBulkStatusSerializer,
+    OrderListSerializer,
+    BankStatementUploadSerializer
 )
 
-from book.models import Book
+from book.search import search_books
 from rest_framework.permissions import AllowAny
+from .filters import filter_orders, needs_distinct, OrderFilter
+from .bulk import bulk_update_order_status
+from .history import get_customer_history
+from .cooccurrence import get_book_suggestions
+from .export import iter_order_rows, stream_csv, write_xlsx
+from .archive import include_archived
+from .reconciliation import parse_bank_statement, match_deposits, confirm_matches, StatementFormatError
 
 def order_list(request):
     """
@@ -37,8 +51,46 @@ def order_list(request):
     sort_by = request.GET.get('sort', 'order_date') 
     direction = request.GET.get('direction', 'desc')
 
+    # 2~7. 검색/필터/정렬이 적용된 QuerySet
+    next_direction = 'asc' if direction == 'desc' else 'desc'
+    queryset = _order_list_queryset(Order, request.GET, sort_by, direction)
+
+    # [신규] 보관된 주문 포함 (include_archived=1) : 보관 테이블도 같은 조건으로 조회해 합쳐서 정렬
+    if include_archived(request.GET):
+        archived = _order_list_queryset(ArchivedOrder, request.GET, sort_by, direction)
+        queryset = _merge_sorted(list(queryset), list(archived), sort_by, direction)
+
+    # 8. 컨텍스트 데이터 준비 (기존 7번)
+    context = {
+        'orders': queryset,
+        'search_field': search_field,
+        'search_query': search_query,
+        'start_date': start_date_str,
+        'end_date': end_date_str,
+        'order_source': order_source,
+        
+        'payment_status': payment_status, 
+        'include_archived': include_archived(request.GET),
+        
+        'current_sort': sort_by,
+        'current_direction': direction,
+        'next_direction': next_direction,
+    }
+
+    # 9. HTMX 요청 분기 처리 (기존 8번)
+    if request.htmx:
+        template_name = 'order/partials/order_table_body.html'
+    else:
+        template_name = 'order/order_list.html'
+
+    return render(request, template_name, context)
+
+def _order_list_queryset(model, params, sort_by, direction):
+    """
+    order_list 의 기본 QuerySet + 검색/필터 + 정렬 (Order / ArchivedOrder 공통)
+    """
     # 2. 기본 QuerySet 생성
-    queryset = Order.objects.annotate(
+    queryset = model.objects.annotate(
         total_quantity=Sum('order_items__quantity'),
         total_types=Count('order_items__book', distinct=True)
     ).select_related('customer').prefetch_related(
@@ -48,46 +100,10 @@ def order_list(request):
     # [수정] 상품 없는 "빈 주문" 제외
     queryset = queryset.filter(total_types__gt=0)
     
-    # 3. 검색 필터링
-    if search_query:
-        if search_field == 'book_title':
-            queryset = queryset.filter(order_items__book__title_korean__icontains=search_query)
-        elif search_field == 'customer_name':
-            queryset = queryset.filter(customer__name__icontains=search_query)
-        elif search_field == 'phone':
-            queryset = queryset.filter(customer__contact_number__icontains=search_query)
-        elif search_field == 'all':
-            queryset = queryset.filter(
-                Q(order_items__book__title_korean__icontains=search_query) |
-                Q(customer__name__icontains=search_query) |
-                Q(customer__contact_number__icontains=search_query)
-            )
-
-    # 4. 날짜 필터링
-    if start_date_str:
-        start_date = datetime.datetime.strptime(start_date_str, '%Y-%m-%d')
-        queryset = queryset.filter(order_date__gte=start_date)
-        
-    if end_date_str:
-        end_date = datetime.datetime.strptime(end_date_str, '%Y-%m-%d') + datetime.timedelta(days=1)
-        queryset = queryset.filter(order_date__lt=end_date)
-
-    # 5. 주문처 필터링
-    if order_source and order_source != 'all':
-        queryset = queryset.filter(order_source__iexact=order_source)
-
-    # ▼▼▼ [이 부분 추가] ▼▼▼
-    # 6. 결제 상태 필터링
-    if payment_status == 'paid':
-        queryset = queryset.filter(payment_date__isnull=False) # 결제일이 있는 건
-    elif payment_status == 'unpaid':
-        queryset = queryset.filter(payment_date__isnull=True)  # 결제일이 없는(null) 건
-    # 'all' (default)는 아무것도 하지 않음
-    # ▲▲▲ [여기까지 추가] ▲▲▲
+    # 3~6. 검색/날짜/주문처/결제 상태 필터링 (일괄 처리·내보내기와 공유)
+    queryset = filter_orders(queryset, params)
 
     # 7. 정렬 로직 (기존 6번)
-    next_direction = 'asc' if direction == 'desc' else 'desc'
-    
     order_by_field = 'order_date' 
     if sort_by == 'order_date':
         order_by_field = 'order_date'
@@ -108,32 +124,23 @@ def order_list(request):
     else:
          queryset = queryset.order_by(order_by_field)
 
-    if search_query and (search_field == 'book_title' or search_field == 'all'):
+    if needs_distinct(params):
         queryset = queryset.distinct()
 
-    # 8. 컨텍스트 데이터 준비 (기존 7번)
-    context = {
-        'orders': queryset,
-        'search_field': search_field,
-        'search_query': search_query,
-        'start_date': start_date_str,
-        'end_date': end_date_str,
-        'order_source': order_source,
-        
-        'payment_status': payment_status, 
-        
-        'current_sort': sort_by,
-        'current_direction': direction,
-        'next_direction': next_direction,
-    }
-
-    # 9. HTMX 요청 분기 처리 (기존 8번)
-    if request.htmx:
-        template_name = 'order/partials/order_table_body.html'
-    else:
-        template_name = 'order/order_list.html'
+    return queryset
 
-    return render(request, template_name, context)
+def _merge_sorted(orders, archived_orders, sort_by, direction):
+    """
+    운영/보관 주문 목록을 order_list 와 같은 기준으로 합쳐 정렬합니다. (발송일 없는 주문은 항상 뒤로)
+    """
+    reverse = direction == 'desc'
+    if sort_by == 'customer':
+        return sorted(orders + archived_orders, key=lambda o: o.customer.name, reverse=reverse)
+    if sort_by == 'shipping_date':
+        shipped = [o for o in orders + archived_orders if o.delivery_date]
+        not_shipped = [o for o in orders + archived_orders if not o.delivery_date]
+        return sorted(shipped, key=lambda o: o.delivery_date, reverse=reverse) + not_shipped
+    return sorted(orders + archived_orders, key=lambda o: o.order_date, reverse=reverse)
 
 def add_order(request):
     return render(request, 'order/add_order.html')
@@ -162,6 +169,64 @@ class OrderCreateAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class OrderCursorPagination(CursorPagination):
+    """주문일, id 순 커서 페이지네이션 (동기화 중 주문이 추가되어도 중복/누락 없음)"""
+    ordering = ('order_date', 'id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class OrderViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    [GET] /order/api/orders/           주문 목록 (order_list 와 같은 필터 + updated_since)
+    [GET] /order/api/orders/<pk>/      주문 상세
+    배송 도구 등 외부 프로그램용 읽기 전용 API 이므로 프로젝트 기본 인증(JWT)을 사용합니다.
+    예) ?updated_since=2025-11-01T00:00:00+09:00 로 마지막 동기화 이후 바뀐 주문만 받기
+    """
+    serializer_class = OrderListSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = OrderFilter
+    pagination_class = OrderCursorPagination
+
+    def get_queryset(self):
+        return Order.objects.select_related('customer').prefetch_related(
+            Prefetch('order_items', queryset=OrderItem.objects.select_related('book'))
+        )
+
+
+class OrderBulkStatusAPIView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    """
+    [POST] /order/api/bulk-status/
+    여러 주문의 결제일/발송일을 단일 UPDATE 로 일괄 변경합니다.
+
+    - action    : mark_paid / mark_unpaid / mark_shipped / mark_unshipped
+    - date      : 결제일/발송일 (YYYY-MM-DD, 생략 시 현재 시각)
+    - order_ids : 선택한 주문 id 목록
+    - select_all + filters : 주문 목록의 현재 검색 조건에 해당하는 주문 전체
+    이미 입력된 결제일/발송일은 덮어쓰지 않으며, 응답의 order_ids 는 실제로 바뀐 주문만 담습니다.
+    """
+    def post(self, request):
+        serializer = OrderBulkStatusSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        if data.get('select_all'):
+            try:
+                # 목록 화면과 같은 QuerySet (빈 주문 제외 포함) 으로 대상 주문을 고릅니다.
+                queryset = _order_list_queryset(Order, data.get('filters', {}), 'order_date', 'desc')
+            except ValueError:
+                return Response({"filters": "날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)"}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            queryset = Order.objects.filter(pk__in=data['order_ids'])
+
+        order_ids = bulk_update_order_status(queryset, data['action'], data.get('date'))
+        return Response({'updated_count': len(order_ids), 'order_ids': order_ids}, status=status.HTTP_200_OK)
+
+
 class AddressLookupAPIView(APIView):
     """
     [POST] /order/lookup-address/
@@ -176,35 +241,6 @@ class AddressLookupAPIView(APIView):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-def htmx_book_search(request):
-    """
-    [GET] /order/api/book-search/?item_name=...
-    'item_name'으로 책을 검색하여 'book_search_results.html' 템플릿을 렌더링합니다.
-    (JSON이 아닌 HTML 조각을 반환합니다)
-    """
-    
-    # 1. 'add_order.html'의 <button>이 보낸 'item_name' 검색어를 받습니다.
-    query = request.GET.get('item_name', '')
-    
-    books_queryset = [] # 기본 빈 리스트
-    
-    if query:
-        # 2. 쿼리로 책 제목 또는 원제를 검색합니다.
-        #    N+1 문제 방지를 위해 저자(authors), 가격(price_histories)을 미리 join
-        books_queryset = Book.objects.filter(
-            Q(title_korean__icontains=query) | 
-            Q(title_original__icontains=query)
-        ).prefetch_related(
-            'authors',          # 'authors' M2M 필드
-            'price_histories'   # 'PriceHistory' 역참조
-        ).order_by('title_korean')[:10] # 10개만 자릅니다.
-
-    # 3. book_search_results.html 템플릿을 렌더링합니다.
-    context = {
-        'books': books_queryset
-    }
-    return render(request, 'order/book_search_results.html', context)
-
 class AdditionalItemPriceAPIView(APIView):
     """
     [GET] /order/additional-item-price/?name=...
@@ -262,32 +298,38 @@ def htmx_lookup_address_modal(request):
     from django.http import HttpResponseNotAllowed
     return HttpResponseNotAllowed(['POST'])
 
+def htmx_customer_history(request):
+    """
+    [GET] /order/htmx-customer-history/?contact_number=...
+    [신규] 연락처로 고객의 최근 주문/자주 산 책을 현재 가격과 함께 보여주는 재주문 패널 (HTML 조각)
+    """
+    contact_number = request.GET.get('contact_number', '').strip()
+    context = {
+        'contact_number': contact_number,
+        'history': get_customer_history(contact_number),
+    }
+    return render(request, 'order/partials/customer_history.html', context)
+
+def htmx_book_suggestions(request, book_id):
+    """
+    [GET] /order/htmx-book-suggestions/<book_id>/
+    [신규] 주문에 책을 담으면 '함께 많이 주문된 책'을 보여줍니다. (미리 만든 BookPairing 색인 조회)
+    """
+    context = {
+        'suggestions': get_book_suggestions(book_id)
+    }
+    return render(request, 'order/partials/book_suggestions.html', context)
+
 def htmx_book_search(request):
     """
     [GET] /order/api/book-search/?item_name=...
     'item_name'으로 책을 검색하여 'book_search_results.html' 템플릿을 렌더링합니다.
+    [수정] 검색/순위/최신 가격/캐시는 book.search.search_books 가 담당합니다.
+           (제목 완전 일치 > 앞부분 일치 > 주문 많은 순)
     """
-    
-    # 1. 템플릿('add_order.html')에서 보낸 검색어를 받습니다.
     query = request.GET.get('item_name', '')
-    
-    books_queryset = [] # 기본 빈 리스트
-    
-    if query:
-        # 2. 쿼리로 책 제목 또는 원제를 검색합니다.
-        #    (N+1 문제 방지를 위해 저자(authors), 가격(price_histories)을 미리 join)
-        books_queryset = Book.objects.filter(
-            Q(title_korean__icontains=query) | 
-            Q(title_original__icontains=query)
-        ).prefetch_related(
-            'authors', 'price_histories'
-        ).order_by('title_korean')[:10] # 너무 많지 않게 10개만 자릅니다.
-
-    # 3. book_search_results.html 템플릿을 렌더링합니다.
-    #    (이 템플릿은 DRF 시리얼라이저를 더 이상 사용하지 않고, 
-    #     템플릿 태그로 authors, price_histories를 직접 접근하게 됩니다.)
     context = {
-        'books': books_queryset
+        'books': search_books(query)
     }
     return render(request, 'order/book_search_results.html', context)
 
@@ -297,7 +339,10 @@ def order_detail(request, pk):
     """
     # 1. 주문(Order) 정보를 가져옵니다.
     #    (customer 정보는 select_related로 함께 가져와 DB 효율 향상)
-    order = get_object_or_404(Order.objects.select_related('customer'), pk=pk)
+    #    [신규] 운영 테이블에 없으면 보관된 주문(ArchivedOrder)에서 찾습니다. (읽기 전용)
+    order = Order.objects.select_related('customer').filter(pk=pk).first()
+    if order is None:
+        order = get_object_or_404(ArchivedOrder.objects.select_related('customer'), pk=pk)
     
     # 2. 이 주문에 속한 모든 주문 항목(OrderItem)을 가져옵니다.
     #    (book 정보는 select_related로 함께 가져옴)
@@ -352,4 +397,83 @@ def order_edit(request, pk):
         # 'grand_total': grand_total
     }
     
-    return render(request, 'order/edit_order.html', context)
\ No newline at end of file
+    return render(request, 'order/edit_order.html', context)
+
+def reconciliation_view(request):
+    """
+    [GET/POST] /order/reconciliation/
+    은행 거래내역 CSV 를 업로드하면 미결제 계좌 이체/비전북 주문과 대조하여 매칭 제안을 보여줍니다.
+    (입금액 = 주문 합계 금액, 입금자명 = 주문자명, 입금일이 주문일로부터 허용 범위 이내)
+    """
+    context = {'window_days': 7}
+
+    if request.method == 'POST':
+        data = request.POST.dict()
+        data.update(request.FILES.dict())
+        serializer = BankStatementUploadSerializer(data=data)
+        if serializer.is_valid():
+            data = serializer.validated_data
+            context['window_days'] = data['window_days']
+            try:
+                lines = parse_bank_statement(data['statement_file'])
+                proposals = match_deposits(lines, window_days=data['window_days'])
+                context['proposals'] = proposals
+                context['matched_count'] = sum(1 for p in proposals if p.order)
+            except StatementFormatError as e:
+                context['errors'] = {'statement_file': [str(e)]}
+        else:
+            context['errors'] = serializer.errors
+
+    return render(request, 'order/reconciliation.html', context)
+
+
+@require_POST
+def reconciliation_confirm(request):
+    """
+    [POST] /order/reconciliation/confirm/
+    관리자가 체크한 매칭('주문id:입금일')의 결제일을 한 트랜잭션으로 기록합니다.
+    """
+    pairs = []
+    for value in request.POST.getlist('match'):
+        order_id, _, date_str = value.partition(':')
+        try:
+            pairs.append((int(order_id), datetime.date.fromisoformat(date_str)))
+        except ValueError:
+            continue # 조작되었거나 잘못된 값은 무시
+
+    confirmed_ids = confirm_matches(pairs)
+    context = {
+        'confirmed_count': len(confirmed_ids),
+        'skipped_count': len(pairs) - len(confirmed_ids),
+        'window_days': 7,
+    }
+    return render(request, 'order/reconciliation.html', context)
+
+
+def order_export(request):
+    """
+    [GET] /order/export/?format=csv|xlsx&(order_list 검색 조건)
+    주문 목록과 같은 검색 조건의 주문을 주문 상품 1건당 1행으로 내보냅니다. (회계/배송 라벨용)
+    CSV 는 응답으로 바로 흘려보내고(StreamingHttpResponse), XLSX 는 임시 파일에 쓴 뒤 전송합니다.
+    """
+    export_format = request.GET.get('format', 'csv')
+
+    # 행 생성은 응답 헤더를 보낸 뒤에 시작되므로, 검색 조건(날짜 형식)은 미리 검사합니다. (쿼리 실행 없음)
+    try:
+        filter_orders(Order.objects.none(), request.GET)
+    except ValueError:
+        return HttpResponse("날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)", status=400)
+
+    filename = f"orders_{datetime.date.today():%Y%m%d}"
+    rows = iter_order_rows(request.GET)
+
+    if export_format == 'xlsx':
+        try:
+            output = write_xlsx(rows)
+        except ImportError:
+            return HttpResponse("XLSX 내보내기를 사용하려면 openpyxl 을 설치해야 합니다. (CSV 내보내기는 사용 가능)", status=501)
+        return FileResponse(output, as_attachment=True, filename=f"{filename}.xlsx")
+
+    response = StreamingHttpResponse(stream_csv(rows), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import AnnualPerformance, Settlement
+from .models import AnnualPerformance, AuthorSalesCounter, PerformanceDelta, Settlement, SettlementLine
 
 admin.site.register(AnnualPerformance)
-admin.site.register(Settlement)
\ No newline at end of file
+admin.site.register(PerformanceDelta)
+admin.site.register(AuthorSalesCounter)
+admin.site.register(Settlement)
+admin.site.register(SettlementLine)
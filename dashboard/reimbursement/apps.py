@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ReimbursementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reimbursement'
+
+    def ready(self):
+        # 일별 판매 집계가 바뀌면 연간 실적(AnnualPerformance) 증감을 기록하는 수신자 등록
+        from . import receivers  # noqa: F401
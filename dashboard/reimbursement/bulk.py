@@ -0,0 +1,121 @@
+"""
+정산 기록 일괄 처리
+
+- generate_year_settlements : 한 연도의 정산 기록이 없는 저자들에게만 기록을 만듭니다. (조회 1회 + bulk_create)
+- set_settled               : 여러 정산 기록의 완료 여부를 UPDATE 한 번으로 바꾸고, 명세 고정/해제도 묶어서 처리합니다.
+                              완료 시점의 저자 누적 카운터 값(units_counter)도 같은 UPDATE 로 기록합니다.
+- backfill_settlement_counters : 카운터 도입 전에 완료된 정산 기록의 기준값을 정산 완료일까지의 판매량으로 채웁니다.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import BigIntegerField, F, Func, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from book.models import Author
+from sales.models import DailyBookSales
+from .cache import invalidate_reimbursement_cache
+from .models import AuthorSalesCounter, Settlement, SettlementLine
+from .performance import apply_performance_deltas
+from .snapshot import release_snapshots, snapshot_settlements
+
+
+def _units_sum(queryset):
+    """일별 판매 집계 쿼리셋의 판매 권수 합 (Subquery 용, 행이 없으면 0)"""
+    total = queryset.order_by().annotate(total=Func(F('units'), function='SUM')).values('total')
+    return Coalesce(Subquery(total, output_field=BigIntegerField()), Value(0))
+
+
+def generate_year_settlements(settlement_year, batch_size=1000):
+    """
+    settlement_year 의 정산 기록이 없는 저자들에게 미완료 기록을 만듭니다.
+    기존 기록은 건드리지 않으며, 동시에 같은 연도를 생성해도 고유 제약에 걸리는 행은 무시합니다.
+    반환값: 생성을 시도한 기록 수
+    """
+    author_ids = list(
+        Author.objects.exclude(settlements__settlement_year=settlement_year)
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+    Settlement.objects.bulk_create(
+        [Settlement(author_id=author_id, settlement_year=settlement_year, is_settled=False) for author_id in author_ids],
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    invalidate_reimbursement_cache()
+    return len(author_ids)
+
+
+def set_settled(queryset, is_settled, settled_date=None, split_by_songs=False):
+    """
+    queryset 의 정산 기록 중 상태가 바뀌는 기록만 골라 완료 여부를 한 번에 바꿉니다.
+    - 완료 : settled_date(기본값 오늘)와 저자 누적 카운터 값을 기록하고, 명세를 한 번에 고정합니다.
+             split_by_songs 이면 작곡가 저작권료를 곡 수 비율로 나눈 금액으로 고정합니다.
+    - 취소 : settled_date 와 카운터 값을 비우고, 고정 명세를 한 번에 지웁니다.
+    반환값: {'updated_count', 'line_count'}
+    """
+    if is_settled:
+        # 기준값이 최신 판매까지 포함하도록 쌓여 있는 증감을 먼저 카운터에 반영합니다.
+        apply_performance_deltas()
+
+    with transaction.atomic():
+        targets = list(
+            queryset.filter(is_settled=not is_settled)
+            .select_for_update()
+            .only('pk', 'author_id', 'settlement_year')
+        )
+        target_ids = [settlement.pk for settlement in targets]
+        if not target_ids:
+            return {'updated_count': 0, 'line_count': 0}
+
+        if is_settled:
+            settled_date = settled_date or timezone.localdate()
+            counter = AuthorSalesCounter.objects.filter(author_id=OuterRef('author_id')).values('units')[:1]
+            Settlement.objects.filter(pk__in=target_ids).update(
+                is_settled=True,
+                settled_date=settled_date,
+                units_counter=Coalesce(Subquery(counter), Value(0)),
+            )
+            line_count = snapshot_settlements(targets, split_by_songs=split_by_songs)
+        else:
+            Settlement.objects.filter(pk__in=target_ids).update(is_settled=False, settled_date=None, units_counter=None)
+            line_count = release_snapshots(target_ids)
+        invalidate_reimbursement_cache()
+
+    return {'updated_count': len(target_ids), 'line_count': line_count}
+
+
+def backfill_settlement_counters():
+    """
+    누적 카운터 도입 전에 완료된 정산 기록의 기준값을 채웁니다. (backfill_annual_performance 후 실행)
+    - 저자 기준값 : 정산 완료일까지 저자 책들의 판매 권수
+    - 고정 명세가 없는 기록은 명세를 고정하고, 책 기준값은 정산 완료일까지의 책 판매 권수로 채웁니다.
+    반환값: {'settlement_count', 'line_count'}
+    """
+    legacy = Settlement.objects.filter(is_settled=True, settled_date__isnull=False, units_counter__isnull=True)
+    settlement_count = legacy.update(units_counter=_units_sum(
+        DailyBookSales.objects.filter(book__authors=OuterRef('author_id'), date__lte=OuterRef('settled_date'))
+    ))
+
+    without_lines = list(
+        Settlement.objects.filter(is_settled=True, settled_date__isnull=False, lines__isnull=True)
+        .only('pk', 'author_id', 'settlement_year', 'settled_date')
+    )
+    for settlement in without_lines:
+        settled_at = timezone.make_aware(datetime.datetime.combine(settlement.settled_date, datetime.time.min))
+        snapshot_settlements([settlement], settled_at=settled_at)
+    # 책 기준값은 정산 완료일마다 한 번의 UPDATE 로 채웁니다.
+    stale = SettlementLine.objects.filter(
+        Q(book_units_counter__isnull=True) | Q(settlement__in=[settlement.pk for settlement in without_lines]),
+        composer__isnull=True,
+        settlement__is_settled=True,
+        settlement__settled_date__isnull=False,
+    )
+    line_count = 0
+    for settled_date in stale.values_list('settlement__settled_date', flat=True).distinct().order_by():
+        line_count += stale.filter(settlement__settled_date=settled_date).update(
+            book_units_counter=_units_sum(DailyBookSales.objects.filter(book_id=OuterRef('book_id'), date__lte=settled_date))
+        )
+    invalidate_reimbursement_cache()
+    return {'settlement_count': settlement_count, 'line_count': line_count}
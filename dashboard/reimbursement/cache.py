@@ -0,0 +1,70 @@
+"""
+정산 API 응답 캐시
+
+같은 사용자 범위(관리자 전체 / 본인)가 같은 조건으로 다시 조회하면 계산 없이 저장된 응답을 돌려줍니다.
+키 = (뷰, 사용자 범위, 정규화한 쿼리 파라미터) + 버전
+- REIMBURSEMENT_CACHE_NAMESPACE : 판매 집계 증분 갱신, 연간 실적/누적 카운터 반영, 정산 기록/저자 변경 시 바꿉니다.
+- 책 판매 공통 버전(rebuild_range 같은 전체 재계산), 책 검색 버전(책 정보 변경)도 키에 포함합니다.
+버전은 트랜잭션 커밋 후에 바꿔, 커밋 전 데이터로 계산한 응답이 새 버전으로 저장되지 않게 합니다.
+버전은 응답 캐시와 분리된 'versions' 캐시의 임의 토큰이므로, 응답 캐시가 정리되거나 웹/워커가 동시에 무효화해도
+예전 응답이 다시 조회되지 않습니다. (config.versioned_cache)
+"""
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from book.search import BOOK_SEARCH_CACHE_NAMESPACE
+from config.versioned_cache import bump_version, get_version, versioned_key
+from sales.book_panel import BOOK_SALES_CACHE_NAMESPACE
+
+REIMBURSEMENT_CACHE_NAMESPACE = 'reimbursement'
+REIMBURSEMENT_CACHE_TIMEOUT = 300
+
+
+def invalidate_reimbursement_cache():
+    """정산 API 응답 캐시를 모두 무효화합니다. (트랜잭션 안이면 커밋 후)"""
+    transaction.on_commit(lambda: bump_version(REIMBURSEMENT_CACHE_NAMESPACE))
+
+
+def _user_scope(user):
+    # 관리자는 모두 같은 응답을 보므로 하나의 범위를 공유하고, 그 외 사용자는 본인 범위만 씁니다.
+    return 'staff' if user.is_staff else f'user:{user.pk}'
+
+
+def _normalized_params(query_params):
+    """빈 값을 빼고 이름/값 순으로 정렬한 쿼리 파라미터 (순서만 다른 같은 조회가 같은 키를 쓰도록)"""
+    return sorted(
+        (name, sorted(value for value in values if value != ''))
+        for name, values in query_params.lists()
+        if any(value != '' for value in values)
+    )
+
+
+class CachedListMixin:
+    """
+    ListAPIView 의 list() 응답(response.data)을 캐시합니다.
+    권한 확인(initial)은 캐시 조회 전에 실행되고, 오류 응답은 캐시하지 않습니다.
+    """
+    cache_timeout = REIMBURSEMENT_CACHE_TIMEOUT
+
+    def get_cache_key(self, request):
+        return versioned_key(
+            REIMBURSEMENT_CACHE_NAMESPACE,
+            type(self).__name__,
+            _user_scope(request.user),
+            request.get_host(),  # 페이지 링크(next/previous)가 절대 주소이므로 호스트별로 나눕니다.
+            _normalized_params(request.query_params),
+            get_version(BOOK_SALES_CACHE_NAMESPACE),
+            get_version(BOOK_SEARCH_CACHE_NAMESPACE),
+        )
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
@@ -0,0 +1,161 @@
+"""
+저자별 정산 집계 엔진
+
+저자 목록(한 페이지)에 대해
+  1. 저자 -> 책 연결 (Book.authors)
+  2. (책, 연도)별 기간/전체 판매량 (일별 판매 집계, GROUP BY 책, 연도)
+  3. 저자별 누적 판매 카운터
+  4. 저자별 마지막 정산 (완료일, 정산 시점 카운터 값)
+  5. 연간 실적
+  6. 정산이 끝난 연도의 고정 명세 (SettlementLine)
+을 각각 쿼리 1개로 불러와 메모리에서 저자별로 합칩니다.
+정산이 끝난 연도는 고정 명세의 판매량을, 그 외 연도는 일별 판매 집계를 씁니다. (reimbursement/settled.py)
+저자 수/책 수와 관계없이 쿼리 수가 일정합니다.
+'마지막 정산 이후 판매량'은 현재 카운터 - 정산 시점 카운터 이므로 판매량과 관계없이 저자당 뺄셈 한 번입니다.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.db.models import IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce, ExtractYear
+
+from book.models import Book
+from sales.models import DailyBookSales
+from .models import AnnualPerformance, AuthorSalesCounter, Settlement
+from .settled import covered_years, frozen_author_sales, is_covered
+
+
+@dataclass
+class AuthorSettlementResult:
+    authored_books: list = field(default_factory=list)
+    total_sales_all_time: int = 0
+    units_since_last_settlement: int = 0
+    last_settled_date: object = None
+    annual_performances: list = field(default_factory=list)
+
+
+def _book_sales(book_ids, start_date, end_date, exclude_years=()):
+    """(책, 연도)별 {book_id: {연도: (기간 판매량, 기간 판매 금액, 전체 판매량)}} (exclude_years 연도의 판매는 제외)"""
+    zero = Value(0, output_field=IntegerField())
+    period = Q(date__range=[start_date, end_date]) if start_date and end_date else Q()
+    rows = (
+        DailyBookSales.objects.filter(book_id__in=book_ids)
+        .exclude(date__year__in=exclude_years)
+        .annotate(year=ExtractYear('date'))
+        .values('book_id', 'year')
+        .annotate(
+            period_units=Coalesce(Sum('units', filter=period), zero),
+            period_revenue=Coalesce(Sum('revenue', filter=period), zero),
+            all_time_units=Sum('units'),
+        )
+        .order_by()
+    )
+    sales = defaultdict(dict)
+    for row in rows:
+        sales[row['book_id']][row['year']] = (row['period_units'], row['period_revenue'], row['all_time_units'])
+    return sales
+
+
+def _merge_frozen(live, frozen, covered, exclude_years):
+    """
+    한 책의 연도별 현재 판매와 고정 판매를 합쳐 (기간 판매량, 기간 판매 금액, 전체 판매량)을 반환합니다.
+    고정 명세가 있는 연도는 전체 판매량에 고정 값을 쓰고, 기간이 그 연도를 통째로 포함할 때만 기간 값에도 고정 값을 씁니다.
+    """
+    period_units = period_revenue = all_time_units = 0
+    for year in set(live) | set(frozen):
+        if year in exclude_years:
+            continue
+        live_period_units, live_period_revenue, live_units = live.get(year, (0, 0, 0))
+        if year in frozen:
+            units, revenue = frozen[year]
+            all_time_units += units
+            if is_covered(year, covered):
+                period_units += units
+                period_revenue += revenue
+                continue
+        else:
+            all_time_units += live_units
+        period_units += live_period_units
+        period_revenue += live_period_revenue
+    return period_units, period_revenue, all_time_units
+
+
+def compute_author_settlements(author_ids, start_date=None, end_date=None, exclude_years=()):
+    """
+    저자들의 정산 집계를 계산합니다.
+    반환값: {author_id: AuthorSettlementResult}
+    - authored_books 는 start_date, end_date 가 모두 있을 때만 채웁니다. (기존 동작)
+    - exclude_years(보관 연도를 뺀 조회) 연도의 판매는 기간/전체 판매량에서 제외합니다.
+    - 저자의 정산이 끝난 연도는 고정 명세의 책별 판매를 씁니다. (고정 명세에 없는 책은 현재 판매 집계)
+    - 정산 완료 기록이 없는 저자의 '마지막 정산 이후 판매량'은 전체 판매량과 같습니다.
+    - 카운터는 작업 큐가 증감을 반영한 만큼만 올라가므로, 방금 저장된 주문은 잠시 뒤에 반영될 수 있습니다.
+    """
+    author_ids = list(author_ids)
+    results = {author_id: AuthorSettlementResult() for author_id in author_ids}
+    if not author_ids:
+        return results
+
+    # 1. 저자 -> 책
+    books_by_author = defaultdict(list)
+    titles = {}
+    for author_id, book_id, title in (
+        Book.authors.through.objects.filter(author_id__in=author_ids)
+        .order_by('book_id')
+        .values_list('author_id', 'book_id', 'book__title_korean')
+    ):
+        books_by_author[author_id].append(book_id)
+        titles[book_id] = title
+    book_ids = list(titles)
+
+    # 2. 책별 판매량 / 3. 저자 누적 카운터
+    sales = _book_sales(book_ids, start_date, end_date, exclude_years)
+    counters = dict(AuthorSalesCounter.objects.filter(author_id__in=author_ids).values_list('author_id', 'units'))
+
+    # 4. 저자별 가장 최근 정산 완료 기록 (정산 기록은 저자당 연도 수만큼이므로 모두 읽고 메모리에서 고릅니다)
+    last_settled = {}
+    for author_id, settled_date, units_counter in (
+        Settlement.objects.filter(author_id__in=author_ids, is_settled=True, settled_date__isnull=False)
+        .order_by('author_id', '-settled_date', '-pk')
+        .values_list('author_id', 'settled_date', 'units_counter')
+    ):
+        last_settled.setdefault(author_id, (settled_date, units_counter))
+
+    # 5. 연간 실적 / 6. 고정 명세
+    frozen = frozen_author_sales(author_ids)
+    covered = covered_years(start_date, end_date)
+    performances = defaultdict(list)
+    for performance in AnnualPerformance.objects.filter(author_id__in=author_ids).order_by('-year'):
+        performances[performance.author_id].append({
+            'year': performance.year,
+            'total_units': performance.total_sales_units,
+            'total_revenue': performance.total_revenue,
+        })
+
+    for author_id, result in results.items():
+        author_books = books_by_author.get(author_id, [])
+        last_date, units_counter = last_settled.get(author_id, (None, None))
+        totals = {
+            book_id: _merge_frozen(sales.get(book_id, {}), frozen.get((author_id, book_id), {}), covered, exclude_years)
+            for book_id in author_books
+        }
+
+        result.total_sales_all_time = sum(total[2] for total in totals.values())
+        if last_date is None:
+            result.units_since_last_settlement = result.total_sales_all_time
+        else:
+            result.units_since_last_settlement = counters.get(author_id, 0) - (units_counter or 0)
+        result.last_settled_date = last_date
+        result.annual_performances = performances.get(author_id, [])
+
+        if start_date and end_date:
+            result.authored_books = [
+                {
+                    'book_id': book_id,
+                    'title_korean': titles[book_id],
+                    'current_period_sales': totals[book_id][0],
+                    'current_period_revenue': totals[book_id][1],
+                }
+                for book_id in author_books
+            ]
+
+    return results
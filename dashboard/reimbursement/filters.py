@@ -0,0 +1,120 @@
+import django_filters
+from django.db.models import Exists, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from book.models import Book
+from .models import SettlementLine
+from .settled import covered_years, settled_lines
+
+# 정렬/필터에 쓸 수 있는 집계 필드
+BOOK_SALES_METRICS = [
+    'total_sales_current_period',
+    'total_revenue_current_period',
+    'total_sales_all_time',
+    'last_settlement_units',
+]
+
+
+def _first_book_lines():
+    """(책, 연도)마다 먼저 고정된 저자 판매 행 (공저 책은 공저자 수만큼 고정되므로 그중 하나만)"""
+    lines = settled_lines().filter(composer__isnull=True)
+    earlier = lines.filter(
+        book=OuterRef('book'),
+        settlement__settlement_year=OuterRef('settlement__settlement_year'),
+        pk__lt=OuterRef('pk'),
+    )
+    return lines.filter(~Exists(earlier))
+
+
+def _line_sum(lines, field):
+    """책별 고정 명세 합계 Subquery (행이 없으면 0)"""
+    total = lines.order_by().values('book').annotate(total=Sum(field)).values('total')
+    return Coalesce(Subquery(total), Value(0, output_field=IntegerField()))
+
+
+def annotate_book_sales(queryset, start_date=None, end_date=None, exclude_years=()):
+    """
+    책 쿼리셋에 판매 집계(BOOK_SALES_METRICS)를 조건부 Sum 으로 붙입니다.
+    일별 판매 집계(DailyBookSales)를 한 번만 조인하여 책 목록 전체를 하나의 GROUP BY 쿼리로 계산하므로,
+    페이지 크기와 관계없이 쿼리 수가 일정하고 집계 값으로 SQL 정렬/필터가 가능합니다.
+
+    - 기간 판매량/금액 : start_date ~ end_date (양끝 포함, 둘 중 하나라도 없으면 전체 기간)
+    - 마지막 정산 이후 판매량 : 전체 판매량 - 이 책의 가장 최근 고정 명세에 남긴 책 누적 판매 권수 (정산 기록이 없으면 전체 판매량)
+    - exclude_years(보관 연도를 뺀 조회) 연도의 판매는 기간/전체 판매량에서 제외합니다.
+      (마지막 정산 이후 판매량은 누적 판매 권수와 비교하므로 항상 모든 연도로 계산)
+    - 정산이 끝난 (책, 연도)는 일별 판매 집계 대신 고정 명세(SettlementLine)의 판매를 씁니다. (reimbursement/settled.py)
+      기간 값은 기간이 그 연도를 통째로 포함할 때만 고정 명세를 씁니다.
+    """
+    zero = Value(0, output_field=IntegerField())
+    included = ~Q(daily_sales__date__year__in=exclude_years) if exclude_years else Q()
+    period = included
+    if start_date and end_date:
+        period &= Q(daily_sales__date__range=[start_date, end_date])
+
+    # 정산이 끝난 연도의 일별 판매 행은 현재 집계에서 빼고, 고정 명세 합계를 더합니다.
+    frozen_year = Q(Exists(settled_lines().filter(
+        book=OuterRef('pk'),
+        composer__isnull=True,
+        settlement__settlement_year=OuterRef('daily_sales__date__year'),
+    )))
+    frozen_lines = _first_book_lines().filter(book=OuterRef('pk'))
+    if exclude_years:
+        frozen_lines = frozen_lines.exclude(settlement__settlement_year__in=exclude_years)
+
+    covered = covered_years(start_date, end_date)
+    if covered is None:
+        live_period, frozen_period_units, frozen_period_revenue = (
+            period & ~frozen_year, _line_sum(frozen_lines, 'units'), _line_sum(frozen_lines, 'revenue'),
+        )
+    elif covered:
+        covered_lines = frozen_lines.filter(settlement__settlement_year__in=covered)
+        live_period, frozen_period_units, frozen_period_revenue = (
+            period & ~(frozen_year & Q(daily_sales__date__year__in=covered)),
+            _line_sum(covered_lines, 'units'),
+            _line_sum(covered_lines, 'revenue'),
+        )
+    else:
+        live_period, frozen_period_units, frozen_period_revenue = period, zero, zero
+
+    last_settled_counter = SettlementLine.objects.filter(
+        book=OuterRef('pk'),
+        composer__isnull=True,
+        settlement__is_settled=True,
+        book_units_counter__isnull=False,
+    ).order_by('-settled_at', '-pk').values('book_units_counter')[:1]
+
+    return queryset.annotate(
+        last_settled_counter=Subquery(last_settled_counter),
+    ).annotate(
+        total_sales_current_period=Coalesce(Sum('daily_sales__units', filter=live_period), zero) + frozen_period_units,
+        total_revenue_current_period=Coalesce(Sum('daily_sales__revenue', filter=live_period), zero) + frozen_period_revenue,
+        total_sales_all_time=(
+            Coalesce(Sum('daily_sales__units', filter=included & ~frozen_year), zero) + _line_sum(frozen_lines, 'units')
+        ),
+        units_all_years=Coalesce(Sum('daily_sales__units'), zero),
+    ).annotate(
+        last_settlement_units=F('units_all_years') - Coalesce(F('last_settled_counter'), zero),
+    )
+
+
+class BookSalesFilter(django_filters.FilterSet):
+    """
+    책별 판매 집계(BookSalesListView)용 FilterSet
+    annotate_book_sales 로 붙인 집계 값에 대한 범위 조건은 HAVING 으로 적용됩니다.
+    """
+    title = django_filters.CharFilter(field_name='title_korean', lookup_expr='icontains')
+    category1 = django_filters.CharFilter(field_name='category1')
+    book_type = django_filters.ChoiceFilter(field_name='book_type', choices=Book.BOOK_TYPES)
+
+    min_sales_current_period = django_filters.NumberFilter(field_name='total_sales_current_period', lookup_expr='gte')
+    max_sales_current_period = django_filters.NumberFilter(field_name='total_sales_current_period', lookup_expr='lte')
+    min_revenue_current_period = django_filters.NumberFilter(field_name='total_revenue_current_period', lookup_expr='gte')
+    max_revenue_current_period = django_filters.NumberFilter(field_name='total_revenue_current_period', lookup_expr='lte')
+    min_sales_all_time = django_filters.NumberFilter(field_name='total_sales_all_time', lookup_expr='gte')
+    max_sales_all_time = django_filters.NumberFilter(field_name='total_sales_all_time', lookup_expr='lte')
+    min_last_settlement_units = django_filters.NumberFilter(field_name='last_settlement_units', lookup_expr='gte')
+    max_last_settlement_units = django_filters.NumberFilter(field_name='last_settlement_units', lookup_expr='lte')
+
+    class Meta:
+        model = Book
+        fields = []
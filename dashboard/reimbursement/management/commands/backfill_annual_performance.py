@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from jobs.queue import enqueue
+from reimbursement.bulk import backfill_settlement_counters
+from reimbursement.performance import rebuild_year
+from sales.services import first_sale_date
+
+
+def _rebuild(year):
+    close_old_connections()
+    try:
+        return rebuild_year(year)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = '저자별 연간 실적(AnnualPerformance)을 일별 판매 집계에서 다시 계산합니다. 연도별로 병렬 처리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-year', type=int, help='시작 연도 (기본: 첫 주문 연도)')
+        parser.add_argument('--end-year', type=int, help='종료 연도 (기본: 올해)')
+        parser.add_argument('--workers', type=int, default=4, help='동시에 계산할 연도 수 (기본 4)')
+        parser.add_argument('--enqueue', action='store_true', help='바로 실행하지 않고 연도별 작업을 큐에 적재 (run_workers 가 실행)')
+
+    def handle(self, *args, **options):
+        first_date = first_sale_date()
+        start_year = options['start_year'] or (first_date.year if first_date else None)
+        end_year = options['end_year'] or timezone.localdate().year
+        if start_year is None:
+            self.stdout.write('주문이 없습니다.')
+            return
+        if start_year > end_year:
+            raise CommandError('시작 연도가 종료 연도보다 늦습니다.')
+
+        years = list(range(start_year, end_year + 1))
+
+        if options['enqueue']:
+            for year in years:
+                job = enqueue('reimbursement.backfill_annual_performance', {'year': year})
+                self.stdout.write(f'작업 #{job.pk} 적재 ({year}년)')
+            self.stdout.write('작업이 모두 끝나면 check_annual_performance --fix 로 확인하고 이전 정산 기록의 기준값을 채우세요.')
+            return
+
+        workers = max(1, min(options['workers'], len(years)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='annual-performance') as executor:
+            row_count = sum(executor.map(_rebuild, years))
+        # 카운터 도입 전에 완료된 정산 기록의 기준값 (이미 채워진 기록은 건드리지 않음)
+        counters = backfill_settlement_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f'{start_year} ~ {end_year}년 연간 실적 {row_count}행 재계산 완료 '
+            f'(정산 기준값 {counters["settlement_count"]}건, 명세 기준값 {counters["line_count"]}건 채움)'
+        ))
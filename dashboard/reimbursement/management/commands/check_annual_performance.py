@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reimbursement.bulk import backfill_settlement_counters
+from reimbursement.performance import apply_performance_deltas, find_counter_drift, find_drift, rebuild_counters, rebuild_year
+from sales.services import first_sale_date
+
+
+class Command(BaseCommand):
+    help = (
+        '저장된 연간 실적(AnnualPerformance)과 일별 판매 집계 합계, 저자 누적 카운터와 연간 실적 합을 비교해 어긋난 저자를 보고합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, action='append', help='검사할 연도 (여러 번 지정 가능, 기본: 첫 주문 연도부터 올해까지)')
+        parser.add_argument('--fix', action='store_true', help='어긋난 연도를 일별 판매 집계에서 다시 계산')
+
+    def handle(self, *args, **options):
+        years = options['year']
+        if not years:
+            first_date = first_sale_date()
+            if first_date is None:
+                self.stdout.write('주문이 없습니다.')
+                return
+            years = list(range(first_date.year, timezone.localdate().year + 1))
+
+        # 아직 반영되지 않은 증감은 어긋남이 아니므로 먼저 반영합니다.
+        applied = apply_performance_deltas()
+        if applied:
+            self.stdout.write(f'대기 중이던 증감 {applied}건 반영')
+
+        drift_years = []
+        for year in sorted(years):
+            drift = find_drift(year)
+            if not drift:
+                continue
+            drift_years.append(year)
+            for author_id, (saved_units, saved_revenue), (units, revenue) in drift:
+                self.stdout.write(
+                    f'{year}년 저자 #{author_id}: 저장 {saved_units}권/{saved_revenue}원, 집계 {units}권/{revenue}원'
+                )
+
+        counter_drift = find_counter_drift()
+        for author_id, saved_units, units in counter_drift:
+            self.stdout.write(f'저자 #{author_id} 누적 카운터: 저장 {saved_units}권, 연간 실적 합 {units}권')
+
+        if options['fix']:
+            for year in drift_years:
+                rebuild_year(year)
+            # 연도 재계산은 카운터에 차이만 더하므로, 그 전부터 어긋난 카운터는 연간 실적 합으로 다시 만듭니다.
+            if find_counter_drift():
+                rebuild_counters()
+            counters = backfill_settlement_counters()
+            self.stdout.write(self.style.SUCCESS(
+                f'{len(drift_years)}개 연도 재계산, 누적 카운터 {len(counter_drift)}건 정리, '
+                f'정산 기준값 {counters["settlement_count"]}건 / 명세 기준값 {counters["line_count"]}건 채움'
+            ))
+        elif drift_years or counter_drift:
+            self.stdout.write(self.style.WARNING(
+                f'{len(drift_years)}개 연도, 누적 카운터 {len(counter_drift)}건이 어긋났습니다. --fix 로 다시 계산하세요.'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{len(years)}개 연도와 누적 카운터가 모두 일치합니다.'))
@@ -0,0 +1,53 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from jobs.queue import enqueue
+from reimbursement.statements import STATEMENT_FORMATS, check_formats, generate_statements
+
+
+class Command(BaseCommand):
+    help = '한 해의 모든 저자/작곡가 정산 명세서를 만들고 manifest.json 을 씁니다. 렌더링은 프로세스 풀로 나눠 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='정산 연도 (기본: 작년)')
+        parser.add_argument(
+            '--format', dest='formats', action='append', choices=STATEMENT_FORMATS,
+            help='명세서 형식 (여러 번 지정 가능, 기본: html). xlsx 는 openpyxl(requirements.txt), pdf 는 weasyprint(requirements-pdf.txt) 필요',
+        )
+        parser.add_argument('--workers', type=int, default=4, help='렌더링 프로세스 수 (기본 4)')
+        parser.add_argument('--split-by-songs', action='store_true', help='작곡가 저작권료를 곡 수 비율로 나눔')
+        parser.add_argument('--output-dir', help='출력 최상위 폴더 (기본: settings.STATEMENT_ROOT)')
+        parser.add_argument('--enqueue', action='store_true', help='바로 실행하지 않고 작업 큐에 적재 (run_workers 가 실행)')
+
+    def handle(self, *args, **options):
+        year = options['year'] or timezone.localdate().year - 1
+        formats = options['formats'] or ['html']
+        try:
+            check_formats(formats)
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+
+        if options['enqueue']:
+            job = enqueue('reimbursement.generate_statements', {
+                'year': year,
+                'formats': formats,
+                'workers': options['workers'],
+                'split_by_songs': options['split_by_songs'],
+                'output_root': options['output_dir'],
+            })
+            self.stdout.write(f'작업 #{job.pk} 적재 ({year}년 명세서)')
+            return
+
+        result = generate_statements(
+            year,
+            formats=formats,
+            workers=options['workers'],
+            split_by_songs=options['split_by_songs'],
+            output_root=options['output_dir'],
+        )
+        message = f"{year}년 명세서 {result['payee_count']}건 생성 완료: {result['output_dir']}"
+        if result['error_count']:
+            self.stdout.write(self.style.WARNING(f"{message} (실패 {result['error_count']}건, manifest.json 참고)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
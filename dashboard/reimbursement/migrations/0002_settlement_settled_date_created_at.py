@@ -0,0 +1,23 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reimbursement', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='settlement',
+            name='settled_date',
+            field=models.DateField(blank=True, null=True, verbose_name='정산 완료일'),
+        ),
+        migrations.AddField(
+            model_name='settlement',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='생성일'),
+            preserve_default=False,
+        ),
+    ]
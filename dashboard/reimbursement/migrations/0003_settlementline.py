@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0003_composer_user'),
+        ('reimbursement', '0002_settlement_settled_date_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SettlementLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title_korean', models.CharField(max_length=200, verbose_name='책 제목')),
+                ('units', models.IntegerField(default=0, verbose_name='판매 권수')),
+                ('revenue', models.BigIntegerField(default=0, verbose_name='판매 금액')),
+                ('royalty_percentage', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='저작권료 (%)')),
+                ('royalty', models.DecimalField(blank=True, decimal_places=0, max_digits=14, null=True, verbose_name='저작권료')),
+                ('settled_at', models.DateTimeField(verbose_name='정산 고정 시각')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='settlement_lines', to='book.book', verbose_name='책')),
+                ('composer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='settlement_lines', to='book.composer', verbose_name='작곡가')),
+                ('settlement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='reimbursement.settlement', verbose_name='정산 기록')),
+            ],
+            options={
+                'verbose_name': '정산 명세',
+                'verbose_name_plural': '정산 명세 목록',
+                'ordering': ['settlement', 'book', 'composer'],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0003_composer_user'),
+        ('reimbursement', '0003_settlementline'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='annualperformance',
+            name='total_revenue',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='총 매출'),
+        ),
+        migrations.CreateModel(
+            name='PerformanceDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(verbose_name='연도')),
+                ('units', models.IntegerField(default=0, verbose_name='판매 권수 증감')),
+                ('revenue', models.BigIntegerField(default=0, verbose_name='판매 금액 증감')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='기록 시각')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='book.book', verbose_name='책')),
+            ],
+            options={
+                'verbose_name': '연간 실적 반영 대기',
+                'verbose_name_plural': '연간 실적 반영 대기 목록',
+                'ordering': ['pk'],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0003_composer_user'),
+        ('reimbursement', '0004_performancedelta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='settlement',
+            name='units_counter',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='정산 시점 누적 판매 권수'),
+        ),
+        migrations.AddField(
+            model_name='settlementline',
+            name='book_units_counter',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='고정 시점 책 누적 판매 권수'),
+        ),
+        migrations.CreateModel(
+            name='AuthorSalesCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('units', models.BigIntegerField(default=0, verbose_name='누적 판매 권수')),
+                ('revenue', models.BigIntegerField(default=0, verbose_name='누적 판매 금액')),
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='sales_counter', to='book.author', verbose_name='저자')),
+            ],
+            options={
+                'verbose_name': '저자 누적 판매',
+                'verbose_name_plural': '저자 누적 판매 목록',
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reimbursement', '0005_sales_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='settlementline',
+            name='number_of_songs',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='곡 수'),
+        ),
+        migrations.AddField(
+            model_name='settlementline',
+            name='split_by_songs',
+            field=models.BooleanField(default=False, verbose_name='곡 수 비율로 나눔'),
+        ),
+        migrations.AddField(
+            model_name='settlementline',
+            name='total_songs',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='책 전체 곡 수'),
+        ),
+    ]
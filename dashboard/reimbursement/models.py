@@ -4,12 +4,14 @@ from book.models import Author # Author 모델 임포트
 
 class AnnualPerformance(models.Model):
     """
-    (추가 정보용) 저자별 연간 실적 집계 모델 (필요 시 확장)
+    (추가 정보용) 저자별 연간 실적 집계 모델
+    [수정] 저자 책들의 연간 판매 합계. PerformanceDelta 를 반영하는 작업이 증분으로 갱신합니다.
+    (reimbursement.performance 참고, 전체 재계산은 backfill_annual_performance 명령)
     """
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='annual_performance')
     year = models.IntegerField(verbose_name='연도')
     total_sales_units = models.IntegerField(default=0, verbose_name='총 판매 권수')
-    total_revenue = models.DecimalField(max_digits=10, decimal_places=2, default=0, verbose_name='총 매출')
+    total_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='총 매출')
 
     class Meta:
         verbose_name = '연간 실적'
@@ -21,6 +23,45 @@ class AnnualPerformance(models.Model):
         return f"{self.author.name} - {self.year}년 실적"
 
 
+class PerformanceDelta(models.Model):
+    """
+    [신규] 연간 실적에 반영할 판매 증감 (outbox)
+    일별 판매 집계가 바뀐 트랜잭션 안에서 (책, 연도)별 증감을 기록하고,
+    백그라운드 작업(reimbursement.apply_performance_deltas)이 저자별 연간 실적에 더한 뒤 지웁니다.
+    """
+    book = models.ForeignKey('book.Book', on_delete=models.CASCADE, related_name='+', verbose_name='책')
+    year = models.IntegerField(verbose_name='연도')
+    units = models.IntegerField(default=0, verbose_name='판매 권수 증감')
+    revenue = models.BigIntegerField(default=0, verbose_name='판매 금액 증감')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='기록 시각')
+
+    class Meta:
+        verbose_name = '연간 실적 반영 대기'
+        verbose_name_plural = '연간 실적 반영 대기 목록'
+        ordering = ['pk']
+
+    def __str__(self):
+        return f"{self.book_id} - {self.year}년 {self.units:+}권"
+
+
+class AuthorSalesCounter(models.Model):
+    """
+    [신규] 저자별 누적 판매 카운터 (연간 실적과 같은 증감으로 함께 갱신, 값 = 연간 실적의 전체 연도 합)
+    정산 완료 시점의 값을 Settlement.units_counter 에 기록해 두면
+    '마지막 정산 이후 판매량' = 현재 값 - 정산 시점 값 으로 판매량과 관계없이 바로 계산됩니다.
+    """
+    author = models.OneToOneField(Author, on_delete=models.CASCADE, related_name='sales_counter', verbose_name='저자')
+    units = models.BigIntegerField(default=0, verbose_name='누적 판매 권수')
+    revenue = models.BigIntegerField(default=0, verbose_name='누적 판매 금액')
+
+    class Meta:
+        verbose_name = '저자 누적 판매'
+        verbose_name_plural = '저자 누적 판매 목록'
+
+    def __str__(self):
+        return f"{self.author_id} - 누적 {self.units}권"
+
+
 class Settlement(models.Model):
     """
     저자별 연말 정산 여부를 관리하는 모델.
@@ -46,6 +87,26 @@ class Settlement(models.Model):
         verbose_name='정산 완료 여부'
     )
 
+    # [신규] 정산 완료일 (is_settled 가 True 로 바뀔 때 기록, '마지막 정산 이후 판매량'의 기준일)
+    settled_date = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name='정산 완료일'
+    )
+
+    # [신규] 정산 완료 시점의 저자 누적 판매 권수 (AuthorSalesCounter.units, '마지막 정산 이후 판매량'의 기준값)
+    units_counter = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='정산 시점 누적 판매 권수'
+    )
+
+    # [신규] 기록 생성일
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='생성일'
+    )
+
     class Meta:
         verbose_name = '정산 기록'
         verbose_name_plural = '정산 기록 목록'
@@ -56,4 +117,50 @@ class Settlement(models.Model):
 
     def __str__(self):
         return f"{self.author.name} - {self.settlement_year}년 정산: {'완료' if self.is_settled else '미완료'}"
-    
\ No newline at end of file
+    
+
+class SettlementLine(models.Model):
+    """
+    [신규] 정산 완료 시점에 고정한 정산 명세 (책별 저자 판매 / 작곡가 저작권료)
+    정산이 완료된 연도는 이 표에서 읽으므로, 이후 지난 주문이 수정되어도 명세가 바뀌지 않습니다.
+    - composer 가 비어 있으면 저자(settlement.author)의 책별 판매 행
+    - composer 가 있으면 그 책에 대한 작곡가 저작권료 행
+      공저자가 여러 명인 책도 작곡가 행은 (작곡가, 책, 연도)마다 한 정산 기록에만 고정됩니다. (중복 지급 방지)
+    """
+    settlement = models.ForeignKey(
+        Settlement,
+        on_delete=models.CASCADE,
+        related_name='lines',
+        verbose_name='정산 기록'
+    )
+    book = models.ForeignKey('book.Book', on_delete=models.PROTECT, related_name='settlement_lines', verbose_name='책')
+    composer = models.ForeignKey(
+        'book.Composer',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='settlement_lines',
+        verbose_name='작곡가'
+    )
+    # 책 제목은 이후 변경되어도 명세에는 정산 당시 제목이 남도록 복사해 둡니다.
+    title_korean = models.CharField(max_length=200, verbose_name='책 제목')
+    units = models.IntegerField(default=0, verbose_name='판매 권수')
+    revenue = models.BigIntegerField(default=0, verbose_name='판매 금액')
+    royalty_percentage = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name='저작권료 (%)')
+    royalty = models.DecimalField(max_digits=14, decimal_places=0, null=True, blank=True, verbose_name='저작권료')
+    # 곡 수 비율 (작곡가 행만). split_by_songs 로 고정한 행은 royalty 가 내 곡 수 / 책 전체 곡 수 만큼 나뉜 금액입니다.
+    number_of_songs = models.PositiveIntegerField(null=True, blank=True, verbose_name='곡 수')
+    total_songs = models.PositiveIntegerField(null=True, blank=True, verbose_name='책 전체 곡 수')
+    split_by_songs = models.BooleanField(default=False, verbose_name='곡 수 비율로 나눔')
+    settled_at = models.DateTimeField(verbose_name='정산 고정 시각')
+    # 고정 시점의 책 누적 판매 권수 (저자 판매 행만, 책별 '마지막 정산 이후 판매량'의 기준값)
+    book_units_counter = models.BigIntegerField(null=True, blank=True, verbose_name='고정 시점 책 누적 판매 권수')
+
+    class Meta:
+        verbose_name = '정산 명세'
+        verbose_name_plural = '정산 명세 목록'
+        ordering = ['settlement', 'book', 'composer']
+
+    def __str__(self):
+        payee = self.composer.name if self.composer_id else self.settlement.author.name
+        return f"{self.settlement.settlement_year}년 {payee} - {self.title_korean}"
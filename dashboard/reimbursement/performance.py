@@ -0,0 +1,246 @@
+"""
+저자별 연간 실적(AnnualPerformance) 유지
+
+- record_deltas            : 일별 판매 집계가 바뀐 트랜잭션 안에서 (책, 연도)별 증감을 outbox(PerformanceDelta)에 기록
+- apply_performance_deltas : outbox 를 묶음으로 꺼내 저자별 연간 실적에 더하고 지웁니다. (백그라운드 작업)
+- rebuild_year             : 한 해의 연간 실적을 일별 판매 집계에서 다시 계산 (backfill_annual_performance 명령)
+- find_drift               : 저장된 연간 실적과 일별 판매 집계 합계를 비교 (check_annual_performance 명령)
+- 저자 누적 카운터(AuthorSalesCounter)는 연간 실적과 같은 증감/재계산 차이로 함께 갱신되어 항상 연간 실적의 합과 같습니다.
+주문 저장 요청에서는 outbox 기록(1 쿼리)만 하고, 저자별 합산은 작업 큐에서 처리합니다.
+책의 저자가 바뀌면 증감으로는 따라갈 수 없으므로 check_annual_performance --fix 로 맞춥니다.
+증감은 일별 판매 집계가 바뀐 만큼이므로 재계산/비교도 같은 일별 판매 집계를 기준으로 합니다.
+(일별 판매 집계 자체가 주문과 어긋났다면 rebuild_daily_sales 를 먼저 실행합니다)
+"""
+import datetime
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from book.models import Book
+from jobs.models import Job
+from jobs.queue import enqueue
+from sales.models import DailyBookSales
+from sales.services import lock_daily_sales
+from .cache import invalidate_reimbursement_cache
+from .models import AnnualPerformance, AuthorSalesCounter, PerformanceDelta
+
+APPLY_TASK = 'reimbursement.apply_performance_deltas'
+
+
+def _authors_by_book(book_ids):
+    """{book_id: [author_id, ...]} (1 쿼리)"""
+    authors = defaultdict(list)
+    for book_id, author_id in Book.authors.through.objects.filter(book_id__in=book_ids).values_list('book_id', 'author_id'):
+        authors[book_id].append(author_id)
+    return authors
+
+
+def _add_to_counters(totals):
+    """{author_id: (판매 권수, 판매 금액)} 을 저자 누적 카운터에 더합니다."""
+    AuthorSalesCounter.objects.bulk_create(
+        [AuthorSalesCounter(author_id=author_id) for author_id in totals],
+        ignore_conflicts=True,
+    )
+    for author_id, (units, revenue) in totals.items():
+        if units or revenue:
+            AuthorSalesCounter.objects.filter(author_id=author_id).update(
+                units=F('units') + units,
+                revenue=F('revenue') + revenue,
+            )
+
+
+def schedule_apply():
+    """대기 중인 반영 작업이 없을 때만 작업을 적재합니다. (실행 중인 작업이 가져가지 못한 증감은 새 작업이 처리)"""
+    if not Job.objects.filter(task_name=APPLY_TASK, status=Job.PENDING).exists():
+        enqueue(APPLY_TASK)
+
+
+def record_deltas(deltas):
+    """
+    {(날짜, 책 id): (판매 권수 증감, 판매 금액 증감)} 을 (책, 연도)로 묶어 outbox 에 기록하고,
+    커밋되면 반영 작업을 적재합니다.
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for (day, book_id), (units, revenue) in deltas.items():
+        total = totals[(book_id, day.year)]
+        total[0] += units
+        total[1] += revenue
+
+    rows = [
+        PerformanceDelta(book_id=book_id, year=year, units=units, revenue=revenue)
+        for (book_id, year), (units, revenue) in totals.items()
+        if units or revenue
+    ]
+    if rows:
+        PerformanceDelta.objects.bulk_create(rows)
+        transaction.on_commit(schedule_apply)
+
+
+def _apply_batch(batch_size):
+    """
+    outbox 에서 증감 batch_size 건을 꺼내 연간 실적에 더합니다.
+    반환값: 반영한 건수 (다른 작업과 겹쳐 이미 지워진 행이 있으면 되돌리고 None)
+    """
+    with transaction.atomic():
+        deltas = list(PerformanceDelta.objects.select_for_update(skip_locked=True).order_by('pk')[:batch_size])
+        if not deltas:
+            return 0
+        if PerformanceDelta.objects.filter(pk__in=[delta.pk for delta in deltas]).delete()[0] != len(deltas):
+            transaction.set_rollback(True)
+            return None
+
+        # (책, 연도) 증감 -> (저자, 연도) 증감
+        authors = _authors_by_book({delta.book_id for delta in deltas})
+        totals = defaultdict(lambda: [0, 0])
+        for delta in deltas:
+            for author_id in authors.get(delta.book_id, []):
+                total = totals[(author_id, delta.year)]
+                total[0] += delta.units
+                total[1] += delta.revenue
+
+        # 없는 행은 0으로 만들고, 모든 칸을 F() 로 더합니다. (동시에 반영해도 잃어버리는 증감이 없음)
+        AnnualPerformance.objects.bulk_create(
+            [AnnualPerformance(author_id=author_id, year=year) for author_id, year in totals],
+            ignore_conflicts=True,
+        )
+        counter_totals = defaultdict(lambda: [0, 0])
+        for (author_id, year), (units, revenue) in totals.items():
+            if units or revenue:
+                AnnualPerformance.objects.filter(author_id=author_id, year=year).update(
+                    total_sales_units=F('total_sales_units') + units,
+                    total_revenue=F('total_revenue') + revenue,
+                )
+            counter_totals[author_id][0] += units
+            counter_totals[author_id][1] += revenue
+        _add_to_counters(counter_totals)
+        invalidate_reimbursement_cache()
+    return len(deltas)
+
+
+def apply_performance_deltas(batch_size=1000, job=None):
+    """outbox 가 빌 때까지 묶음 단위로 반영합니다. 반환값: 반영한 증감 건수"""
+    applied = 0
+    while True:
+        count = _apply_batch(batch_size)
+        if count == 0:
+            break
+        applied += count or 0
+        if job:
+            job.update_progress(applied, message=f'증감 {applied}건 반영')
+    return applied
+
+
+def year_performance(year):
+    """
+    일별 판매 집계(운영 + 보관 주문 포함)에서 계산한 그 해의 저자별 {author_id: (판매 권수, 판매 금액)}
+    책마다 합계를 낸 뒤 그 책의 모든 저자에게 더합니다. (공저자는 각자 책 전체 판매를 실적으로 가집니다)
+    """
+    book_totals = {
+        row['book_id']: (row['units'], row['revenue'])
+        for row in (
+            DailyBookSales.objects.filter(date__gte=datetime.date(year, 1, 1), date__lte=datetime.date(year, 12, 31))
+            .values('book_id')
+            .annotate(units=Sum('units'), revenue=Sum('revenue'))
+            .order_by()
+        )
+    }
+
+    authors = _authors_by_book(book_totals)
+    totals = defaultdict(lambda: [0, 0])
+    for book_id, (units, revenue) in book_totals.items():
+        for author_id in authors.get(book_id, []):
+            totals[author_id][0] += units
+            totals[author_id][1] += revenue
+    return {author_id: (units, revenue) for author_id, (units, revenue) in totals.items() if units or revenue}
+
+
+def rebuild_year(year):
+    """
+    그 해의 연간 실적을 일별 판매 집계에서 다시 만듭니다.
+    일별 판매 집계를 배타적으로 잠근 트랜잭션 안에서 합계를 읽고 그 해의 증감을 지웁니다.
+    잠금 중에는 증감을 기록하는 갱신이 진행되지 않으므로, 쌓여 있던 증감은 모두 합계에 들어 있고
+    이후에 기록되는 증감은 합계에 없는 변화만 담습니다. (같은 판매가 두 번 더해지지 않음)
+    저자 누적 카운터에는 바뀐 만큼(새 값 - 기존 값)만 더합니다.
+    반환값: 저장한 연간 실적 행 수
+    """
+    with transaction.atomic():
+        lock_daily_sales(exclusive=True)
+        totals = year_performance(year)
+        PerformanceDelta.objects.filter(year=year).delete()
+        changes = defaultdict(lambda: [0, 0])
+        for author_id, units, revenue in AnnualPerformance.objects.filter(year=year).values_list(
+            'author_id', 'total_sales_units', 'total_revenue'
+        ):
+            changes[author_id][0] -= units
+            changes[author_id][1] -= int(revenue)
+        for author_id, (units, revenue) in totals.items():
+            changes[author_id][0] += units
+            changes[author_id][1] += revenue
+        _add_to_counters({author_id: change for author_id, change in changes.items() if any(change)})
+
+        AnnualPerformance.objects.filter(year=year).delete()
+        AnnualPerformance.objects.bulk_create([
+            AnnualPerformance(author_id=author_id, year=year, total_sales_units=units, total_revenue=revenue)
+            for author_id, (units, revenue) in totals.items()
+        ], batch_size=1000)
+        invalidate_reimbursement_cache()
+    return len(totals)
+
+
+def find_drift(year):
+    """
+    그 해의 저장된 연간 실적과 일별 판매 집계 합계가 다른 저자 목록.
+    반환값: [(author_id, 저장된 (권수, 금액), 집계 (권수, 금액)), ...]
+    """
+    expected = year_performance(year)
+    stored = {
+        author_id: (units, int(revenue))
+        for author_id, units, revenue in AnnualPerformance.objects.filter(year=year).values_list(
+            'author_id', 'total_sales_units', 'total_revenue'
+        )
+    }
+    drift = []
+    for author_id in sorted(set(expected) | set(stored)):
+        saved = stored.get(author_id, (0, 0))
+        actual = expected.get(author_id, (0, 0))
+        if saved != actual:
+            drift.append((author_id, saved, actual))
+    return drift
+
+
+def find_counter_drift():
+    """
+    저자 누적 카운터가 연간 실적의 합과 다른 저자 목록.
+    반환값: [(author_id, 카운터 권수, 연간 실적 합 권수), ...]
+    """
+    expected = dict(
+        AnnualPerformance.objects.values('author_id')
+        .annotate(units=Sum('total_sales_units'))
+        .values_list('author_id', 'units')
+        .order_by()
+    )
+    stored = dict(AuthorSalesCounter.objects.values_list('author_id', 'units'))
+    return [
+        (author_id, stored.get(author_id, 0), expected.get(author_id, 0))
+        for author_id in sorted(set(expected) | set(stored))
+        if stored.get(author_id, 0) != expected.get(author_id, 0)
+    ]
+
+
+def rebuild_counters():
+    """저자 누적 카운터를 연간 실적의 합으로 다시 만듭니다. 반환값: 카운터 행 수"""
+    rows = (
+        AnnualPerformance.objects.values('author_id')
+        .annotate(units=Sum('total_sales_units'), revenue=Sum('total_revenue'))
+        .order_by()
+    )
+    counters = [
+        AuthorSalesCounter(author_id=row['author_id'], units=row['units'], revenue=int(row['revenue']))
+        for row in rows
+    ]
+    with transaction.atomic():
+        AuthorSalesCounter.objects.all().delete()
+        AuthorSalesCounter.objects.bulk_create(counters, batch_size=1000)
+        invalidate_reimbursement_cache()
+    return len(counters)
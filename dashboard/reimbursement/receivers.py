@@ -0,0 +1,31 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from book.models import Author, Book
+from sales.signals import daily_sales_changed
+from .cache import invalidate_reimbursement_cache
+from .models import Settlement
+from .performance import record_deltas
+
+
+@receiver(daily_sales_changed)
+def record_performance_deltas(sender, deltas, **kwargs):
+    # 일별 판매 집계와 같은 트랜잭션에서 연간 실적 증감을 outbox 에 기록합니다. (합산은 작업 큐에서)
+    record_deltas(deltas)
+    # 판매 집계가 바뀌었으므로 정산 API 응답 캐시도 커밋 후 무효화합니다.
+    invalidate_reimbursement_cache()
+
+
+@receiver(post_save, sender=Settlement)
+@receiver(post_delete, sender=Settlement)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_on_settlement_or_author(sender, **kwargs):
+    # 일괄 UPDATE/bulk_create 는 신호가 없으므로 reimbursement.bulk 에서 직접 무효화합니다.
+    invalidate_reimbursement_cache()
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+def invalidate_on_book_authors(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_reimbursement_cache()
@@ -0,0 +1,125 @@
+"""
+작곡가 저작권료 계산 엔진
+
+기간 내 책별 판매 금액 x ComposerWork.royalty_percentage 로 작곡가별 저작권료를 계산합니다.
+- split_by_songs=True 이면 한 책의 저작권료를 그 책에 참여한 작곡가들의 곡 수 비율로 나눕니다.
+  (작곡가 몫 = 판매 금액 x 저작권료율 x 내 곡 수 / 책 전체 곡 수)
+- (책, 연도)별 판매 금액(1 쿼리), 작곡가 작업 목록(1 쿼리), 고정 명세(1 쿼리)만 불러오고, 나머지는 메모리에서 계산합니다.
+- 정산이 끝난 연도는 완료 시점에 고정한 명세(SettlementLine)의 판매 금액/저작권료율/곡 수로 계산합니다. (reimbursement/settled.py)
+- 중간 계산은 Fraction 으로 정확히 하고, 마지막에 원 단위로 한 번만 반올림(ROUND_HALF_UP)합니다.
+  (책별 금액도 각각 반올림해 보여주므로, 책별 합과 총액이 1원 단위로 다를 수 있습니다)
+"""
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from fractions import Fraction
+
+from django.db.models import Sum
+from django.db.models.functions import ExtractYear
+
+from book.models import ComposerWork
+from sales.models import DailyBookSales
+from .settled import covered_years, frozen_composer_lines, is_covered
+
+WON = Decimal('1')
+
+
+def to_won(value):
+    """Fraction -> 원 단위 Decimal (반올림)"""
+    return (Decimal(value.numerator) / Decimal(value.denominator)).quantize(WON, rounding=ROUND_HALF_UP)
+
+
+def book_revenues(book_ids, start_date=None, end_date=None, exclude_years=()):
+    """기간 내 (책, 연도)별 {book_id: {연도: (판매 권수, 판매 금액)}} (1 쿼리, exclude_years 연도의 판매는 제외)"""
+    qs = DailyBookSales.objects.filter(book_id__in=book_ids).exclude(date__year__in=exclude_years)
+    if start_date and end_date:
+        qs = qs.filter(date__range=[start_date, end_date])
+    revenues = defaultdict(dict)
+    for row in (
+        qs.annotate(year=ExtractYear('date'))
+        .values('book_id', 'year')
+        .annotate(units=Sum('units'), revenue=Sum('revenue'))
+        .order_by()
+    ):
+        revenues[row['book_id']][row['year']] = (row['units'], row['revenue'])
+    return revenues
+
+
+def compute_composer_royalties(composer_ids, start_date=None, end_date=None, split_by_songs=False, exclude_years=()):
+    """
+    작곡가들의 저작권료를 계산합니다.
+    반환값: {composer_id: {'total_revenue', 'total_royalty', 'books': [...]}}
+    - 기간이 통째로 포함하는 연도 중 정산이 끝난 연도는 고정 명세로 계산합니다.
+      (곡 수 비율은 고정 시점의 곡 수를 쓰고, 곡 수가 없는 예전 명세는 현재 곡 수를 씁니다)
+    - books 의 royalty_percentage/number_of_songs/song_share 는 현재 작곡가 작업 기준입니다.
+    """
+    composer_ids = list(composer_ids)
+    results = {composer_id: {'total_revenue': 0, 'total_royalty': Decimal('0'), 'books': []} for composer_id in composer_ids}
+    if not composer_ids:
+        return results
+
+    # 1. 작곡가 작업 (책 제목 포함)
+    works = list(
+        ComposerWork.objects.filter(composer_id__in=composer_ids)
+        .order_by('book_id', 'composer_id')
+        .values_list('composer_id', 'book_id', 'book__title_korean', 'number_of_songs', 'royalty_percentage')
+    )
+    book_ids = {book_id for _, book_id, _, _, _ in works}
+
+    # 2. (책, 연도)별 판매 금액, 정산이 끝난 연도의 고정 명세, 곡 수 비율로 나눌 때는 책별 전체 곡 수 (다른 작곡가 포함)
+    revenues = book_revenues(book_ids, start_date, end_date, exclude_years)
+    frozen = frozen_composer_lines(composer_ids)
+    covered = covered_years(start_date, end_date)
+    total_songs = {}
+    if split_by_songs:
+        total_songs = dict(
+            ComposerWork.objects.filter(book_id__in=book_ids)
+            .values('book_id')
+            .annotate(songs=Sum('number_of_songs'))
+            .values_list('book_id', 'songs')
+            .order_by()
+        )
+
+    # 3. 작곡가별 정확한 합계 (Fraction)
+    exact_totals = defaultdict(Fraction)
+    for composer_id, book_id, title, songs, percentage in works:
+        share = Fraction(1)
+        if split_by_songs and total_songs.get(book_id):
+            share = Fraction(songs, total_songs[book_id])
+
+        live = revenues.get(book_id, {})
+        snapshots = frozen.get((composer_id, book_id), {})
+        units = revenue = 0
+        royalty = Fraction(0)
+        for year in set(live) | set(snapshots):
+            line = snapshots.get(year)
+            if line is not None and year not in exclude_years and is_covered(year, covered):
+                year_share = share
+                if split_by_songs and line.total_songs:
+                    year_share = Fraction(line.number_of_songs, line.total_songs)
+                units += line.units
+                revenue += line.revenue
+                royalty += Fraction(line.revenue) * Fraction(line.royalty_percentage) / 100 * year_share
+            elif year in live:
+                year_units, year_revenue = live[year]
+                units += year_units
+                revenue += year_revenue
+                royalty += Fraction(year_revenue) * Fraction(percentage) / 100 * share
+
+        exact_totals[composer_id] += royalty
+        result = results[composer_id]
+        result['total_revenue'] += revenue
+        result['books'].append({
+            'book_id': book_id,
+            'title_korean': title,
+            'units': units,
+            'revenue': revenue,
+            'number_of_songs': songs,
+            'royalty_percentage': percentage,
+            'song_share': to_won(share * 10000) / 100 if split_by_songs else Decimal('100'),
+            'royalty': to_won(royalty),
+        })
+
+    # 4. 마지막에 한 번만 반올림
+    for composer_id, total in exact_totals.items():
+        results[composer_id]['total_royalty'] = to_won(total)
+    return results
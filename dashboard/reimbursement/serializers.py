@@ -1,8 +1,10 @@
 from rest_framework import serializers
-from book.models import Author, Book, AuthorWork
-from order.models import OrderItem 
-from .models import Settlement, AnnualPerformance # Settlement, AnnualPerformance 모델 임포트
-from django.db.models import Sum
+from book.models import Author, Book, Composer
+from .engine import compute_author_settlements
+from .royalty import compute_composer_royalties
+from .bulk import set_settled
+from .timeseries import AUTHOR, COMPOSER, MONTH, WEEK
+from .models import Settlement, SettlementLine
 from datetime import date
 
 
@@ -11,12 +13,13 @@ from datetime import date
 class BookSalesSerializer(serializers.ModelSerializer):
     """
     책별 판매 집계를 위한 시리얼라이저입니다.
-    특정 기간 내의 판매량, 판매 금액, 전체 기간 누적 판매량, 마지막 정산일 이후 판매량을 계산합니다.
+    [수정] 집계 값은 BookSalesListView.get_queryset 에서 하나의 GROUP BY 쿼리로 붙이므로
+    (reimbursement.filters.annotate_book_sales) 여기서는 값을 읽기만 합니다.
     """
-    total_sales_current_period = serializers.SerializerMethodField()
-    total_revenue_current_period = serializers.SerializerMethodField()
-    total_sales_all_time = serializers.SerializerMethodField()
-    last_settlement_units = serializers.SerializerMethodField()
+    total_sales_current_period = serializers.IntegerField(read_only=True)
+    total_revenue_current_period = serializers.IntegerField(read_only=True)
+    total_sales_all_time = serializers.IntegerField(read_only=True)
+    last_settlement_units = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Book
@@ -27,72 +30,31 @@ class BookSalesSerializer(serializers.ModelSerializer):
             'total_sales_all_time',
             'last_settlement_units',
         ]
-        
-    def _filter_order_items(self, book_obj, start_date=None, end_date=None, after_date=None):
-        """판매량 집계를 위한 쿼리셋 필터링을 수행합니다."""
-        qs = OrderItem.objects.filter(book=book_obj)
-        
-        if start_date and end_date:
-            # 특정 기간 필터링 (Views에서 넘어온 start_date, end_date)
-            # Order 모델에 order_date가 있다고 가정합니다.
-            qs = qs.filter(order__order_date__range=[start_date, end_date])
-        
-        if after_date:
-            # 특정 날짜 이후 필터링 (Settlement 날짜 이후)
-            qs = qs.filter(order__order_date__gt=after_date)
-            
-        return qs.aggregate(
-            total_quantity=Sum('quantity'),
-            total_revenue=Sum('total_price')
-        )
 
-    def get_total_sales_current_period(self, obj):
-        """필터링된 기간 내의 판매량 (current_period)"""
-        start_date = self.context.get('start_date')
-        end_date = self.context.get('end_date')
-        
-        result = self._filter_order_items(obj, start_date=start_date, end_date=end_date)
-        return result.get('total_quantity', 0) or 0
-
-    def get_total_revenue_current_period(self, obj):
-        """필터링된 기간 내의 판매 금액 (current_period)"""
-        start_date = self.context.get('start_date')
-        end_date = self.context.get('end_date')
-        
-        result = self._filter_order_items(obj, start_date=start_date, end_date=end_date)
-        return result.get('total_revenue', 0) or 0
-
-    def get_total_sales_all_time(self, obj):
-        """전체 기간 총 판매량"""
-        result = self._filter_order_items(obj)
-        return result.get('total_quantity', 0) or 0
 
-    def get_last_settlement_units(self, obj):
-        """
-        마지막 정산일 이후의 누적 판매량 (리셋된 누적 판매량)
-        - 이 책에 참여한 모든 저자의 가장 최근 정산일을 기준으로 합니다.
-        """
-        # Settlement 모델에 settled_date 필드가 있고, Book 모델에 authors ManyToMany 필드가 있다고 가정
-        last_settlement = Settlement.objects.filter(
-            author__in=obj.authors.all() 
-        ).order_by('-settled_date').first()
-        
-        if last_settlement and last_settlement.settled_date:
-            last_settlement_date = last_settlement.settled_date
-            
-            result = self._filter_order_items(obj, after_date=last_settlement_date)
-            return result.get('total_quantity', 0) or 0
-            
-        # 정산 기록이 없다면 전체 기간의 판매량과 동일합니다.
-        return self.get_total_sales_all_time(obj)
+# --- 2. 저자별 정산 집계 시리얼라이저 (AuthorSettlementListView 사용) ---
 
+class AuthorSettlementListSerializer(serializers.ListSerializer):
+    """
+    [신규] 목록(한 페이지)의 저자 전체를 정산 집계 엔진으로 한 번에 계산해 context 에 넣습니다.
+    (저자마다 쿼리를 보내지 않도록)
+    """
+    def to_representation(self, data):
+        authors = list(data.all() if hasattr(data, 'all') else data)
+        self.context['settlement_results'] = compute_author_settlements(
+            [author.pk for author in authors],
+            self.context.get('start_date'),
+            self.context.get('end_date'),
+            self.context.get('exclude_years', ()),
+        )
+        return super().to_representation(authors)
 
-# --- 2. 저자별 정산 집계 시리얼라이저 (AuthorSettlementListView 사용) ---
 
 class AuthorSettlementSerializer(serializers.ModelSerializer):
     """
     저자별 정산 집계를 위한 시리얼라이저입니다.
     저자의 책별 판매량, 누적 판매량, 리셋된 누적 판매량 등을 계산합니다.
+    [수정] 값은 reimbursement.engine.compute_author_settlements 가 미리 계산하고, 여기서는 읽기만 합니다.
     """
     authored_books = serializers.SerializerMethodField()
     total_sales_all_time = serializers.SerializerMethodField()
@@ -101,114 +63,47 @@ class AuthorSettlementSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Author
+        list_serializer_class = AuthorSettlementListSerializer
         fields = [
-            'id', 'name', 'contact_number',
+            'id', 'name',
             'authored_books',
             'total_sales_all_time',
             'units_since_last_settlement',
             'annual_performances',
         ]
 
+    def _result(self, obj):
+        results = self.context.get('settlement_results')
+        if results is None or obj.pk not in results:
+            # 단건 직렬화 시에는 이 저자만 계산합니다.
+            results = self.context['settlement_results'] = compute_author_settlements(
+                [obj.pk], self.context.get('start_date'), self.context.get('end_date'), self.context.get('exclude_years', ())
+            )
+        return results[obj.pk]
+
     def get_authored_books(self, obj):
         """
-        저자가 쓴 책들과 해당 책의 기간별 판매량, 판매금액을 포함한 정보를 반환합니다.
+        저자가 쓴 책들과 해당 책의 기간별 판매량, 판매금액 (기간이 없으면 빈 목록)
         """
-        start_date = self.context.get('start_date')
-        end_date = self.context.get('end_date')
-        
-        # start_date와 end_date가 유효한지 확인합니다.
-        if not (start_date and end_date):
-             return [] # 기간이 없으면 빈 목록 반환
-
-        books_data = []
-        author_works = AuthorWork.objects.filter(author=obj).select_related('book')
-        
-        for work in author_works:
-            book = work.book
-            
-            # 필터링된 기간 내 판매량 및 금액을 단일 쿼리로 집계합니다.
-            try:
-                current_period_aggregates = OrderItem.objects.filter(
-                    book=book,
-                    order__order_date__range=[start_date, end_date]
-                ).aggregate(
-                    sales=Sum('quantity'),
-                    revenue=Sum('total_price')
-                )
-            except Exception as e:
-                # 쿼리 실패 시 로깅 또는 기본값 처리
-                print(f"Error aggregating sales for book {book.id}: {e}")
-                current_period_aggregates = {'sales': 0, 'revenue': 0}
-            
-            books_data.append({
-                'book_id': book.id,
-                'title_korean': book.title_korean,
-                'number_of_songs': work.number_of_songs,
-                'current_period_sales': current_period_aggregates.get('sales') or 0,
-                'current_period_revenue': current_period_aggregates.get('revenue') or 0,
-            })
-        
-        return books_data
+        return self._result(obj).authored_books
 
     def get_total_sales_all_time(self, obj):
         """
         저자의 전체 기간 총 누적 판매 권수
         """
-        total = 0
-        # 저자가 쓴 모든 책을 순회하며 전체 판매량을 합산합니다.
-        for work in AuthorWork.objects.filter(author=obj):
-            total += OrderItem.objects.filter(book=work.book).aggregate(
-                total=Sum('quantity')
-            ).get('total', 0) or 0
-        return total
+        return self._result(obj).total_sales_all_time
 
     def get_units_since_last_settlement(self, obj):
         """
         저자의 마지막 정산일 이후 리셋된 총 누적 판매 권수
         """
-        # 해당 저자의 가장 최근 정산 기록을 찾습니다.
-        last_settlement = Settlement.objects.filter(
-            author=obj,
-            is_settled=True # 완료된 정산만 확인
-        ).order_by('-settled_date').first()
-        
-        if not last_settlement or not last_settlement.settled_date:
-            # 정산 기록이 없다면 전체 판매량과 동일합니다.
-            return self.get_total_sales_all_time(obj)
-
-        last_settlement_date = last_settlement.settled_date
-        total_units = 0
-        
-        # 저자가 쓴 모든 책을 순회하며 정산일 이후의 판매량만 합산합니다.
-        for work in AuthorWork.objects.filter(author=obj):
-            total_units += OrderItem.objects.filter(
-                book=work.book,
-                # 정산일보다 엄격하게 '이후'의 판매량만 계산합니다.
-                order__order_date__gt=last_settlement_date
-            ).aggregate(
-                total=Sum('quantity')
-            ).get('total', 0) or 0
-            
-        return total_units
+        return self._result(obj).units_since_last_settlement
 
     def get_annual_performances(self, obj):
         """
-        연간 실적 데이터를 반환합니다.
+        연간 실적 데이터를 반환합니다. (최신 연도 먼저)
         """
-        # 연결된 AnnualPerformance 인스턴스를 필터링하여 가져옵니다.
-        # 연도별 정렬하여 최신 연도가 먼저 오도록 합니다.
-        performances = obj.annualperformance_set.all().order_by('-settlement_year')
-        
-        # 필요한 필드만 직렬화하여 반환합니다. (AnnualPerformance 모델 구조에 따라 달라질 수 있음)
-        return [
-            {
-                'year': p.settlement_year,
-                'total_units': p.total_units,
-                'total_revenue': p.total_revenue,
-                'is_settled': p.is_settled
-            }
-            for p in performances
-        ]
+        return self._result(obj).annual_performances
 
 
 # --- 3. 정산 기록 시리얼라이저 (SettlementListView 사용) ---
@@ -232,22 +127,26 @@ class SettlementUpdateSerializer(serializers.ModelSerializer):
     """
     정산 기록의 is_settled 상태를 업데이트하거나, SettlementListView에서 연도 유효성 검사에 사용됩니다.
     """
+    # [신규] 완료 시 작곡가 저작권료를 곡 수 비율로 나눈 금액으로 고정
+    split_by_songs = serializers.BooleanField(write_only=True, required=False, default=False)
+
     class Meta:
         model = Settlement
-        fields = ['id', 'author', 'settlement_year', 'is_settled', 'settled_date']
+        fields = ['id', 'author', 'settlement_year', 'is_settled', 'settled_date', 'split_by_songs']
         read_only_fields = ['author', 'settlement_year', 'settled_date'] # GET 요청 시 필드
 
     def update(self, instance, validated_data):
         """
         is_settled 상태를 True로 변경 시, settled_date를 현재 시각으로 자동 업데이트합니다.
+        [수정] 완료 시 그 연도의 명세를 고정(SettlementLine)하고, 완료를 취소하면 고정 명세를 지웁니다.
         """
-        if 'is_settled' in validated_data and validated_data['is_settled'] and not instance.is_settled:
-            # False -> True로 변경될 때만 settled_date 업데이트
-            instance.settled_date = date.today() # 정산은 연도/날짜 단위로 처리
-
-        # 기타 필드 업데이트
-        instance.is_settled = validated_data.get('is_settled', instance.is_settled)
-        instance.save()
+        is_settled = validated_data.get('is_settled', instance.is_settled)
+        # 일괄 처리와 같은 경로 (상태가 바뀔 때만 settled_date 기록/해제, 명세 고정/해제)
+        set_settled(
+            Settlement.objects.filter(pk=instance.pk), is_settled,
+            split_by_songs=validated_data.get('split_by_songs', False),
+        )
+        instance.refresh_from_db()
         return instance
 
     def validate_settlement_year(self, value):
@@ -263,3 +162,134 @@ class SettlementUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("미래 연도에 대한 정산 기록을 생성할 수 없습니다.")
             
         return value
+
+
+class SettlementBulkUpdateSerializer(serializers.Serializer):
+    """
+    [신규] 정산 기록 일괄 완료/취소 (SettlementBulkUpdateView 사용)
+    ids 로 기록을 지정하거나, settlement_year (+ author_ids) 로 대상을 고릅니다.
+    """
+    is_settled = serializers.BooleanField()
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    settlement_year = serializers.IntegerField(required=False)
+    author_ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    split_by_songs = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        if 'ids' not in attrs and 'settlement_year' not in attrs:
+            raise serializers.ValidationError('ids 또는 settlement_year 중 하나는 입력해야 합니다.')
+        return attrs
+
+    def get_queryset(self):
+        """검증된 조건에 해당하는 정산 기록 쿼리셋"""
+        queryset = Settlement.objects.all()
+        data = self.validated_data
+        if 'ids' in data:
+            queryset = queryset.filter(pk__in=data['ids'])
+        if 'settlement_year' in data:
+            queryset = queryset.filter(settlement_year=data['settlement_year'])
+        if 'author_ids' in data:
+            queryset = queryset.filter(author_id__in=data['author_ids'])
+        return queryset
+
+
+# --- 5. 작곡가 저작권료 시리얼라이저 (ComposerRoyaltyListView 사용) ---
+
+class ComposerRoyaltyListSerializer(serializers.ListSerializer):
+    """
+    [신규] 목록(한 페이지)의 작곡가 전체를 저작권료 계산 엔진으로 한 번에 계산해 context 에 넣습니다.
+    """
+    def to_representation(self, data):
+        composers = list(data.all() if hasattr(data, 'all') else data)
+        self.context['royalty_results'] = compute_composer_royalties(
+            [composer.pk for composer in composers],
+            self.context.get('start_date'),
+            self.context.get('end_date'),
+            split_by_songs=self.context.get('split_by_songs', False),
+            exclude_years=self.context.get('exclude_years', ()),
+        )
+        return super().to_representation(composers)
+
+
+class ComposerRoyaltySerializer(serializers.ModelSerializer):
+    """
+    작곡가별 저작권료 명세 (책별 판매 금액 x 저작권료율, 선택 시 곡 수 비율로 나눔)
+    값은 reimbursement.royalty.compute_composer_royalties 가 미리 계산합니다.
+    """
+    total_revenue = serializers.SerializerMethodField()
+    total_royalty = serializers.SerializerMethodField()
+    books = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Composer
+        list_serializer_class = ComposerRoyaltyListSerializer
+        fields = ['id', 'name', 'total_revenue', 'total_royalty', 'books']
+
+    def _result(self, obj):
+        results = self.context.get('royalty_results')
+        if results is None or obj.pk not in results:
+            results = self.context['royalty_results'] = compute_composer_royalties(
+                [obj.pk],
+                self.context.get('start_date'),
+                self.context.get('end_date'),
+                split_by_songs=self.context.get('split_by_songs', False),
+                exclude_years=self.context.get('exclude_years', ()),
+            )
+        return results[obj.pk]
+
+    def get_total_revenue(self, obj):
+        return self._result(obj)['total_revenue']
+
+    def get_total_royalty(self, obj):
+        """원 단위 반올림 (책별 정확한 금액을 합한 뒤 한 번만 반올림)"""
+        return str(self._result(obj)['total_royalty'])
+
+    def get_books(self, obj):
+        return [
+            {
+                **line,
+                'royalty_percentage': str(line['royalty_percentage']),
+                'song_share': str(line['song_share']),
+                'royalty': str(line['royalty']),
+            }
+            for line in self._result(obj)['books']
+        ]
+
+
+# --- 6. 정산 명세 시리얼라이저 (SettlementStatementView 사용) ---
+
+class SettlementLineSerializer(serializers.ModelSerializer):
+    composer_name = serializers.CharField(source='composer.name', read_only=True, default=None)
+
+    class Meta:
+        model = SettlementLine
+        fields = [
+            'book', 'title_korean', 'composer', 'composer_name', 'units', 'revenue', 'royalty_percentage', 'royalty',
+            'number_of_songs', 'total_songs', 'split_by_songs',
+        ]
+
+
+class SettlementStatementSerializer(serializers.Serializer):
+    """
+    정산 기록 1건의 명세 (reimbursement.snapshot.settlement_statement 결과)
+    is_snapshot 이 True 이면 정산 완료 시점에 고정된 값입니다.
+    """
+    settlement = SettlementListSerializer()
+    is_snapshot = serializers.BooleanField()
+    settled_at = serializers.DateTimeField(allow_null=True)
+    total_units = serializers.IntegerField()
+    total_revenue = serializers.IntegerField()
+    total_royalty = serializers.DecimalField(max_digits=14, decimal_places=0)
+    lines = SettlementLineSerializer(many=True)
+
+
+# --- 7. 판매 추이 조회 조건 (SalesTimeSeriesView 사용) ---
+
+class SalesTimeSeriesQuerySerializer(serializers.Serializer):
+    """
+    판매 추이 조회 조건 (쿼리 파라미터)
+    관리자는 payee_type, payee_id 로 수령인을 지정하고, 저자/작곡가 본인은 생략하면 자신의 추이를 봅니다.
+    """
+    payee_type = serializers.ChoiceField(choices=[AUTHOR, COMPOSER], required=False)
+    payee_id = serializers.IntegerField(required=False)
+    interval = serializers.ChoiceField(choices=[MONTH, WEEK], required=False, default=MONTH)
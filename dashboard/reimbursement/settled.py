@@ -0,0 +1,65 @@
+"""
+보고서용 정산 완료 연도 조회
+
+정산이 끝난 연도의 판매/저작권료는 완료 시점에 고정한 명세(SettlementLine)에서 읽고,
+그 외 기간만 일별 판매 집계(DailyBookSales)에서 계산합니다. (지난 주문이 수정되어도 지급한 금액과 보고서가 같도록)
+- covered_years        : 조회 기간이 통째로 포함하는 연도 (고정 명세는 연 단위이므로 일부만 걸친 연도는 현재 집계로 계산)
+- frozen_author_sales  : 저자별 고정 판매 행
+- frozen_composer_lines: 작곡가별 고정 저작권료 행
+책별 보고서(filters.annotate_book_sales)는 같은 규칙을 SQL 로 적용합니다.
+"""
+import datetime
+from collections import defaultdict
+
+from .models import SettlementLine
+
+
+def covered_years(start_date=None, end_date=None):
+    """
+    start_date ~ end_date 가 1월 1일 ~ 12월 31일을 모두 포함하는 연도 목록.
+    기간이 없으면(전체 기간) None 을 반환합니다. (모든 연도)
+    """
+    if not (start_date and end_date):
+        return None
+    first = start_date.year if start_date <= datetime.date(start_date.year, 1, 1) else start_date.year + 1
+    last = end_date.year if end_date >= datetime.date(end_date.year, 12, 31) else end_date.year - 1
+    return list(range(first, last + 1))
+
+
+def is_covered(year, covered):
+    return covered is None or year in covered
+
+
+def settled_lines():
+    """정산 완료된 기록의 고정 명세 행"""
+    return SettlementLine.objects.filter(settlement__is_settled=True)
+
+
+def frozen_author_sales(author_ids):
+    """
+    저자별 고정 판매 행 (1 쿼리)
+    반환값: {(author_id, book_id): {연도: (판매 권수, 판매 금액)}}
+    """
+    frozen = defaultdict(dict)
+    for author_id, book_id, year, units, revenue in (
+        settled_lines().filter(settlement__author_id__in=author_ids, composer__isnull=True)
+        .order_by('pk')
+        .values_list('settlement__author_id', 'book_id', 'settlement__settlement_year', 'units', 'revenue')
+    ):
+        frozen[(author_id, book_id)].setdefault(year, (units, revenue))
+    return frozen
+
+
+def frozen_composer_lines(composer_ids):
+    """
+    작곡가별 고정 저작권료 행 (1 쿼리, 같은 (작곡가, 책, 연도)가 여러 번 고정되어 있으면 먼저 고정된 행)
+    반환값: {(composer_id, book_id): {연도: SettlementLine}}
+    """
+    frozen = defaultdict(dict)
+    for line in (
+        settled_lines().filter(composer_id__in=composer_ids)
+        .select_related('settlement')
+        .order_by('pk')
+    ):
+        frozen[(line.composer_id, line.book_id)].setdefault(line.settlement.settlement_year, line)
+    return frozen
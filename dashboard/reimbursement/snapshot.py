@@ -0,0 +1,191 @@
+"""
+정산 명세 고정(snapshot)
+
+정산 기록(저자 x 연도)이 완료되면 그 연도의 책별 판매와 작곡가 저작권료를 SettlementLine 으로 고정합니다.
+- 완료된 정산의 명세는 고정된 행을 그대로 읽고, 진행 중인 정산만 일별 판매 집계에서 계산합니다.
+- 여러 정산 기록을 한 번에 처리할 수 있도록 모든 조회를 묶어서 합니다. (정산 수와 관계없이 쿼리 4개)
+- 저자 판매 행에는 고정 시점의 책 누적 판매 권수(book_units_counter)도 남겨 책별 '마지막 정산 이후 판매량'의 기준값으로 씁니다.
+- 작곡가 저작권료 행은 (작곡가, 책, 연도)마다 한 번만 고정합니다. 공저 책이면 공저자 중 한 명의 정산 기록에만 붙습니다.
+"""
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+from fractions import Fraction
+
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+
+from book.models import Book, ComposerWork
+from sales.leaderboard import ALL
+from sales.models import BookPeriodSales, DailyBookSales
+from .models import Settlement, SettlementLine
+from .royalty import to_won
+
+
+def _composer_line_owners(settlements, book_ids, years):
+    """
+    작곡가 행을 가질 정산 기록을 고릅니다. (공저 책의 저작권료가 저자 수만큼 중복되지 않도록)
+    - 다른 정산 기록에 이미 고정된 (연도, 책, 작곡가)는 건너뜁니다. -> frozen 집합
+    - 그 외에는 (연도, 책)마다 '진행 중이거나 이번에 처리하는' 정산 기록을 가진 공저자 중 id 가 가장 작은 저자가 가집니다.
+    반환값: (frozen {(연도, 책, 작곡가)}, owners {(연도, 책): author_id})
+    """
+    batch_ids = [settlement.pk for settlement in settlements]
+    frozen = set(
+        SettlementLine.objects.filter(
+            composer__isnull=False,
+            book_id__in=book_ids,
+            settlement__settlement_year__in=years,
+            settlement__is_settled=True,
+        )
+        .exclude(settlement_id__in=batch_ids)
+        .values_list('settlement__settlement_year', 'book_id', 'composer_id')
+    )
+
+    authors_by_book = defaultdict(set)
+    for book_id, author_id in Book.authors.through.objects.filter(book_id__in=book_ids).values_list('book_id', 'author_id'):
+        authors_by_book[book_id].add(author_id)
+    candidates = {(settlement.author_id, settlement.settlement_year) for settlement in settlements}
+    candidates.update(
+        Settlement.objects.filter(
+            Q(is_settled=False) | Q(pk__in=batch_ids),
+            author_id__in={author_id for authors in authors_by_book.values() for author_id in authors},
+            settlement_year__in=years,
+        ).values_list('author_id', 'settlement_year')
+    )
+
+    owners = {}
+    for book_id, authors in authors_by_book.items():
+        for year in years:
+            owner = min((author_id for author_id in authors if (author_id, year) in candidates), default=None)
+            if owner is not None:
+                owners[(year, book_id)] = owner
+    return frozen, owners
+
+
+def live_settlement_lines(settlements, split_by_songs=False):
+    """
+    정산 기록들의 명세를 일별 판매 집계에서 계산합니다. (저장하지 않은 SettlementLine 목록)
+    - split_by_songs=True 이면 작곡가 저작권료를 책 전체 곡 수 중 내 곡 수 비율로 나눕니다. (royalty.compute_composer_royalties 와 같은 계산)
+    - 작곡가 행은 (작곡가, 책, 연도)마다 한 정산 기록에만 만듭니다. (_composer_line_owners)
+    반환값: {settlement_id: [SettlementLine, ...]}
+    """
+    settlements = list(settlements)
+    lines = {settlement.pk: [] for settlement in settlements}
+    if not settlements:
+        return lines
+
+    # 1. 저자 -> 책
+    books_by_author = defaultdict(list)
+    titles = {}
+    for author_id, book_id, title in (
+        Book.authors.through.objects.filter(author_id__in={s.author_id for s in settlements})
+        .order_by('book_id')
+        .values_list('author_id', 'book_id', 'book__title_korean')
+    ):
+        books_by_author[author_id].append(book_id)
+        titles[book_id] = title
+
+    # 2. (연도, 책)별 판매
+    years = {settlement.settlement_year for settlement in settlements}
+    sales = {
+        (row['year'], row['book_id']): (row['units'], row['revenue'])
+        for row in (
+            DailyBookSales.objects.filter(
+                book_id__in=titles,
+                date__gte=datetime.date(min(years), 1, 1),
+                date__lte=datetime.date(max(years), 12, 31),
+            )
+            .annotate(year=ExtractYear('date'))
+            .values('year', 'book_id')
+            .annotate(units=Sum('units'), revenue=Sum('revenue'))
+            .order_by()
+        )
+    }
+
+    # 3. 책별 작곡가 작업과 책 전체 곡 수
+    works_by_book = defaultdict(list)
+    total_songs = defaultdict(int)
+    for work in ComposerWork.objects.filter(book_id__in=titles).select_related('composer').order_by('book_id', 'composer_id'):
+        works_by_book[work.book_id].append(work)
+        total_songs[work.book_id] += work.number_of_songs
+
+    # 4. 책 누적 판매 권수 (전체 기간 합계)
+    book_counters = dict(BookPeriodSales.objects.filter(period=ALL, book_id__in=titles).values_list('book_id', 'units'))
+
+    # 5. 작곡가 행을 가질 정산 기록
+    frozen, owners = _composer_line_owners(settlements, list(titles), years)
+
+    for settlement in settlements:
+        year = settlement.settlement_year
+        for book_id in books_by_author.get(settlement.author_id, []):
+            units, revenue = sales.get((year, book_id), (0, 0))
+            common = {'settlement': settlement, 'book_id': book_id, 'title_korean': titles[book_id], 'units': units, 'revenue': revenue}
+            lines[settlement.pk].append(SettlementLine(book_units_counter=book_counters.get(book_id, 0), **common))
+            if owners.get((year, book_id)) != settlement.author_id:
+                continue
+            for work in works_by_book.get(book_id, []):
+                if (year, book_id, work.composer_id) in frozen:
+                    continue
+                share = Fraction(1)
+                if split_by_songs and total_songs[book_id]:
+                    share = Fraction(work.number_of_songs, total_songs[book_id])
+                lines[settlement.pk].append(SettlementLine(
+                    composer=work.composer,
+                    royalty_percentage=work.royalty_percentage,
+                    royalty=to_won(Fraction(revenue) * Fraction(work.royalty_percentage) / 100 * share),
+                    number_of_songs=work.number_of_songs,
+                    total_songs=total_songs[book_id],
+                    split_by_songs=split_by_songs,
+                    **common,
+                ))
+    return lines
+
+
+def snapshot_settlements(settlements, settled_at=None, split_by_songs=False):
+    """
+    정산 기록들의 현재 명세를 고정합니다. (이미 고정된 명세는 새로 만듭니다)
+    split_by_songs 이면 작곡가 저작권료를 곡 수 비율로 나눈 금액으로 고정합니다.
+    반환값: 생성한 명세 행 수
+    """
+    settled_at = settled_at or timezone.now()
+    lines = live_settlement_lines(settlements, split_by_songs)
+    rows = [line for settlement_lines in lines.values() for line in settlement_lines]
+    for row in rows:
+        row.settled_at = settled_at
+
+    with transaction.atomic():
+        SettlementLine.objects.filter(settlement_id__in=lines.keys()).delete()
+        SettlementLine.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def release_snapshots(settlements):
+    """정산 완료를 취소한 기록의 고정 명세를 지웁니다. (다시 진행 중 정산으로 계산)"""
+    return SettlementLine.objects.filter(settlement__in=settlements).delete()[0]
+
+
+def settlement_statement(settlement, split_by_songs=False):
+    """
+    정산 기록 1건의 명세.
+    완료된 정산은 고정된 명세를, 진행 중인 정산은 현재 판매 집계로 계산한 명세를 반환합니다.
+    split_by_songs 는 진행 중인 정산에만 적용됩니다. (고정 명세는 고정할 때의 방식 그대로)
+    """
+    is_snapshot = settlement.is_settled and settlement.lines.exists()
+    if is_snapshot:
+        lines = list(settlement.lines.select_related('composer').order_by('book_id', 'composer_id'))
+    else:
+        lines = live_settlement_lines([settlement], split_by_songs)[settlement.pk]
+
+    book_lines = [line for line in lines if line.composer_id is None]
+    royalty_lines = [line for line in lines if line.composer_id is not None]
+    return {
+        'settlement': settlement,
+        'is_snapshot': is_snapshot,
+        'settled_at': lines[0].settled_at if is_snapshot and lines else None,
+        'total_units': sum(line.units for line in book_lines),
+        'total_revenue': sum(line.revenue for line in book_lines),
+        'total_royalty': sum((line.royalty for line in royalty_lines), Decimal('0')),
+        'lines': lines,
+    }
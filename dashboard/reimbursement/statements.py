@@ -0,0 +1,237 @@
+"""
+연말 정산 명세서 일괄 생성 (저자 / 작곡가)
+
+1. collect_payloads : 한 해의 모든 수령인 명세 데이터를 미리 묶어서 불러옵니다. (수령인 수와 관계없이 쿼리 수 일정)
+   - 저자   : 정산 기록별 명세 (완료된 정산은 고정 명세, 진행 중인 정산은 현재 판매 집계)
+   - 작곡가 : 저작권료 엔진(royalty.compute_composer_royalties) 결과
+2. render_payload   : 수령인 1명의 명세서 파일(HTML, 선택 시 XLSX/PDF)을 씁니다. 프로세스 풀에서 실행되며 DB 를 쓰지 않습니다.
+3. generate_statements : 출력 폴더(STATEMENT_ROOT/연도/생성시각)에 명세서와 manifest.json 을 만듭니다.
+   (generate_statements 명령, reimbursement.generate_statements 작업)
+XLSX 는 openpyxl(requirements.txt), PDF 는 weasyprint(requirements-pdf.txt, 시스템 라이브러리 필요)가 설치되어 있어야 합니다.
+(HTML 은 인쇄용 스타일을 포함)
+"""
+import datetime
+import hashlib
+import json
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from book.models import Composer
+from .models import Settlement, SettlementLine
+from .royalty import compute_composer_royalties
+from .snapshot import live_settlement_lines
+
+STATEMENT_FORMATS = ['html', 'xlsx', 'pdf']
+AUTHOR = 'author'
+COMPOSER = 'composer'
+
+
+def check_formats(formats):
+    """선택한 형식에 필요한 패키지가 있는지 미리 확인합니다. (작업 도중 실패하지 않도록)"""
+    requirements = {'xlsx': ('openpyxl', 'requirements.txt'), 'pdf': ('weasyprint', 'requirements-pdf.txt')}
+    for fmt in formats:
+        if fmt not in STATEMENT_FORMATS:
+            raise ImproperlyConfigured(f'지원하지 않는 형식입니다: {fmt}')
+        if fmt in requirements:
+            package, requirements_file = requirements[fmt]
+            try:
+                __import__(package)
+            except ImportError:
+                raise ImproperlyConfigured(
+                    f'{fmt.upper()} 명세서를 만들려면 {package} 을 설치해야 합니다. (pip install -r {requirements_file})'
+                )
+
+
+def _author_payloads(year):
+    """정산 기록(저자 x 연도)별 명세 데이터"""
+    settlements = list(Settlement.objects.filter(settlement_year=year).select_related('author').order_by('author__name', 'pk'))
+
+    # 완료된 정산의 고정 명세 (1 쿼리), 고정 명세가 없는 기록은 현재 판매 집계로 계산 (쿼리 4개)
+    frozen = defaultdict(list)
+    for line in SettlementLine.objects.filter(
+        settlement__in=[settlement.pk for settlement in settlements if settlement.is_settled],
+        composer__isnull=True,
+    ).order_by('book_id'):
+        frozen[line.settlement_id].append(line)
+    live = live_settlement_lines([settlement for settlement in settlements if settlement.pk not in frozen])
+
+    payloads = []
+    for settlement in settlements:
+        is_snapshot = settlement.pk in frozen
+        lines = frozen[settlement.pk] if is_snapshot else [line for line in live[settlement.pk] if line.composer_id is None]
+        payloads.append({
+            'kind': AUTHOR,
+            'payee_id': settlement.author_id,
+            'name': settlement.author.name,
+            'year': year,
+            'is_settled': settlement.is_settled,
+            'is_snapshot': is_snapshot,
+            'settled_date': settlement.settled_date.isoformat() if settlement.settled_date else None,
+            'lines': [
+                {'title_korean': line.title_korean, 'units': line.units, 'revenue': line.revenue}
+                for line in lines
+            ],
+            'total_units': sum(line.units for line in lines),
+            'total_revenue': sum(line.revenue for line in lines),
+        })
+    return payloads
+
+
+def _composer_payloads(year, split_by_songs=False):
+    """작곡가별 저작권료 명세 데이터 (작업한 책이 있는 작곡가만)"""
+    composers = list(Composer.objects.filter(composerwork__isnull=False).distinct().order_by('name', 'pk'))
+    results = compute_composer_royalties(
+        [composer.pk for composer in composers],
+        datetime.date(year, 1, 1),
+        datetime.date(year, 12, 31),
+        split_by_songs=split_by_songs,
+    )
+    return [
+        {
+            'kind': COMPOSER,
+            'payee_id': composer.pk,
+            'name': composer.name,
+            'year': year,
+            'split_by_songs': split_by_songs,
+            'lines': results[composer.pk]['books'],
+            'total_revenue': results[composer.pk]['total_revenue'],
+            'total_royalty': results[composer.pk]['total_royalty'],
+        }
+        for composer in composers
+    ]
+
+
+def collect_payloads(year, split_by_songs=False):
+    """한 해의 저자/작곡가 명세 데이터 목록 (프로세스로 넘길 수 있도록 기본 자료형만 사용)"""
+    return _author_payloads(year) + _composer_payloads(year, split_by_songs)
+
+
+def _sheet_rows(payload):
+    """XLSX 시트에 쓸 행 (머리글 포함)"""
+    if payload['kind'] == AUTHOR:
+        rows = [['책 제목', '판매 권수', '판매 금액']]
+        rows += [[line['title_korean'], line['units'], line['revenue']] for line in payload['lines']]
+        rows.append(['합계', payload['total_units'], payload['total_revenue']])
+    else:
+        rows = [['책 제목', '판매 권수', '판매 금액', '저작권료율(%)', '곡 수 비율(%)', '저작권료']]
+        rows += [
+            [line['title_korean'], line['units'], line['revenue'],
+             float(line['royalty_percentage']), float(line['song_share']), int(line['royalty'])]
+            for line in payload['lines']
+        ]
+        rows.append(['합계', '', payload['total_revenue'], '', '', int(payload['total_royalty'])])
+    return rows
+
+
+def _write_xlsx(path, payload):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(f"{payload['year']}년 명세")
+    for row in _sheet_rows(payload):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def _init_worker():
+    # spawn 방식 플랫폼에서는 자식 프로세스가 설정을 다시 불러와야 템플릿을 렌더링할 수 있습니다.
+    django.setup()
+
+
+def render_payload(payload, output_dir, formats, generated_at):
+    """
+    [프로세스 풀에서 실행] 수령인 1명의 명세서를 형식별로 씁니다.
+    반환값: manifest 항목 (실패하면 error 항목을 담아 반환하여 다른 수령인 처리는 계속됩니다)
+    """
+    folder = 'authors' if payload['kind'] == AUTHOR else 'composers'
+    base = Path(folder) / f"{payload['kind']}-{payload['payee_id']}"
+    entry = {
+        'kind': payload['kind'],
+        'payee_id': payload['payee_id'],
+        'name': payload['name'],
+        'total_revenue': payload['total_revenue'],
+        'total_royalty': str(payload['total_royalty']) if payload['kind'] == COMPOSER else None,
+        'files': {},
+    }
+    try:
+        html = render_to_string('reimbursement/statement.html', {**payload, 'generated_at': generated_at})
+        for fmt in formats:
+            relative = base.with_suffix(f'.{fmt}')
+            path = Path(output_dir) / relative
+            if fmt == 'html':
+                path.write_text(html, encoding='utf-8')
+            elif fmt == 'xlsx':
+                _write_xlsx(path, payload)
+            elif fmt == 'pdf':
+                from weasyprint import HTML
+                HTML(string=html).write_pdf(path)
+            entry['files'][fmt] = {
+                'path': relative.as_posix(),
+                'sha256': hashlib.sha256(path.read_bytes()).hexdigest(),
+            }
+    except Exception as exc:  # 수령인 1명의 실패가 전체 생성을 멈추지 않도록 기록만 합니다.
+        entry['error'] = f'{type(exc).__name__}: {exc}'
+    return entry
+
+
+def generate_statements(year, formats=('html',), workers=4, split_by_songs=False, output_root=None, job=None):
+    """
+    한 해의 모든 수령인 명세서를 만들고 manifest.json 을 씁니다.
+    데이터는 처음에 한 번에 불러오고, 파일 렌더링만 프로세스 풀로 나눠 실행합니다.
+    반환값: {'output_dir', 'payee_count', 'error_count'}
+    """
+    formats = list(dict.fromkeys(formats))
+    check_formats(formats)
+
+    generated_at = timezone.localtime()
+    output_dir = Path(output_root or settings.STATEMENT_ROOT) / str(year) / generated_at.strftime('%Y%m%d-%H%M%S')
+    for folder in ('authors', 'composers'):
+        (output_dir / folder).mkdir(parents=True, exist_ok=True)
+
+    payloads = collect_payloads(year, split_by_songs)
+    total = len(payloads)
+    if job:
+        job.update_progress(0, total, f'{year}년 명세서 {total}건 생성 중')
+
+    # fork 전에 부모의 DB 연결을 닫아 자식 프로세스와 공유되지 않도록 합니다. (자식은 DB 를 쓰지 않음)
+    connections.close_all()
+    entries = []
+    workers = max(1, workers)
+    chunksize = max(1, total // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        results = executor.map(
+            render_payload,
+            payloads,
+            [str(output_dir)] * total,
+            [formats] * total,
+            [generated_at] * total,
+            chunksize=chunksize,
+        )
+        for index, entry in enumerate(results, start=1):
+            entries.append(entry)
+            if job and (index % 100 == 0 or index == total):
+                job.update_progress(index)
+
+    errors = [entry for entry in entries if 'error' in entry]
+    manifest = {
+        'year': year,
+        'generated_at': generated_at.isoformat(),
+        'formats': formats,
+        'split_by_songs': split_by_songs,
+        'payee_count': len(entries),
+        'error_count': len(errors),
+        'payees': entries,
+    }
+    (output_dir / 'manifest.json').write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2, default=str),
+        encoding='utf-8',
+    )
+    return {'output_dir': str(output_dir), 'payee_count': len(entries), 'error_count': len(errors)}
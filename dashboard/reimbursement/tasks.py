@@ -0,0 +1,48 @@
+from jobs.queue import register_task
+from .bulk import generate_year_settlements
+from .performance import APPLY_TASK, apply_performance_deltas, rebuild_year
+from .statements import generate_statements
+
+
+@register_task('reimbursement.generate_settlements')
+def generate_settlements(job, settlement_year):
+    """
+    [백그라운드 작업] 특정 연도에 대해 모든 Author의 정산 기록을 (미완료 상태로) 생성합니다.
+    기존 기록은 is_settled 상태를 유지합니다.
+    [수정] 저자별 get_or_create 대신, 기록이 없는 저자만 골라 bulk_create 한 번으로 만듭니다.
+    """
+    job.update_progress(0, 1, f'{settlement_year}년 정산 기록 생성 중')
+    created_count = generate_year_settlements(settlement_year)
+    job.update_progress(1, message=f'{created_count}건 생성 완료')
+    return {'settlement_year': settlement_year, 'created_count': created_count}
+
+
+@register_task(APPLY_TASK)
+def apply_performance_deltas_task(job):
+    """
+    [백그라운드 작업] 쌓인 판매 증감(PerformanceDelta)을 저자별 연간 실적에 반영합니다.
+    """
+    return {'applied_count': apply_performance_deltas(job=job)}
+
+
+@register_task('reimbursement.backfill_annual_performance')
+def backfill_annual_performance_task(job, year):
+    """
+    [백그라운드 작업] 한 해의 연간 실적을 일별 판매 집계에서 다시 계산 (backfill_annual_performance --enqueue 가 연도별로 적재)
+    """
+    return {'year': year, 'row_count': rebuild_year(year)}
+
+
+@register_task('reimbursement.generate_statements')
+def generate_statements_task(job, year, formats=None, workers=4, split_by_songs=False, output_root=None):
+    """
+    [백그라운드 작업] 한 해의 저자/작곡가 정산 명세서 일괄 생성 (generate_statements --enqueue)
+    """
+    return generate_statements(
+        year,
+        formats=formats or ['html'],
+        workers=workers,
+        split_by_songs=split_by_songs,
+        output_root=output_root,
+        job=job,
+    )
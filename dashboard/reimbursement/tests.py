@@ -1,3 +1,51 @@
-from django.test import TestCase
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import CustomUser
+from book.models import Author
+from config.versioned_cache import VERSION_CACHE_ALIAS, _version_key
+from .cache import REIMBURSEMENT_CACHE_NAMESPACE
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-default'},
+    VERSION_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-versions'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CachedListTests(TestCase):
+    """정산 목록 응답 캐시 (CachedListMixin)"""
+
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            CustomUser.objects.create_user('staff', 'password', contact_number='010-1234-5678', is_staff=True)
+        )
+        self.author = Author.objects.create(name='저자')
+
+    def author_names(self):
+        response = self.client.get(reverse('author-settlement'))
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.data['results']]
+
+    def test_author_change_invalidates_cached_list(self):
+        self.assertEqual(self.author_names(), ['저자'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.name = '새 저자'
+            self.author.save()
+
+        self.assertEqual(self.author_names(), ['새 저자'])
+
+    def test_culled_version_key_does_not_serve_old_response(self):
+        self.assertEqual(self.author_names(), ['저자'])
+
+        # 신호 없는 변경 + 버전 키 정리 : 예전 버전의 응답이 다시 조회되면 안 됩니다.
+        Author.objects.filter(pk=self.author.pk).update(name='새 저자')
+        caches[VERSION_CACHE_ALIAS].delete(_version_key(REIMBURSEMENT_CACHE_NAMESPACE))
+
+        self.assertEqual(self.author_names(), ['새 저자'])
@@ -0,0 +1,107 @@
+"""
+저자/작곡가 책별 판매 추이 (월별 / 주별)
+
+일별 판매 집계(DailyBookSales)를 (구간 시작일, 책)으로 묶은 쿼리 1개로 불러온 뒤,
+구간 시작일 -> 위치 인덱스 dict 로 책별 배열에 채웁니다. 판매가 없는 구간은 0 으로 채우고 누적 합계도 함께 만듭니다.
+"""
+import datetime
+from itertools import accumulate
+
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from book.models import Book, ComposerWork
+from sales.models import DailyBookSales
+
+AUTHOR = 'author'
+COMPOSER = 'composer'
+MONTH = 'month'
+WEEK = 'week'
+INTERVAL_FUNCTIONS = {MONTH: TruncMonth, WEEK: TruncWeek}
+
+
+def bucket_start(day, interval):
+    """날짜가 속한 구간의 시작일 (월: 1일, 주: 월요일)"""
+    if interval == MONTH:
+        return day.replace(day=1)
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def bucket_starts(first, last, interval):
+    """first ~ last 구간 시작일 목록 (양끝 포함, 오래된 순)"""
+    starts = []
+    current = bucket_start(first, interval)
+    while current <= last:
+        starts.append(current)
+        if interval == MONTH:
+            current = datetime.date(current.year + current.month // 12, current.month % 12 + 1, 1)
+        else:
+            current += datetime.timedelta(days=7)
+    return starts
+
+
+def payee_books(kind, payee_id):
+    """수령인의 책 [(book_id, 제목), ...] (1 쿼리)"""
+    if kind == AUTHOR:
+        rows = Book.authors.through.objects.filter(author_id=payee_id).values_list('book_id', 'book__title_korean')
+    else:
+        rows = ComposerWork.objects.filter(composer_id=payee_id).values_list('book_id', 'book__title_korean')
+    return sorted(set(rows))
+
+
+def sales_timeseries(books, start_date=None, end_date=None, interval=MONTH, exclude_years=()):
+    """
+    책들의 구간별 판매 권수/금액과 누적 값.
+    start_date 가 없으면 첫 판매 구간부터, end_date 가 없으면 오늘까지입니다. (누적 값은 조회 기간 안에서의 누적)
+    exclude_years(보관 연도를 뺀 조회) 연도의 판매는 0 으로 봅니다.
+    """
+    end_date = end_date or timezone.localdate()
+    titles = dict(books)
+
+    qs = DailyBookSales.objects.filter(book_id__in=titles, date__lte=end_date).exclude(date__year__in=exclude_years)
+    if start_date:
+        qs = qs.filter(date__gte=start_date)
+    rows = list(
+        qs.annotate(bucket=INTERVAL_FUNCTIONS[interval]('date'))
+        .values('bucket', 'book_id')
+        .annotate(units=Sum('units'), revenue=Sum('revenue'))
+        .order_by()
+    )
+
+    first = start_date or min((row['bucket'] for row in rows), default=end_date)
+    starts = bucket_starts(first, end_date, interval)
+    index = {start: position for position, start in enumerate(starts)}
+
+    units = {book_id: [0] * len(starts) for book_id in titles}
+    revenue = {book_id: [0] * len(starts) for book_id in titles}
+    for row in rows:
+        position = index[row['bucket']]
+        units[row['book_id']][position] += row['units']
+        revenue[row['book_id']][position] += row['revenue']
+
+    total_units = [sum(column) for column in zip(*units.values())] if titles else [0] * len(starts)
+    total_revenue = [sum(column) for column in zip(*revenue.values())] if titles else [0] * len(starts)
+    return {
+        'interval': interval,
+        'start_date': starts[0] if starts else None,
+        'end_date': end_date,
+        'buckets': starts,
+        'books': [
+            {
+                'book_id': book_id,
+                'title_korean': title,
+                'units': units[book_id],
+                'revenue': revenue[book_id],
+                'cumulative_units': list(accumulate(units[book_id])),
+                'cumulative_revenue': list(accumulate(revenue[book_id])),
+            }
+            for book_id, title in books
+        ],
+        'totals': {
+            'units': total_units,
+            'revenue': total_revenue,
+            'cumulative_units': list(accumulate(total_units)),
+            'cumulative_revenue': list(accumulate(total_revenue)),
+        },
+    }
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import BookSalesListView, AuthorSettlementListView, SettlementListView, SettlementDetailView # 뷰 임포트 추가
+from .views import BookSalesListView, AuthorSettlementListView, SettlementListView, SettlementDetailView, SettlementBulkUpdateView, SettlementStatementView, ComposerRoyaltyListView, SalesTimeSeriesView # 뷰 임포트 추가
 
 urlpatterns = [
     # 1. 책별 판매 집계 조회 (관리자 전용)
@@ -11,6 +11,18 @@ urlpatterns = [
     # 3. 정산 기록 목록 조회 및 연도별 일괄 생성 (관리자 전용)
     path('settlements/', SettlementListView.as_view(), name='settlement-list-create'),
     
+    # 3-1. 정산 기록 일괄 완료/취소 (관리자 전용)
+    path('settlements/bulk/', SettlementBulkUpdateView.as_view(), name='settlement-bulk-update'),
+
     # 4. 특정 정산 기록 상태 업데이트 (관리자 전용)
     path('settlements/<int:pk>/', SettlementDetailView.as_view(), name='settlement-detail-update'),
-]
\ No newline at end of file
+
+    # 4-1. 정산 명세 (완료된 정산은 고정된 명세)
+    path('settlements/<int:pk>/statement/', SettlementStatementView.as_view(), name='settlement-statement'),
+
+    # 5. 작곡가별 저작권료 명세 (본인/관리자)
+    path('composers/royalties/', ComposerRoyaltyListView.as_view(), name='composer-royalty-list'),
+
+    # 6. 저자/작곡가 책별 판매 추이 (본인/관리자)
+    path('timeseries/', SalesTimeSeriesView.as_view(), name='sales-timeseries'),
+]
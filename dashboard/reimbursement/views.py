@@ -1,55 +1,87 @@
 from datetime import date
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.filters import OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
 from django.utils import timezone
-from book.models import Book, Author
+from django.urls import reverse
+from book.models import Book, Author, Composer
+from jobs.queue import enqueue
+from order.archive import archived_years, include_archived
 from .serializers import (
     BookSalesSerializer, 
     AuthorSettlementSerializer, 
+    ComposerRoyaltySerializer,
     SettlementListSerializer,  # <--- 이 부분이 정확히 임포트되도록 수정했습니다.
-    SettlementUpdateSerializer
+    SettlementUpdateSerializer,
+    SettlementStatementSerializer,
+    SettlementBulkUpdateSerializer,
+    SalesTimeSeriesQuerySerializer,
 )
+from .timeseries import AUTHOR, COMPOSER, payee_books, sales_timeseries
+from .bulk import set_settled
+from .cache import CachedListMixin
+from .snapshot import settlement_statement
+from .filters import BOOK_SALES_METRICS, BookSalesFilter, annotate_book_sales
 from .permissions import IsAdminUser
 from .models import Settlement # Settlement 모델 임포트
 
 
+def parse_period(query_params):
+    """start_date, end_date (YYYY-MM-DD) 쿼리 파라미터를 date 로 변환합니다. 형식이 잘못되면 400"""
+    dates = []
+    for name in ('start_date', 'end_date'):
+        value = query_params.get(name)
+        try:
+            dates.append(date.fromisoformat(value) if value else None)
+        except ValueError:
+            raise ValidationError({name: '날짜는 YYYY-MM-DD 형식이어야 합니다.'})
+    return tuple(dates)
+
+
+def excluded_years(query_params):
+    """
+    집계에서 뺄 연도 목록.
+    보관된 연도도 기본으로 합계에 포함하며, include_archived=0 일 때만 보관된 연도를 뺍니다.
+    """
+    return () if include_archived(query_params, default=True) else archived_years()
+
+
 # --- 1. 책별 집계 뷰 (관리자 전용) ---
-class BookSalesListView(generics.ListAPIView):
+class BookSalesListView(CachedListMixin, generics.ListAPIView):
     """
     책별 판매 집계 목록을 조회하는 뷰입니다.
     - 관리자(is_staff=True)만 전체 목록 접근 가능합니다.
+    - [수정] 모든 집계 값을 하나의 GROUP BY 쿼리로 계산하며, 집계 값으로 정렬/필터할 수 있습니다.
+      예) ?start_date=2025-01-01&end_date=2025-12-31&ordering=-total_sales_current_period&min_sales_all_time=10
+    - [수정] 같은 조건의 응답은 캐시합니다. (주문/정산이 바뀌면 무효화, reimbursement/cache.py)
+    - [수정] 보관된 연도도 합계에 포함합니다. (?include_archived=0 이면 제외)
+    - [수정] 정산이 끝난 연도는 정산 완료 시점에 고정한 명세(SettlementLine)의 판매를 씁니다.
     """
     serializer_class = BookSalesSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = BookSalesFilter
+    ordering_fields = ['id', 'title_korean'] + BOOK_SALES_METRICS
+    ordering = ['id']
 
     def get_queryset(self):
-        """모든 책 목록을 반환합니다."""
-        return Book.objects.all()
-
-    def get_serializer_context(self):
-        """
-        URL 쿼리 파라미터에서 기간 정보를 가져와 시리얼라이저에 전달합니다.
-        """
-        context = super().get_serializer_context()
-        start_date_str = self.request.query_params.get('start_date')
-        end_date_str = self.request.query_params.get('end_date')
-
-        start_date = date.fromisoformat(start_date_str) if start_date_str else None
-        end_date = date.fromisoformat(end_date_str) if end_date_str else None
-
-        context['start_date'] = start_date
-        context['end_date'] = end_date
-        return context
+        """모든 책에 기간/전체/마지막 정산 이후 판매 집계를 붙여 반환합니다."""
+        start_date, end_date = parse_period(self.request.query_params)
+        return annotate_book_sales(Book.objects.all(), start_date, end_date, excluded_years(self.request.query_params))
 
 
 # --- 2. 저자별 정산 뷰 (본인 데이터만 접근 가능) ---
-class AuthorSettlementListView(generics.ListAPIView):
+class AuthorSettlementListView(CachedListMixin, generics.ListAPIView):
     """
     저자별 정산 집계 목록을 조회하는 뷰입니다.
     - 관리자: 모든 저자 목록 조회 가능
     - 작곡가: 자신의 Author 정보만 목록으로 조회 가능
+    - [수정] 사용자 범위(관리자 / 본인)와 조건별로 응답을 캐시합니다. (주문/정산이 바뀌면 무효화)
+    - [수정] 보관된 연도도 합계에 포함합니다. (?include_archived=0 이면 제외)
+    - [수정] 저자의 정산이 끝난 연도는 정산 완료 시점에 고정한 명세(SettlementLine)의 판매를 씁니다.
     """
     serializer_class = AuthorSettlementSerializer
     permission_classes = [IsAuthenticated]
@@ -59,13 +91,13 @@ class AuthorSettlementListView(generics.ListAPIView):
 
         # 1. 관리자인 경우 (is_staff=True)
         if user.is_staff:
-            return Author.objects.all()
+            return Author.objects.order_by('pk')
 
         # 2. 일반 작곡가인 경우 (is_staff=False)
         try:
             author_instance = Author.objects.get(user=user)
             # QuerySet을 반환
-            return Author.objects.filter(pk=author_instance.pk)
+            return Author.objects.filter(pk=author_instance.pk).order_by('pk')
         except Author.DoesNotExist:
             raise PermissionDenied("귀하의 사용자 계정과 연결된 작곡가 정보가 없습니다.")
         except Exception:
@@ -73,17 +105,11 @@ class AuthorSettlementListView(generics.ListAPIView):
 
     def get_serializer_context(self):
         """
-        URL 쿼리 파라미터에서 기간 정보를 가져와 시리얼라이저에 전달합니다.
+        URL 쿼리 파라미터에서 기간 정보를 가져와 시리얼라이저(정산 집계 엔진)에 전달합니다.
         """
         context = super().get_serializer_context()
-        start_date_str = self.request.query_params.get('start_date')
-        end_date_str = self.request.query_params.get('end_date')
-
-        start_date = date.fromisoformat(start_date_str) if start_date_str else None
-        end_date = date.fromisoformat(end_date_str) if end_date_str else None
-
-        context['start_date'] = start_date
-        context['end_date'] = end_date
+        context['start_date'], context['end_date'] = parse_period(self.request.query_params)
+        context['exclude_years'] = excluded_years(self.request.query_params)
         return context
 
 
@@ -94,7 +120,7 @@ class SettlementListView(generics.ListCreateAPIView):
     정산 기록 목록을 조회하고, 새로운 연도별 정산 기록을 생성하는 뷰입니다.
     - 관리자 전용 (IsAdminUser)
     - GET: 저자별 연도별 정산 목록 조회. `year` 쿼리 파라미터로 필터링 가능.
-    - POST: 특정 연도에 대한 모든 저자의 정산 기록을 (미완료 상태로) 일괄 생성.
+    - POST: 특정 연도에 대한 모든 저자의 정산 기록을 (미완료 상태로) 일괄 생성하는 작업을 적재.
     """
     permission_classes = [IsAuthenticated, IsAdminUser]
 
@@ -119,8 +145,8 @@ class SettlementListView(generics.ListCreateAPIView):
     
     def create(self, request, *args, **kwargs):
         """
-        POST 요청 시: 특정 연도에 대해 모든 Author의 정산 기록을 생성합니다.
-        (is_settled=False로 초기화)
+        POST 요청 시: 특정 연도에 대해 모든 Author의 정산 기록 생성 작업을 적재합니다.
+        (is_settled=False로 초기화, 실제 생성은 reimbursement.tasks.generate_settlements)
         """
         # 요청 본문에서 연도를 추출 (기본값은 현재 연도)
         settlement_year = request.data.get('settlement_year', timezone.now().year)
@@ -130,23 +156,16 @@ class SettlementListView(generics.ListCreateAPIView):
         except ValueError:
             return Response({'settlement_year': '유효한 연도(숫자)를 입력해야 합니다.'}, status=400)
 
-        # 모든 Author를 조회
-        authors = Author.objects.all()
-        
-        created_count = 0
-        for author in authors:
-            # 해당 Author와 연도의 기록이 없으면 생성. 기존 기록은 is_settled 상태를 유지함.
-            _, created = Settlement.objects.get_or_create(
-                author=author,
-                settlement_year=settlement_year,
-                defaults={'is_settled': False}
-            )
-            if created:
-                created_count += 1
-            
-        # 생성된 레코드 수와 함께 성공 응답 반환
-        message = f'Successfully created {created_count} new settlement records for year {settlement_year}. Existing records were updated.'
-        return Response({'message': message}, status=201)
+        # 저자 수만큼 기록을 만드는 작업은 요청 스레드에서 처리하지 않고 백그라운드 작업으로 적재합니다.
+        job = enqueue('reimbursement.generate_settlements', {'settlement_year': settlement_year}, created_by=request.user)
+
+        message = f'{settlement_year}년 정산 기록 생성 작업이 등록되었습니다.'
+        return Response({
+            'message': message,
+            'job_id': job.pk,
+            'status_url': reverse('job-api-detail', args=[job.pk]),
+            'progress_url': reverse('job_progress', args=[job.pk]),
+        }, status=202)
 
 
 class SettlementDetailView(generics.RetrieveUpdateAPIView):
@@ -158,3 +177,132 @@ class SettlementDetailView(generics.RetrieveUpdateAPIView):
     serializer_class = SettlementUpdateSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
     lookup_field = 'pk' # /settlements/<pk>/ 경로 사용
+
+
+class SettlementBulkUpdateView(generics.GenericAPIView):
+    """
+    [신규] 여러 정산 기록의 완료 여부를 한 번에 바꿉니다.
+    - 관리자 전용 (IsAdminUser)
+    - PATCH: {"is_settled": true, "ids": [1, 2, 3]} 또는 {"is_settled": true, "settlement_year": 2025}
+      상태가 바뀌는 기록만 UPDATE 한 번으로 처리하고, 정산일 기록과 명세 고정/해제도 묶어서 처리합니다.
+      "split_by_songs": true 이면 작곡가 저작권료를 곡 수 비율로 나눈 금액으로 고정합니다.
+    """
+    serializer_class = SettlementBulkUpdateSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = set_settled(
+            serializer.get_queryset(),
+            serializer.validated_data['is_settled'],
+            split_by_songs=serializer.validated_data['split_by_songs'],
+        )
+        return Response(result)
+
+
+class SettlementStatementView(generics.RetrieveAPIView):
+    """
+    [신규] 정산 기록 1건의 명세 (책별 판매, 작곡가 저작권료)
+    - 완료된 정산은 완료 시점에 고정된 명세(SettlementLine)를, 진행 중인 정산은 현재 판매 집계로 계산한 명세를 반환합니다.
+    - 관리자 또는 해당 저자 본인만 조회할 수 있습니다.
+    - ?split_by_songs=1 : 진행 중인 정산의 작곡가 저작권료를 곡 수 비율로 나눕니다.
+    """
+    serializer_class = SettlementStatementSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = Settlement.objects.select_related('author')
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(author__user=self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        split_by_songs = request.query_params.get('split_by_songs', '').lower() in ('1', 'true', 'on')
+        statement = settlement_statement(self.get_object(), split_by_songs)
+        return Response(self.get_serializer(statement).data)
+
+
+# --- 4. 작곡가 저작권료 명세 (본인/관리자) ---
+
+class ComposerRoyaltyListView(generics.ListAPIView):
+    """
+    작곡가별 저작권료 명세를 조회하는 뷰입니다.
+    - 관리자: 모든 작곡가 / 작곡가: 자신의 명세만
+    - ?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD (없으면 전체 기간)
+    - ?split_by_songs=1 : 한 책의 저작권료를 참여 작곡가들의 곡 수 비율로 나눕니다.
+    - ?include_archived=0 : 보관된 연도의 판매를 뺍니다. (기본은 포함)
+    - 정산이 끝난 연도는 정산 완료 시점에 고정한 명세(SettlementLine)로 계산합니다.
+    """
+    serializer_class = ComposerRoyaltySerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_staff:
+            return Composer.objects.order_by('pk')
+
+        queryset = Composer.objects.filter(user=user).order_by('pk')
+        if not queryset.exists():
+            raise PermissionDenied("귀하의 사용자 계정과 연결된 작곡가 정보가 없습니다.")
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['start_date'], context['end_date'] = parse_period(self.request.query_params)
+        context['split_by_songs'] = self.request.query_params.get('split_by_songs', '').lower() in ('1', 'true', 'on')
+        context['exclude_years'] = excluded_years(self.request.query_params)
+        return context
+
+
+class SalesTimeSeriesView(generics.GenericAPIView):
+    """
+    [신규] 저자/작곡가의 책별 판매 추이 (월별 또는 주별 판매 권수/금액, 누적 값)
+    - 저자/작곡가: 자신의 추이만 조회 (?payee_type=composer 로 작곡가 추이를 선택)
+    - 관리자: ?payee_type=author|composer&payee_id=<id> 로 모든 수령인 조회
+    - ?interval=month|week, ?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD (없으면 첫 판매부터 오늘까지)
+    - ?include_archived=0 : 보관된 연도의 판매를 뺍니다. (기본은 포함)
+    """
+    serializer_class = SalesTimeSeriesQuerySerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_payee(self, payee_type, payee_id):
+        """조회할 수령인 (종류, 인스턴스)"""
+        user = self.request.user
+        if user.is_staff:
+            if not payee_type or payee_id is None:
+                raise ValidationError({'payee_id': '관리자는 payee_type 과 payee_id 를 지정해야 합니다.'})
+            model = Author if payee_type == AUTHOR else Composer
+            payee = model.objects.filter(pk=payee_id).first()
+            if payee is None:
+                raise NotFound('수령인을 찾을 수 없습니다.')
+            return payee_type, payee
+
+        # 본인 계정과 연결된 저자/작곡가 (종류를 지정하지 않으면 저자 우선)
+        for kind, model in ((AUTHOR, Author), (COMPOSER, Composer)):
+            if payee_type and payee_type != kind:
+                continue
+            payee = model.objects.filter(user=user).first()
+            if payee is not None:
+                if payee_id is not None and payee_id != payee.pk:
+                    raise PermissionDenied('본인의 판매 추이만 조회할 수 있습니다.')
+                return kind, payee
+        raise PermissionDenied('귀하의 사용자 계정과 연결된 저자/작곡가 정보가 없습니다.')
+
+    def get(self, request, *args, **kwargs):
+        query = self.get_serializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start_date, end_date = parse_period(request.query_params)
+        if start_date and end_date and start_date > end_date:
+            raise ValidationError({'start_date': '시작일이 종료일보다 늦습니다.'})
+
+        kind, payee = self.get_payee(query.validated_data.get('payee_type'), query.validated_data.get('payee_id'))
+        series = sales_timeseries(
+            payee_books(kind, payee.pk),
+            start_date=start_date,
+            end_date=end_date,
+            interval=query.validated_data['interval'],
+            exclude_years=excluded_years(request.query_params),
+        )
+        return Response({'payee': {'type': kind, 'id': payee.pk, 'name': payee.name}, **series})
+
@@ -0,0 +1,6 @@
+from django.contrib import admin
+from .models import BestsellerRank, BookPeriodSales, DailyBookSales
+
+admin.site.register(DailyBookSales)
+admin.site.register(BookPeriodSales)
+admin.site.register(BestsellerRank)
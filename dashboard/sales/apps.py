@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SalesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'sales'
+
+    def ready(self):
+        # 주문/주문 상품이 바뀌면 일별 판매 집계(DailyBookSales)를 갱신하는 수신자 등록
+        from . import receivers  # noqa: F401
@@ -0,0 +1,119 @@
+"""
+책 상세 페이지의 판매 현황 패널
+
+일별 판매 집계(DailyBookSales)를 (월, 주문처)로 묶은 쿼리 1개로
+최근 N개월 월별 판매 권수/금액, 누적 판매 권수, 주문처 순위를 만듭니다.
+결과는 책별로 캐시하고, 그 책의 집계가 다시 계산되면(sales/services.py) 무효화됩니다.
+"""
+import datetime
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from config.versioned_cache import bump_version, get_version, versioned_key
+from .models import DailyBookSales
+
+PANEL_MONTHS = 36
+TOP_CHANNEL_LIMIT = 5
+BOOK_SALES_PANEL_CACHE_TIMEOUT = 600
+
+# 기간 전체 재계산(rebuild_range)처럼 어떤 책이 바뀌었는지 모를 때 올리는 공통 버전
+BOOK_SALES_CACHE_NAMESPACE = 'book_sales'
+
+
+def _book_namespace(book_id):
+    return f'{BOOK_SALES_CACHE_NAMESPACE}:{book_id}'
+
+
+def invalidate_book_sales(book_ids=None):
+    """책들의 판매 현황 캐시를 무효화합니다. (book_ids 가 None 이면 모든 책)"""
+    if book_ids is None:
+        bump_version(BOOK_SALES_CACHE_NAMESPACE)
+        return
+    for book_id in book_ids:
+        bump_version(_book_namespace(book_id))
+
+
+def _month_starts(last_month, count):
+    """last_month 까지 거슬러 올라간 count 개의 월 시작일 (오래된 순)"""
+    months = []
+    year, month = last_month.year, last_month.month
+    for _ in range(count):
+        months.append(datetime.date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months[::-1]
+
+
+def _load_panel(book_id, months, today):
+    rows = (
+        DailyBookSales.objects.filter(book_id=book_id)
+        .annotate(month=TruncMonth('date'))
+        .values('month', 'order_source')
+        .annotate(units=Sum('units'), revenue=Sum('revenue'))
+        .order_by()
+    )
+
+    monthly = defaultdict(lambda: [0, 0])
+    channels = defaultdict(lambda: [0, 0])
+    total_units = total_revenue = 0
+    for row in rows:
+        month_total = monthly[row['month']]
+        month_total[0] += row['units']
+        month_total[1] += row['revenue']
+        channel = channels[row['order_source']]
+        channel[0] += row['units']
+        channel[1] += row['revenue']
+        total_units += row['units']
+        total_revenue += row['revenue']
+
+    # 판매가 없는 달도 0 으로 채우고, 기간 이전 판매량을 누적 시작값으로 씁니다.
+    month_starts = _month_starts(today.replace(day=1), months)
+    cumulative = sum(units for month, (units, _) in monthly.items() if month < month_starts[0])
+    max_units = max((monthly[month][0] for month in month_starts if month in monthly), default=0)
+    series = []
+    for month in month_starts:
+        units, revenue = monthly.get(month, (0, 0))
+        cumulative += units
+        series.append({
+            'month': month,
+            'units': units,
+            'revenue': revenue,
+            'cumulative_units': cumulative,
+            'bar_percent': round(units * 100 / max_units) if max_units else 0,
+        })
+
+    top_channels = sorted(channels.items(), key=lambda item: (-item[1][0], item[0]))[:TOP_CHANNEL_LIMIT]
+    return {
+        'monthly': series,
+        'total_units': total_units,
+        'total_revenue': total_revenue,
+        'period_units': sum(point['units'] for point in series),
+        'period_revenue': sum(point['revenue'] for point in series),
+        'top_channels': [
+            {
+                'order_source': source,
+                'units': units,
+                'revenue': revenue,
+                'share': round(units * 100 / total_units, 1) if total_units else 0,
+            }
+            for source, (units, revenue) in top_channels
+        ],
+    }
+
+
+def get_book_sales_panel(book_id, months=PANEL_MONTHS):
+    """책의 판매 현황(dict)을 반환합니다. (캐시 적중 시 쿼리 없음)"""
+    today = timezone.localdate()
+    key = versioned_key(
+        _book_namespace(book_id),
+        book_id, months, today.strftime('%Y-%m'),
+        get_version(BOOK_SALES_CACHE_NAMESPACE),
+    )
+    panel = cache.get(key)
+    if panel is None:
+        panel = _load_panel(book_id, months, today)
+        cache.set(key, panel, BOOK_SALES_PANEL_CACHE_TIMEOUT)
+    return panel
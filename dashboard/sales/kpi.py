@@ -0,0 +1,111 @@
+"""
+홈 화면 KPI 타일
+
+타일마다 독립된 집계 쿼리 1개로 계산하고, 짧은 TTL 로 타일별 캐시합니다.
+캐시에 없는 타일은 스레드 풀에서 동시에 계산하므로 홈 화면은 타일 합계가 아니라
+가장 느린 타일 하나만큼의 시간에 그려집니다.
+(Django 의 async ORM 은 내부적으로 한 스레드에서 순서대로 실행되므로 스레드 풀을 씁니다.)
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from order.models import Order
+from reimbursement.models import Settlement
+from .models import DailyBookSales
+from .services import day_bounds
+
+HOME_KPI_CACHE_TIMEOUT = 60
+TOP_BOOK_LIMIT = 10
+
+
+def _order_totals(queryset):
+    totals = queryset.aggregate(order_count=Count('id', distinct=True), amount=Sum('order_items__total_price'))
+    return {'order_count': totals['order_count'], 'amount': totals['amount'] or 0}
+
+
+def today_tile(today):
+    start, end = day_bounds(today)
+    return _order_totals(Order.objects.filter(order_date__gte=start, order_date__lt=end))
+
+
+def month_tile(today):
+    start, _ = day_bounds(today.replace(day=1))
+    return _order_totals(Order.objects.filter(order_date__gte=start))
+
+
+def unpaid_tile(today):
+    return _order_totals(Order.objects.filter(payment_date__isnull=True))
+
+
+def top_books_tile(today):
+    """이번 달 판매 권수 상위 책 (일별 판매 집계에서)"""
+    return list(
+        DailyBookSales.objects.filter(date__gte=today.replace(day=1), date__lte=today)
+        .values('book_id', 'book__title_korean')
+        .annotate(units=Sum('units'), revenue=Sum('revenue'))
+        .order_by('-units', 'book_id')[:TOP_BOOK_LIMIT]
+    )
+
+
+def pending_settlements_tile(today):
+    """연도별 미완료 정산 수"""
+    return list(
+        Settlement.objects.filter(is_settled=False)
+        .values('settlement_year')
+        .annotate(count=Count('id'))
+        .order_by('-settlement_year')
+    )
+
+
+TILES = {
+    'today': today_tile,
+    'month': month_tile,
+    'unpaid': unpaid_tile,
+    'top_books': top_books_tile,
+    'pending_settlements': pending_settlements_tile,
+}
+
+_executor = ThreadPoolExecutor(max_workers=len(TILES), thread_name_prefix='home-kpi')
+
+
+def _tile_cache_key(name, today):
+    return f'home_kpi:{name}:{today.isoformat()}'
+
+
+def _compute_tile(name, today):
+    # 풀 스레드는 요청이 끝나도 DB 연결을 정리하지 않으므로 직접 닫습니다.
+    try:
+        value = TILES[name](today)
+        cache.set(_tile_cache_key(name, today), value, HOME_KPI_CACHE_TIMEOUT)
+        return value
+    finally:
+        close_old_connections()
+
+
+def get_home_kpis(today=None):
+    """
+    모든 타일 값을 {타일 이름: 값} 으로 반환합니다.
+    캐시에 있는 타일은 그대로 쓰고, 없는 타일만 동시에 계산합니다.
+    """
+    today = today or timezone.localdate()
+    cached = cache.get_many([_tile_cache_key(name, today) for name in TILES])
+
+    kpis = {}
+    futures = {}
+    for name in TILES:
+        key = _tile_cache_key(name, today)
+        if key in cached:
+            kpis[name] = cached[key]
+        else:
+            futures[name] = _executor.submit(_compute_tile, name, today)
+
+    for name, future in futures.items():
+        kpis[name] = future.result()
+
+    kpis['today_date'] = today
+    kpis['month_start'] = today.replace(day=1)
+    return kpis
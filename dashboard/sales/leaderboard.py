@@ -0,0 +1,177 @@
+"""
+베스트셀러 순위 (전체/대분류/책 종류 x 전체 기간/연도/월)
+
+- BookPeriodSales : (기간, 책) 판매 합계. 일별 판매 집계가 바뀐 책의 칸만 다시 합산합니다.
+- BestsellerRank  : (기간, 분류)별 상위 N권. 바뀐 책이 속한 기간/분류의 순위표만 다시 만듭니다.
+주문이 저장될 때는 refresh_daily_sales 가 update_leaderboards 를 호출하고,
+전체 재계산은 rebuild_leaderboards 명령(또는 작업)을 사용합니다.
+순위 조회는 미리 계산된 N행만 읽습니다.
+"""
+import calendar
+import datetime
+import heapq
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import ExtractYear, TruncMonth
+
+from book.models import Book
+from .models import BestsellerRank, BookPeriodSales, DailyBookSales
+
+LEADERBOARD_SIZE = 50
+ALL = 'all'
+
+
+def periods_for_day(day):
+    """하루의 판매가 포함되는 기간 키 (전체, 연도, 월)"""
+    return [ALL, f'{day.year}', f'{day.year}-{day.month:02d}']
+
+
+def period_range(period):
+    """기간 키 -> (시작일, 종료일) (전체 기간은 None)"""
+    if period == ALL:
+        return None
+    if len(period) == 4:
+        year = int(period)
+        return datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+    year, month = int(period[:4]), int(period[5:7])
+    return datetime.date(year, month, 1), datetime.date(year, month, calendar.monthrange(year, month)[1])
+
+
+def book_facets(category1, book_type):
+    """책이 포함되는 분류 키"""
+    facets = [ALL, f'book_type:{book_type}']
+    if category1:
+        facets.append(f'category1:{category1}')
+    return facets
+
+
+def _facet_filter(facet):
+    if facet == ALL:
+        return {}
+    field, value = facet.split(':', 1)
+    return {f'book__{field}': value}
+
+
+def _rank_rows(period, facet, rows):
+    return [
+        BestsellerRank(period=period, facet=facet, rank=rank, book_id=book_id, units=units, revenue=revenue)
+        for rank, (book_id, units, revenue) in enumerate(rows, start=1)
+    ]
+
+
+def _refresh_period_totals(period, book_ids):
+    """(기간, 책) 칸을 일별 판매 집계에서 다시 합산합니다. (책별 인덱스 범위 조회 1회)"""
+    qs = DailyBookSales.objects.filter(book_id__in=book_ids)
+    date_range = period_range(period)
+    if date_range:
+        qs = qs.filter(date__range=date_range)
+    totals = qs.values('book_id').annotate(units=Sum('units'), revenue=Sum('revenue')).order_by()
+
+    BookPeriodSales.objects.filter(period=period, book_id__in=book_ids).delete()
+    BookPeriodSales.objects.bulk_create([
+        BookPeriodSales(period=period, book_id=row['book_id'], units=row['units'], revenue=row['revenue'])
+        for row in totals if row['units']
+    ])
+
+
+def _refresh_ranking(period, facet, size=LEADERBOARD_SIZE):
+    """(기간, 분류) 순위표를 기간별 합계에서 상위 size 권만 읽어 다시 만듭니다."""
+    top = (
+        BookPeriodSales.objects.filter(period=period, **_facet_filter(facet))
+        .order_by('-units', 'book_id')
+        .values_list('book_id', 'units', 'revenue')[:size]
+    )
+    BestsellerRank.objects.filter(period=period, facet=facet).delete()
+    BestsellerRank.objects.bulk_create(_rank_rows(period, facet, top))
+
+
+def update_leaderboards(keys):
+    """
+    일별 판매 집계가 다시 계산된 (날짜, 책 id) 묶음에 맞춰
+    해당 책의 기간별 합계와, 그 책이 속한 기간/분류의 순위표만 갱신합니다.
+    """
+    books_by_period = defaultdict(set)
+    for day, book_id in keys:
+        for period in periods_for_day(day):
+            books_by_period[period].add(book_id)
+    if not books_by_period:
+        return
+
+    facets_by_book = {
+        book_id: book_facets(category1, book_type)
+        for book_id, category1, book_type in Book.objects.filter(
+            pk__in={book_id for _, book_id in keys}
+        ).values_list('pk', 'category1', 'book_type')
+    }
+
+    with transaction.atomic():
+        for period, book_ids in books_by_period.items():
+            _refresh_period_totals(period, book_ids)
+            facets = {facet for book_id in book_ids for facet in facets_by_book.get(book_id, [ALL])}
+            for facet in sorted(facets):
+                _refresh_ranking(period, facet)
+
+
+def rebuild_leaderboards(size=LEADERBOARD_SIZE, job=None):
+    """
+    기간별 합계와 모든 순위표를 일별 판매 집계에서 다시 만듭니다.
+    합계는 기간 종류별 집계 쿼리 3개로 만들고, 순위는 메모리에서 분류별 상위 size 권을 고릅니다.
+    """
+    if job:
+        job.update_progress(0, 2, '기간별 합계 집계 중')
+
+    totals = []
+    for row in DailyBookSales.objects.values('book_id').annotate(units=Sum('units'), revenue=Sum('revenue')).order_by():
+        totals.append((ALL, row['book_id'], row['units'], row['revenue']))
+    for row in (
+        DailyBookSales.objects.annotate(year=ExtractYear('date'))
+        .values('year', 'book_id').annotate(units=Sum('units'), revenue=Sum('revenue')).order_by()
+    ):
+        totals.append((f"{row['year']}", row['book_id'], row['units'], row['revenue']))
+    for row in (
+        DailyBookSales.objects.annotate(month=TruncMonth('date'))
+        .values('month', 'book_id').annotate(units=Sum('units'), revenue=Sum('revenue')).order_by()
+    ):
+        totals.append((row['month'].strftime('%Y-%m'), row['book_id'], row['units'], row['revenue']))
+    totals = [row for row in totals if row[2]]
+
+    if job:
+        job.update_progress(1, 2, '순위 계산 중')
+
+    facets_by_book = {
+        book_id: book_facets(category1, book_type)
+        for book_id, category1, book_type in Book.objects.values_list('pk', 'category1', 'book_type')
+    }
+    candidates = defaultdict(list)
+    for period, book_id, units, revenue in totals:
+        for facet in facets_by_book.get(book_id, [ALL]):
+            candidates[(period, facet)].append((book_id, units, revenue))
+
+    ranks = []
+    for (period, facet), rows in candidates.items():
+        top = heapq.nsmallest(size, rows, key=lambda row: (-row[1], row[0]))
+        ranks.extend(_rank_rows(period, facet, top))
+
+    with transaction.atomic():
+        BookPeriodSales.objects.all().delete()
+        BookPeriodSales.objects.bulk_create([
+            BookPeriodSales(period=period, book_id=book_id, units=units, revenue=revenue)
+            for period, book_id, units, revenue in totals
+        ], batch_size=1000)
+        BestsellerRank.objects.all().delete()
+        BestsellerRank.objects.bulk_create(ranks, batch_size=1000)
+
+    if job:
+        job.update_progress(2, message=f'순위 {len(ranks)}건 저장 완료')
+    return {'period_total_count': len(totals), 'rank_count': len(ranks)}
+
+
+def get_bestsellers(period=ALL, facet=ALL, limit=LEADERBOARD_SIZE):
+    """미리 계산된 순위표에서 상위 limit 권을 읽습니다. (1개 쿼리)"""
+    return list(
+        BestsellerRank.objects.filter(period=period, facet=facet)
+        .select_related('book')
+        .order_by('rank')[:limit]
+    )
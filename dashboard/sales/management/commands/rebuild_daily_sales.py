@@ -0,0 +1,53 @@
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from jobs.queue import enqueue
+from sales.leaderboard import rebuild_leaderboards
+from sales.services import first_sale_date, rebuild_range, split_range
+
+
+def _rebuild(date_range):
+    close_old_connections()
+    try:
+        return rebuild_range(*date_range)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = '일별 판매 집계(DailyBookSales)를 원본 주문에서 다시 계산합니다. 기간을 나눠 병렬로 처리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=datetime.date.fromisoformat, help='시작일 YYYY-MM-DD (기본: 첫 주문일)')
+        parser.add_argument('--end', type=datetime.date.fromisoformat, help='종료일 YYYY-MM-DD (기본: 오늘)')
+        parser.add_argument('--workers', type=int, default=4, help='동시에 계산할 구간 수 (기본 4)')
+        parser.add_argument('--enqueue', action='store_true', help='바로 실행하지 않고 구간별 작업을 큐에 적재 (run_workers 가 실행)')
+
+    def handle(self, *args, **options):
+        start_date = options['start'] or first_sale_date()
+        end_date = options['end'] or timezone.localdate()
+        if start_date is None:
+            self.stdout.write('주문이 없습니다.')
+            return
+        if start_date > end_date:
+            raise CommandError('시작일이 종료일보다 늦습니다.')
+
+        ranges = split_range(start_date, end_date, options['workers'])
+
+        if options['enqueue']:
+            for start, end in ranges:
+                job = enqueue('sales.rebuild_daily_sales', {'start_date': start.isoformat(), 'end_date': end.isoformat()})
+                self.stdout.write(f'작업 #{job.pk} 적재 ({start} ~ {end})')
+            self.stdout.write('작업이 모두 끝나면 rebuild_leaderboards 로 순위표를 다시 만드세요.')
+            return
+
+        with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix='daily-sales') as executor:
+            row_count = sum(executor.map(_rebuild, ranges))
+        rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS(
+            f'{start_date} ~ {end_date} 구간 {len(ranges)}개, 집계 {row_count}행 재계산 완료'
+        ))
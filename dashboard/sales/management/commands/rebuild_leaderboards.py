@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from jobs.queue import enqueue
+from sales.leaderboard import LEADERBOARD_SIZE, rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = '기간별 판매 합계(BookPeriodSales)와 베스트셀러 순위표(BestsellerRank)를 일별 판매 집계에서 다시 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=LEADERBOARD_SIZE, help=f'순위표마다 저장할 책 수 (기본 {LEADERBOARD_SIZE})')
+        parser.add_argument('--enqueue', action='store_true', help='바로 실행하지 않고 작업 큐에 적재 (run_workers 가 실행)')
+
+    def handle(self, *args, **options):
+        if options['enqueue']:
+            job = enqueue('sales.rebuild_leaderboards', {'size': options['size']})
+            self.stdout.write(f'작업 #{job.pk} 적재 완료')
+            return
+
+        result = rebuild_leaderboards(size=options['size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"기간별 합계 {result['period_total_count']}행, 순위 {result['rank_count']}건 재계산 완료"
+        ))
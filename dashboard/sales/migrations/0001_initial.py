@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('book', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBookSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('order_source', models.CharField(max_length=50, verbose_name='주문처')),
+                ('payment_method', models.CharField(max_length=10, verbose_name='결제 방법')),
+                ('units', models.IntegerField(default=0, verbose_name='판매 권수')),
+                ('revenue', models.BigIntegerField(default=0, verbose_name='판매 금액')),
+                ('order_count', models.IntegerField(default=0, verbose_name='주문 수')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='book.book', verbose_name='책')),
+            ],
+            options={
+                'verbose_name': '일별 판매 집계',
+                'verbose_name_plural': '일별 판매 집계 목록',
+                'indexes': [models.Index(fields=['book', 'date'], name='daily_sales_book_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'book', 'order_source', 'payment_method'), name='unique_daily_book_sales')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0001_initial'),
+        ('sales', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BestsellerRank',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=7, verbose_name='기간')),
+                ('facet', models.CharField(max_length=120, verbose_name='분류')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='순위')),
+                ('units', models.IntegerField(verbose_name='판매 권수')),
+                ('revenue', models.BigIntegerField(verbose_name='판매 금액')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신일')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bestseller_ranks', to='book.book', verbose_name='책')),
+            ],
+            options={
+                'verbose_name': '베스트셀러 순위',
+                'verbose_name_plural': '베스트셀러 순위 목록',
+                'ordering': ['period', 'facet', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('period', 'facet', 'rank'), name='unique_bestseller_rank')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BookPeriodSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=7, verbose_name='기간')),
+                ('units', models.IntegerField(default=0, verbose_name='판매 권수')),
+                ('revenue', models.BigIntegerField(default=0, verbose_name='판매 금액')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_sales', to='book.book', verbose_name='책')),
+            ],
+            options={
+                'verbose_name': '기간별 판매 합계',
+                'verbose_name_plural': '기간별 판매 합계 목록',
+                'indexes': [models.Index(fields=['period', '-units'], name='period_sales_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('period', 'book'), name='unique_book_period_sales')],
+            },
+        ),
+    ]
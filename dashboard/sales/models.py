@@ -0,0 +1,85 @@
+from django.db import models
+
+
+class DailyBookSales(models.Model):
+    """
+    일별 판매 집계 (날짜 x 책 x 주문처 x 결제 방법)
+    보고서/정산 화면은 주문 상품(OrderItem)을 직접 합산하지 않고 이 표를 읽으므로,
+    조회 비용이 주문 상품 수가 아니라 (일수 x 책 수)에 비례합니다.
+    - 주문이 생성/수정/삭제되면 바뀐 (날짜, 책) 묶음만 다시 계산합니다. (sales/receivers.py)
+    - 보관된 주문(ArchivedOrder)도 포함하므로 연도 보관 후에도 합계가 유지됩니다.
+    - 전체 재계산은 rebuild_daily_sales 명령을 사용합니다.
+    """
+    date = models.DateField(verbose_name='날짜')
+    book = models.ForeignKey('book.Book', on_delete=models.CASCADE, related_name='daily_sales', verbose_name='책')
+    order_source = models.CharField(max_length=50, verbose_name='주문처')
+    payment_method = models.CharField(max_length=10, verbose_name='결제 방법')
+    units = models.IntegerField(default=0, verbose_name='판매 권수')
+    revenue = models.BigIntegerField(default=0, verbose_name='판매 금액')
+    order_count = models.IntegerField(default=0, verbose_name='주문 수')
+
+    def __str__(self):
+        return f'{self.date} {self.book_id} {self.order_source}/{self.payment_method}: {self.units}권'
+
+    class Meta:
+        verbose_name = '일별 판매 집계'
+        verbose_name_plural = '일별 판매 집계 목록'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'book', 'order_source', 'payment_method'], name='unique_daily_book_sales'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['book', 'date'], name='daily_sales_book_date_idx'),
+        ]
+
+
+class BookPeriodSales(models.Model):
+    """
+    기간별 책 판매 합계 (순위 계산용)
+    period: 'all'(전체 기간) / 'YYYY'(연도) / 'YYYY-MM'(월)
+    일별 판매 집계가 바뀐 책의 칸만 다시 합산합니다. (sales/leaderboard.py)
+    책 목록의 인기순 정렬도 이 표의 'all' 행을 읽으므로 GROUP BY 가 필요 없습니다.
+    """
+    period = models.CharField(max_length=7, verbose_name='기간')
+    book = models.ForeignKey('book.Book', on_delete=models.CASCADE, related_name='period_sales', verbose_name='책')
+    units = models.IntegerField(default=0, verbose_name='판매 권수')
+    revenue = models.BigIntegerField(default=0, verbose_name='판매 금액')
+
+    def __str__(self):
+        return f'{self.period} {self.book_id}: {self.units}권'
+
+    class Meta:
+        verbose_name = '기간별 판매 합계'
+        verbose_name_plural = '기간별 판매 합계 목록'
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'book'], name='unique_book_period_sales'),
+        ]
+        indexes = [
+            models.Index(fields=['period', '-units'], name='period_sales_rank_idx'),
+        ]
+
+
+class BestsellerRank(models.Model):
+    """
+    기간 x 분류별 판매 상위 N권 (미리 계산된 순위표)
+    facet: 'all' / 'category1:<대분류>' / 'book_type:<책 종류>'
+    """
+    period = models.CharField(max_length=7, verbose_name='기간')
+    facet = models.CharField(max_length=120, verbose_name='분류')
+    rank = models.PositiveSmallIntegerField(verbose_name='순위')
+    book = models.ForeignKey('book.Book', on_delete=models.CASCADE, related_name='bestseller_ranks', verbose_name='책')
+    units = models.IntegerField(verbose_name='판매 권수')
+    revenue = models.BigIntegerField(verbose_name='판매 금액')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='갱신일')
+
+    def __str__(self):
+        return f'{self.period} {self.facet} {self.rank}위: {self.book_id}'
+
+    class Meta:
+        verbose_name = '베스트셀러 순위'
+        verbose_name_plural = '베스트셀러 순위 목록'
+        ordering = ['period', 'facet', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'facet', 'rank'], name='unique_bestseller_rank'),
+        ]
@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from order.models import Order, OrderItem
+from order.signals import order_items_changed, orders_updated
+from .services import mark_dirty, order_keys
+
+# 이 필드가 바뀌면 집계 키(날짜, 주문처, 결제 방법)가 달라집니다.
+ROLLUP_ORDER_FIELDS = {'order_date', 'order_source', 'payment_method'}
+
+
+@receiver(post_save, sender=Order)
+def mark_on_order_save(sender, instance, created, **kwargs):
+    # 새 주문은 아직 상품이 없으므로 상품 저장 시 반영됩니다.
+    if not created:
+        mark_dirty(order_keys([instance.pk]))
+
+
+@receiver(pre_delete, sender=Order)
+def mark_on_order_delete(sender, instance, **kwargs):
+    # 삭제 후에는 어떤 책이 있었는지 알 수 없으므로 지우기 전에 묶음을 기록합니다. (커밋 후 갱신)
+    mark_dirty(order_keys([instance.pk]))
+
+
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def mark_on_order_item(sender, instance, **kwargs):
+    order_date = Order.objects.filter(pk=instance.order_id).values_list('order_date', flat=True).first()
+    if order_date:
+        mark_dirty({(timezone.localdate(order_date), instance.book_id)})
+
+
+@receiver(order_items_changed)
+def mark_on_items_changed(sender, order_id, book_ids, **kwargs):
+    order_date = Order.objects.filter(pk=order_id).values_list('order_date', flat=True).first()
+    if order_date:
+        day = timezone.localdate(order_date)
+        mark_dirty({(day, book_id) for book_id in book_ids})
+
+
+@receiver(orders_updated)
+def mark_on_orders_updated(sender, order_ids, fields, **kwargs):
+    if ROLLUP_ORDER_FIELDS & set(fields):
+        mark_dirty(order_keys(order_ids))
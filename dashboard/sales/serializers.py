@@ -0,0 +1,40 @@
+import re
+
+from rest_framework import serializers
+
+from .leaderboard import ALL, LEADERBOARD_SIZE
+from .models import BestsellerRank
+
+PERIOD_PATTERN = re.compile(r'^(all|\d{4}|\d{4}-(0[1-9]|1[0-2]))$')
+
+
+class BestsellerQuerySerializer(serializers.Serializer):
+    """베스트셀러 조회 조건 (쿼리 파라미터)"""
+    period = serializers.CharField(required=False, default=ALL)
+    category1 = serializers.CharField(required=False)
+    book_type = serializers.CharField(required=False)
+    limit = serializers.IntegerField(required=False, default=10, min_value=1, max_value=LEADERBOARD_SIZE)
+
+    def validate_period(self, value):
+        if not PERIOD_PATTERN.match(value):
+            raise serializers.ValidationError("기간은 'all', 'YYYY', 'YYYY-MM' 형식이어야 합니다.")
+        return value
+
+    def validate(self, data):
+        if data.get('category1') and data.get('book_type'):
+            raise serializers.ValidationError('category1 과 book_type 은 함께 지정할 수 없습니다.')
+        if data.get('category1'):
+            data['facet'] = f"category1:{data['category1']}"
+        elif data.get('book_type'):
+            data['facet'] = f"book_type:{data['book_type']}"
+        else:
+            data['facet'] = ALL
+        return data
+
+
+class BestsellerSerializer(serializers.ModelSerializer):
+    title_korean = serializers.CharField(source='book.title_korean', read_only=True)
+
+    class Meta:
+        model = BestsellerRank
+        fields = ['rank', 'book', 'title_korean', 'units', 'revenue', 'updated_at']
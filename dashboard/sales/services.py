@@ -0,0 +1,229 @@
+"""
+일별 판매 집계(DailyBookSales) 갱신
+
+- refresh_daily_sales : 바뀐 (날짜, 책) 묶음만 원본 주문 상품에서 다시 계산 (증분 갱신)
+- mark_dirty          : 수신자가 바뀐 묶음을 알리면 트랜잭션 커밋 시 한 번에 refresh 합니다.
+- suppress_rollup     : 연도 보관처럼 합계가 바뀌지 않는 대량 작업에서 갱신을 건너뜁니다.
+- rebuild_range       : 기간 전체를 다시 계산 (rebuild_daily_sales 명령/작업)
+- lock_daily_sales    : 증분 갱신과, 집계를 한 시점으로 읽어야 하는 파생 집계 재계산(연간 실적)을 서로 배제합니다.
+  (순위표는 구간을 모두 다시 계산한 뒤 leaderboard.rebuild_leaderboards 로 다시 만듭니다)
+"""
+import datetime
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from order.models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+from .book_panel import invalidate_book_sales
+from .leaderboard import update_leaderboards
+from .models import DailyBookSales
+from .signals import daily_sales_changed
+
+_state = threading.local()
+
+# 원본 주문 상품 -> 집계 키 (보관 테이블도 같은 이름의 필드를 씁니다)
+GROUP_FIELDS = ['book_id', 'order__order_source', 'order__payment_method']
+
+
+def day_bounds(day):
+    """현지 날짜(day)의 [시작, 다음날 시작) 시각"""
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    return start, start + datetime.timedelta(days=1)
+
+
+def _grouped_rows(start, end, book_ids=None):
+    """
+    [start, end) 기간의 주문 상품을 (날짜, 책, 주문처, 결제 방법)으로 묶은 합계.
+    운영 테이블과 보관 테이블을 각각 집계해 합칩니다. (같은 주문이 양쪽에 있을 수 없으므로 주문 수도 더하면 됩니다)
+    """
+    totals = defaultdict(lambda: [0, 0, 0])
+    for model in (OrderItem, ArchivedOrderItem):
+        qs = model.objects.filter(order__order_date__gte=start, order__order_date__lt=end)
+        if book_ids is not None:
+            qs = qs.filter(book_id__in=book_ids)
+        rows = (
+            qs.annotate(day=TruncDate('order__order_date'))
+            .values('day', *GROUP_FIELDS)
+            .annotate(units=Sum('quantity'), revenue=Sum('total_price'), order_count=Count('order_id', distinct=True))
+            .order_by()
+        )
+        for row in rows:
+            key = (row['day'], row['book_id'], row['order__order_source'], row['order__payment_method'])
+            total = totals[key]
+            total[0] += row['units'] or 0
+            total[1] += row['revenue'] or 0
+            total[2] += row['order_count']
+    return [
+        DailyBookSales(
+            date=day, book_id=book_id, order_source=source, payment_method=method,
+            units=units, revenue=revenue, order_count=order_count,
+        )
+        for (day, book_id, source, method), (units, revenue, order_count) in totals.items()
+    ]
+
+
+def _book_totals(day, book_ids):
+    """하루 집계 행의 책별 {book_id: (판매 권수, 판매 금액)}"""
+    rows = (
+        DailyBookSales.objects.filter(date=day, book_id__in=book_ids)
+        .values('book_id')
+        .annotate(units=Sum('units'), revenue=Sum('revenue'))
+        .order_by()
+    )
+    return {row['book_id']: (row['units'], row['revenue']) for row in rows}
+
+
+def lock_daily_sales(exclusive=False):
+    """
+    일별 판매 집계 잠금 (transaction.atomic() 안에서 호출, 트랜잭션이 끝나면 해제)
+    - 증분 갱신(refresh_daily_sales)은 공유 잠금을 잡으므로 갱신끼리는 막지 않습니다.
+    - exclusive=True (reimbursement.performance.rebuild_year) 는 진행 중인 갱신이 끝나길 기다리고, 끝날 때까지 새 갱신을 막습니다.
+      그 사이에 읽은 집계와 증감 outbox 는 같은 시점의 값입니다.
+    PostgreSQL 은 테이블 잠금을, 그 외(SQLite)는 쓰기 문장을 먼저 실행해 데이터베이스 쓰기 잠금을 잡습니다.
+    (SQLite 는 쓰기 트랜잭션이 하나뿐이므로 공유/배타 구분 없이 모든 갱신이 차례로 실행됩니다)
+    """
+    if connection.vendor == 'postgresql':
+        mode = 'EXCLUSIVE' if exclusive else 'ROW EXCLUSIVE'
+        with connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {connection.ops.quote_name(DailyBookSales._meta.db_table)} IN {mode} MODE')
+    else:
+        DailyBookSales.objects.filter(pk__lt=0).update(units=0)
+
+
+def refresh_daily_sales(keys):
+    """
+    (날짜, 책 id) 묶음들의 집계 행을 원본에서 다시 계산합니다.
+    날짜마다 집계 1 + 기존 합계 1 + 삭제 1 + 생성 1 쿼리이며, 다시 계산하므로 몇 번을 실행해도 결과가 같습니다.
+    [수정] 바뀌기 전/후 책별 합계의 차이를 daily_sales_changed 신호로 알립니다. (연간 실적 등 파생 집계의 증분 갱신)
+    """
+    books_by_day = defaultdict(set)
+    for day, book_id in keys:
+        books_by_day[day].add(book_id)
+
+    deltas = {}
+    with transaction.atomic():
+        # 기존 합계(before)를 읽기 전에 잠가, 연간 실적 재계산과 겹치지 않게 합니다.
+        lock_daily_sales()
+        for day, book_ids in books_by_day.items():
+            start, end = day_bounds(day)
+            rows = _grouped_rows(start, end, book_ids)
+            before = _book_totals(day, book_ids)
+            after = defaultdict(lambda: [0, 0])
+            for row in rows:
+                after[row.book_id][0] += row.units
+                after[row.book_id][1] += row.revenue
+            for book_id in book_ids:
+                old_units, old_revenue = before.get(book_id, (0, 0))
+                new_units, new_revenue = after.get(book_id, (0, 0))
+                if (new_units, new_revenue) != (old_units, old_revenue):
+                    deltas[(day, book_id)] = (new_units - old_units, new_revenue - old_revenue)
+
+            DailyBookSales.objects.filter(date=day, book_id__in=book_ids).delete()
+            DailyBookSales.objects.bulk_create(rows)
+        # 바뀐 책의 기간별 합계와 그 책이 속한 베스트셀러 순위표
+        update_leaderboards(keys)
+        if deltas:
+            daily_sales_changed.send(sender=DailyBookSales, deltas=deltas)
+
+    # 책 상세 페이지의 판매 현황 캐시
+    invalidate_book_sales({book_id for _, book_id in keys})
+
+
+def order_keys(order_ids, model=Order):
+    """주문들이 영향을 주는 (현지 날짜, 책 id) 묶음 (1개 쿼리)"""
+    rows = model.objects.filter(pk__in=order_ids).values_list('order_date', 'order_items__book_id')
+    return {
+        (timezone.localdate(order_date), book_id)
+        for order_date, book_id in rows
+        if book_id is not None
+    }
+
+
+class _Batch:
+    """한 트랜잭션에서 바뀐 묶음을 모아 두었다가 커밋 시 한 번에 갱신합니다."""
+    def __init__(self):
+        self.keys = set()
+
+    def flush(self):
+        if getattr(_state, 'batch', None) is self:
+            _state.batch = None
+        refresh_daily_sales(self.keys)
+
+
+def mark_dirty(keys):
+    """
+    바뀐 (날짜, 책 id) 묶음을 알립니다.
+    트랜잭션 안이면 커밋 후 한 번에 갱신하고(롤백되면 버려짐), 밖이면 바로 갱신합니다.
+    """
+    if getattr(_state, 'suppressed', 0) or not keys:
+        return
+
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        refresh_daily_sales(keys)
+        return
+
+    # 롤백으로 예약이 버려진 묶음은 다시 쓰지 않습니다.
+    batch = getattr(_state, 'batch', None)
+    if batch is None or not any(entry[1] == batch.flush for entry in connection.run_on_commit):
+        batch = _state.batch = _Batch()
+        transaction.on_commit(batch.flush)
+    batch.keys.update(keys)
+
+
+@contextmanager
+def suppress_rollup():
+    """
+    블록 안에서는 집계를 갱신하지 않습니다.
+    합계가 바뀌지 않는 작업(연도 보관/복원)이나, 끝난 뒤 rebuild_range 로 다시 계산할 대량 작업에 사용합니다.
+    """
+    _state.suppressed = getattr(_state, 'suppressed', 0) + 1
+    try:
+        yield
+    finally:
+        _state.suppressed -= 1
+
+
+def first_sale_date():
+    """운영/보관 주문 중 가장 이른 주문일 (주문이 없으면 None)"""
+    dates = [
+        value for value in (
+            Order.objects.aggregate(first=Min('order_date'))['first'],
+            ArchivedOrder.objects.aggregate(first=Min('order_date'))['first'],
+        ) if value
+    ]
+    return timezone.localdate(min(dates)) if dates else None
+
+
+def split_range(start_date, end_date, parts):
+    """[start_date, end_date] 날짜 구간을 최대 parts 개의 연속 구간으로 나눕니다."""
+    days = (end_date - start_date).days + 1
+    parts = max(1, min(parts, days))
+    size, extra = divmod(days, parts)
+    ranges = []
+    cursor = start_date
+    for index in range(parts):
+        length = size + (1 if index < extra else 0)
+        ranges.append((cursor, cursor + datetime.timedelta(days=length - 1)))
+        cursor += datetime.timedelta(days=length)
+    return ranges
+
+
+def rebuild_range(start_date, end_date):
+    """
+    [start_date, end_date] (현지 날짜, 양끝 포함) 구간의 집계를 원본에서 다시 만듭니다.
+    반환값: 생성한 집계 행 수
+    """
+    start, _ = day_bounds(start_date)
+    _, end = day_bounds(end_date)
+    rows = _grouped_rows(start, end)
+    with transaction.atomic():
+        DailyBookSales.objects.filter(date__gte=start_date, date__lte=end_date).delete()
+        DailyBookSales.objects.bulk_create(rows, batch_size=1000)
+    invalidate_book_sales()
+    return len(rows)
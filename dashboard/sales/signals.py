@@ -0,0 +1,8 @@
+from django.dispatch import Signal
+
+# 일별 판매 집계가 증분 갱신(refresh_daily_sales)으로 바뀌었을 때 발송됩니다.
+# 집계 행을 바꾼 트랜잭션 안에서 발송되므로, 수신자가 쓰는 내용도 함께 커밋/롤백됩니다.
+# (rebuild_range 같은 전체 재계산에서는 발송하지 않습니다. 파생 집계도 각자의 재계산 명령으로 다시 만드세요.)
+#
+# 인자: deltas (dict: (날짜, 책 id) -> (판매 권수 증감, 판매 금액 증감), 변화가 없는 묶음은 빠집니다)
+daily_sales_changed = Signal()
@@ -0,0 +1,24 @@
+import datetime
+
+from jobs.queue import register_task
+from .leaderboard import rebuild_leaderboards
+from .services import rebuild_range
+
+
+@register_task('sales.rebuild_daily_sales')
+def rebuild_daily_sales_task(job, start_date, end_date):
+    """
+    [백그라운드 작업] 일별 판매 집계 구간 재계산 (rebuild_daily_sales --enqueue 가 구간별로 적재)
+    """
+    row_count = rebuild_range(datetime.date.fromisoformat(start_date), datetime.date.fromisoformat(end_date))
+    return {'start_date': start_date, 'end_date': end_date, 'row_count': row_count}
+
+
+@register_task('sales.rebuild_leaderboards')
+def rebuild_leaderboards_task(job, size=None):
+    """
+    [백그라운드 작업] 기간별 판매 합계와 베스트셀러 순위표 전체 재계산 (rebuild_leaderboards --enqueue)
+    """
+    if size:
+        return rebuild_leaderboards(size=size, job=job)
+    return rebuild_leaderboards(job=job)
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # 홈 화면 KPI 타일 (관리자 전용, JWT)
+    path('api/home-kpis/', views.HomeKPIAPIView.as_view(), name='home_kpis'),
+    # 베스트셀러 순위 (기간/대분류/책 종류)
+    path('api/bestsellers/', views.BestsellerListAPIView.as_view(), name='bestseller-api-list'),
+]
@@ -0,0 +1,43 @@
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import JSONRenderer, TemplateHTMLRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import IsManager
+from .kpi import get_home_kpis
+from .leaderboard import get_bestsellers
+from .serializers import BestsellerQuerySerializer, BestsellerSerializer
+
+
+class HomeKPIAPIView(APIView):
+    """
+    홈 화면 KPI 타일 (관리자 전용)
+    - HTMX 요청(Accept: text/html)에는 타일 HTML 조각을, 그 외에는 JSON 을 반환합니다.
+    """
+    permission_classes = [IsAuthenticated, IsManager]
+    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+    template_name = 'sales/partials/home_kpis.html'
+
+    def get(self, request):
+        return Response(get_home_kpis())
+
+
+class BestsellerListAPIView(APIView):
+    """
+    베스트셀러 순위 (미리 계산된 순위표에서 상위 N권만 읽습니다)
+    GET ?period=all|YYYY|YYYY-MM & category1=... 또는 book_type=GEN|PCS|SCO & limit=10
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        query = BestsellerQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        ranks = get_bestsellers(params['period'], params['facet'], params['limit'])
+        return Response({
+            'period': params['period'],
+            'facet': params['facet'],
+            'results': BestsellerSerializer(ranks, many=True).data,
+        })